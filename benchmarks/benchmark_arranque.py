@@ -0,0 +1,105 @@
+"""
+Mide el tiempo de arranque en frío de main.py y de los puntos de entrada de
+cada motor, lanzando un intérprete nuevo en cada repetición.
+
+Cada caso tiene un límite en segundos (mediana de las repeticiones). Si alguno
+lo supera el script termina con código 1, de modo que puede usarse como
+control antes de integrar cambios que vuelvan a importar scipy, PuLP o pandas
+al cargar los módulos.
+
+    python benchmarks/benchmark_arranque.py
+    python benchmarks/benchmark_arranque.py --repeticiones 10 --factor-limite 2 --json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (nombre, código que ejecuta el intérprete, límite en segundos)
+CASOS = [
+    ('importar_main', 'import main', 0.15),
+    ('importar_programadores', 'import modulo_asignacion_programadores', 0.4),
+    ('importar_servidores', 'import modulo_asignacion_servidores', 0.4),
+    ('transporte_simplex_red',
+     "from modulo_asignacion_programadores import resolver_archivo; resolver_archivo('programadores.txt', 'simplex_red')", 0.6),
+    ('transporte_highs',
+     "from modulo_asignacion_programadores import resolver_archivo; resolver_archivo('programadores.txt', 'highs')", 1.5),
+    ('transporte_pulp',
+     "from modulo_asignacion_programadores import resolver_archivo; resolver_archivo('programadores.txt', 'pulp')", 2.5),
+    ('servidores_hungaro',
+     "from modulo_asignacion_servidores import resolver_archivo; resolver_archivo('servidores.txt', 'hungaro')", 1.5),
+    ('servidores_flujo_costo_minimo',
+     "from modulo_asignacion_servidores import resolver_archivo; resolver_archivo('servidores.txt', 'flujo_costo_minimo')", 0.6),
+]
+
+# Módulos pesados que no deben cargarse al importar main.py
+MODULOS_PESADOS = ('pandas', 'pulp', 'scipy')
+
+
+def medir(codigo, repeticiones):
+    """Tiempos de pared de ejecutar el código en intérpretes nuevos."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def modulos_pesados_en_arranque():
+    """Módulos pesados que ya están en sys.modules tras importar main.py."""
+    codigo = ("import sys, main; print(','.join(sorted({m.split('.')[0] for m in sys.modules} & set(%r))))"
+              % (MODULOS_PESADOS,))
+    salida = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, check=True,
+                            capture_output=True, text=True).stdout.strip()
+    return salida.split(',') if salida else []
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark de arranque en frío.")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--factor-limite', type=float, default=1.0,
+                        help="Multiplica los límites (para máquinas más lentas)")
+    parser.add_argument('--json', action='store_true', help="Escribe los resultados en JSON")
+    args = parser.parse_args(argumentos)
+
+    # Un arranque de Python vacío como referencia
+    base = statistics.median(medir('pass', args.repeticiones))
+    resultados = []
+    for nombre, codigo, limite in CASOS:
+        tiempos = medir(codigo, args.repeticiones)
+        mediana = statistics.median(tiempos)
+        resultados.append({
+            'caso': nombre,
+            'mediana': mediana,
+            'minimo': min(tiempos),
+            'sobre_interprete': mediana - base,
+            'limite': limite * args.factor_limite,
+            'ok': mediana <= limite * args.factor_limite
+        })
+
+    pesados = modulos_pesados_en_arranque()
+    if args.json:
+        json.dump({'interprete_vacio': base, 'casos': resultados, 'modulos_pesados_en_main': pesados},
+                  sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        print(f"Intérprete vacío: {base:.3f} s")
+        print(f"{'caso':32s} {'mediana':>9s} {'mínimo':>9s} {'límite':>9s}")
+        for r in resultados:
+            print(f"{r['caso']:32s} {r['mediana']:9.3f} {r['minimo']:9.3f} {r['limite']:9.3f}"
+                  f"{'' if r['ok'] else '  EXCEDIDO'}")
+        if pesados:
+            print(f"main.py carga módulos pesados al arrancar: {', '.join(pesados)}")
+
+    return 0 if all(r['ok'] for r in resultados) and not pesados else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Mide los eventos por segundo de AsignacionEnLinea con los servidores cerca de
+su capacidad total, que es el caso más caro: cada llegada necesita un camino
+aumentante que mueve solicitudes entre servidores.
+
+Se llena primero el sistema hasta la ocupación pedida y luego se alternan al
+azar llegadas y salidas manteniendo esa ocupación; solo se miden los eventos de
+esta segunda etapa. Con --verificar se compara además el costo mantenido contra
+linear_sum_assignment después de cada evento (lento, fuera de la medición).
+
+    python benchmarks/benchmark_en_linea.py
+    python benchmarks/benchmark_en_linea.py --servidores 100 200 --eventos 5000 --verificar
+"""
+import argparse
+import json
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import numpy as np
+from modulo_asignacion_servidores import AsignacionEnLinea
+
+
+def costo_referencia(en_linea, activas, capacidades):
+    """Costo ajustado óptimo de las solicitudes activas con linear_sum_assignment (servidores replicados)."""
+    from scipy.optimize import linear_sum_assignment
+
+    lugares = np.asarray([en_linea._lugar[identificador] for identificador in activas], dtype=np.int64)
+    columnas = np.repeat(np.arange(en_linea.num_servidores), capacidades.astype(np.int64))
+    filas, asignadas = linear_sum_assignment(en_linea._costos[lugares][:, columnas])
+    return float(en_linea._costos[lugares[filas], columnas[asignadas]].sum())
+
+
+def medir(num_servidores, capacidad, ocupacion, eventos, semilla, verificar):
+    rng = np.random.default_rng(semilla)
+    capacidades = np.full(num_servidores, capacidad, dtype=np.float64)
+    en_linea = AsignacionEnLinea(num_servidores, capacidades, prioridad_maxima=5.0)
+    objetivo = int(ocupacion * capacidades.sum())
+
+    def llegar():
+        return en_linea.agregar_solicitud(rng.integers(1, 101, size=num_servidores).astype(np.float64),
+                                          float(rng.integers(1, 6)))
+
+    activas = [llegar() for _ in range(objetivo)]
+    en_linea.latencias.clear()
+
+    diferencias = 0
+    for _ in range(eventos):
+        # Llegada o salida al azar, con más llegadas cuando la ocupación baja del objetivo
+        if rng.random() < 0.5 + 0.5 * (len(activas) < objetivo) - 0.5 * (len(activas) > objetivo):
+            activas.append(llegar())
+        else:
+            en_linea.completar_solicitud(activas.pop(int(rng.integers(len(activas)))))
+        if verificar and not en_linea.cola:
+            referencia = costo_referencia(en_linea, activas, capacidades)
+            diferencias += not np.isclose(en_linea.costo_ajustado(), referencia)
+
+    resultado = {'servidores': num_servidores, 'capacidad': capacidad, 'ocupacion': ocupacion}
+    resultado.update(en_linea.estadisticas_latencia())
+    if verificar:
+        resultado['diferencias_con_referencia'] = diferencias
+    return resultado
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark de la asignación en línea.")
+    parser.add_argument('--servidores', type=int, nargs='+', default=[50, 100, 200])
+    parser.add_argument('--capacidad', type=int, default=5, help="Solicitudes simultáneas por servidor")
+    parser.add_argument('--ocupacion', type=float, default=0.95, help="Fracción de la capacidad total ocupada")
+    parser.add_argument('--eventos', type=int, default=5000)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--verificar', action='store_true',
+                        help="Compara contra linear_sum_assignment después de cada evento")
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argumentos)
+
+    resultados = [medir(num_servidores, args.capacidad, args.ocupacion, args.eventos, args.semilla, args.verificar)
+                  for num_servidores in args.servidores]
+    if args.json:
+        json.dump(resultados, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        for r in resultados:
+            print(f"{r['servidores']:>5d} servidores  {r['eventos_por_segundo']:9.0f} eventos/s  "
+                  f"p50 {1e3 * r['p50']:7.3f} ms  p99 {1e3 * r['p99']:7.3f} ms"
+                  + (f"  diferencias {r['diferencias_con_referencia']}" if 'diferencias_con_referencia' in r else ''))
+    return 1 if any(r.get('diferencias_con_referencia') for r in resultados) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
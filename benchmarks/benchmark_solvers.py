@@ -0,0 +1,257 @@
+"""
+Benchmark de los motores de ambos módulos sobre instancias sintéticas.
+
+Para cada tamaño, variante y motor se mide por separado la construcción del
+problema (incluido el balanceo), la resolución y el reporte (resultado() y
+generar_reporte()), y se escribe todo en JSON junto con el commit y las
+versiones de las bibliotecas. Con --comparar se contrasta contra un JSON de
+una ejecución anterior para detectar regresiones entre commits.
+
+    python benchmarks/benchmark_solvers.py --output resultados.json
+    python benchmarks/benchmark_solvers.py --tamanos 10 100 1000 10000 --modulo servidores
+    python benchmarks/benchmark_solvers.py --output nuevo.json --comparar resultados.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import numpy as np
+from generadores import (VARIANTES_TRANSPORTE, generar_servidores, generar_servidores_disperso, generar_transporte,
+                         generar_transporte_disperso)
+from modulo_asignacion_programadores import AsignacionProgramadoresTareas
+from modulo_asignacion_servidores import AsignacionSolicitudesServidores
+
+# Máximo de celdas de la matriz de costos con que se ejecuta cada motor por
+# defecto; las instancias mayores se registran como omitidas
+LIMITE_CELDAS = {
+    ('transporte', 'simplex_red'): 4_000_000,
+    ('transporte', 'highs'): 1_000_000,
+    ('transporte', 'pulp'): 20_000,
+    ('transporte', 'heuristico'): 100_000_000,
+    ('servidores', 'hungaro'): 4_000_000,
+    ('servidores', 'hungaro_replicado'): 1_000_000,
+    ('servidores', 'flujo_costo_minimo'): 10_000_000,
+}
+
+
+# Arcos permitidos por tarea o solicitud de la variante 'disperso' (instancias con arcos prohibidos)
+ARCOS_POR_TAREA = 10
+
+
+def dimensiones(tamano, proporcion_filas):
+    """Filas (programadores o servidores) y columnas de una instancia de un tamaño."""
+    return max(2, int(round(tamano * proporcion_filas))), tamano
+
+
+def medir_transporte(datos, motor, solucion_inicial):
+    N, M, C, S, D = datos
+    inicio = time.perf_counter()
+    problema = AsignacionProgramadoresTareas(N, M, C, S, D)
+    construccion = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    problema.resolver(motor, solucion_inicial)
+    resolucion = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    json.dumps(problema.resultado())
+    problema.generar_reporte()
+    reporte = time.perf_counter() - inicio
+
+    return {'construccion': construccion, 'resolucion': resolucion, 'reporte': reporte}, \
+        float(problema.costo_total), dict(problema.tiempos)
+
+
+def medir_servidores(datos, motor, _):
+    S, R, C, prioridades, capacidades = datos
+    inicio = time.perf_counter()
+    problema = AsignacionSolicitudesServidores(S, R, C, prioridades, capacidades)
+    construccion = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    problema.resolver(motor)
+    resolucion = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    json.dumps(problema.resultado())
+    problema.generar_reporte()
+    reporte = time.perf_counter() - inicio
+
+    return {'construccion': construccion, 'resolucion': resolucion, 'reporte': reporte}, \
+        float(problema.tiempo_total), {}
+
+
+def casos(args):
+    """Genera (módulo, variante, tamaño, motor, función de generación) a ejecutar."""
+    for tamano in args.tamanos:
+        filas, columnas = dimensiones(tamano, args.proporcion_filas)
+        if 'transporte' in args.modulo:
+            for variante in args.variantes:
+                if variante == 'disperso':
+                    generar = lambda f=filas, c=columnas: generar_transporte_disperso(f, c, args.semilla,
+                                                                                      arcos_por_tarea=ARCOS_POR_TAREA)
+                else:
+                    generar = lambda v=variante, f=filas, c=columnas: generar_transporte(f, c, args.semilla, v)
+                for motor in args.motores_transporte:
+                    yield 'transporte', variante, tamano, filas, columnas, motor, generar
+        if 'servidores' in args.modulo:
+            generar = lambda f=filas, c=columnas: generar_servidores(f, c, args.semilla)
+            for motor in args.motores_servidores:
+                yield 'servidores', 'con_capacidades', tamano, filas, columnas, motor, generar
+            if 'disperso' in args.variantes:
+                generar = lambda f=filas, c=columnas: generar_servidores_disperso(f, c, args.semilla,
+                                                                                  arcos_por_solicitud=ARCOS_POR_TAREA)
+                for motor in args.motores_servidores:
+                    yield 'servidores', 'disperso', tamano, filas, columnas, motor, generar
+
+
+def ejecutar(args):
+    resultados = []
+    instancias = {}
+    for modulo, variante, tamano, filas, columnas, motor, generar in casos(args):
+        fila = {'modulo': modulo, 'variante': variante, 'tamano': tamano, 'filas': filas,
+                'columnas': columnas, 'motor': motor}
+        # En la variante dispersa solo se guardan y recorren los arcos permitidos
+        celdas = columnas * ARCOS_POR_TAREA if variante == 'disperso' else filas * columnas
+        if not args.sin_limites and celdas > LIMITE_CELDAS[(modulo, motor)]:
+            fila['omitido'] = f"más de {LIMITE_CELDAS[(modulo, motor)]} celdas (use --sin-limites)"
+            resultados.append(fila)
+            continue
+
+        # La misma instancia se reutiliza para todos los motores
+        clave = (modulo, variante, tamano)
+        if clave not in instancias:
+            instancias.clear()
+            instancias[clave] = generar()
+        medir = medir_transporte if modulo == 'transporte' else medir_servidores
+
+        repeticiones = []
+        try:
+            for _ in range(args.repeticiones):
+                repeticiones.append(medir(instancias[clave], motor, args.solucion_inicial))
+        except Exception as e:
+            fila['error'] = str(e)
+            resultados.append(fila)
+            continue
+
+        fila['tiempos'] = {fase: statistics.median(r[0][fase] for r in repeticiones)
+                           for fase in ('construccion', 'resolucion', 'reporte')}
+        fila['tiempos_minimos'] = {fase: min(r[0][fase] for r in repeticiones)
+                                   for fase in ('construccion', 'resolucion', 'reporte')}
+        fila['objetivo'] = repeticiones[0][1]
+        fila['fases_internas'] = repeticiones[0][2]
+        resultados.append(fila)
+        if not args.silencioso:
+            t = fila['tiempos']
+            print(f"{modulo:10s} {variante:16s} {filas:>6d}x{columnas:<6d} {motor:18s} "
+                  f"construcción {t['construccion']:8.4f}  resolución {t['resolucion']:8.4f}  "
+                  f"reporte {t['reporte']:8.4f}", file=sys.stderr)
+    return resultados
+
+
+def metadatos(args):
+    """Datos del entorno para poder comparar ejecuciones entre commits."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=RAIZ, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    versiones = {'python': platform.python_version(), 'numpy': np.__version__}
+    for modulo in ('scipy', 'pulp'):
+        try:
+            versiones[modulo] = __import__(modulo).__version__
+        except (ImportError, AttributeError):
+            versiones[modulo] = None
+    return {
+        'commit': commit,
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'plataforma': platform.platform(),
+        'procesador': platform.processor() or platform.machine(),
+        'versiones': versiones,
+        'parametros': {'semilla': args.semilla, 'repeticiones': args.repeticiones,
+                       'proporcion_filas': args.proporcion_filas, 'solucion_inicial': args.solucion_inicial}
+    }
+
+
+def comparar(actuales, anteriores, umbral, piso=0.01):
+    """
+    Muestra el cociente de los tiempos de resolución contra otra ejecución. Los
+    tiempos por debajo de piso segundos se cuentan como piso, para no marcar
+    como regresión el ruido de las instancias pequeñas.
+
+    Returns:
+        int: Número de casos más lentos que umbral veces el anterior o con otro objetivo
+    """
+    previos = {(r['modulo'], r['variante'], r['tamano'], r['motor']): r for r in anteriores['resultados']}
+    regresiones = 0
+    print(f"Comparación contra el commit {anteriores['metadatos'].get('commit')}:")
+    for r in actuales:
+        anterior = previos.get((r['modulo'], r['variante'], r['tamano'], r['motor']))
+        if anterior is None or 'tiempos' not in r or 'tiempos' not in anterior:
+            continue
+        cociente = max(r['tiempos']['resolucion'], piso) / max(anterior['tiempos']['resolucion'], piso)
+        marcas = []
+        if cociente > umbral:
+            marcas.append('MÁS LENTO')
+        if not np.isclose(r['objetivo'], anterior['objetivo']):
+            marcas.append(f"OBJETIVO DISTINTO ({anterior['objetivo']} -> {r['objetivo']})")
+        regresiones += bool(marcas)
+        print(f"  {r['modulo']:10s} {r['variante']:16s} {r['tamano']:>6d} {r['motor']:18s} "
+              f"x{cociente:6.2f}  {' '.join(marcas)}")
+    return regresiones
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark de los motores de resolución.")
+    parser.add_argument('--modulo', nargs='+', choices=['transporte', 'servidores'],
+                        default=['transporte', 'servidores'])
+    parser.add_argument('--tamanos', type=int, nargs='+', default=[10, 100, 1000, 10000],
+                        help="Número de tareas o solicitudes (columnas) de cada instancia")
+    parser.add_argument('--proporcion-filas', type=float, default=0.1,
+                        help="Programadores o servidores por cada columna")
+    parser.add_argument('--variantes', nargs='+', choices=VARIANTES_TRANSPORTE + ('disperso',),
+                        default=list(VARIANTES_TRANSPORTE),
+                        help="'disperso' genera instancias con arcos prohibidos (en transporte, balanceadas)")
+    parser.add_argument('--motores-transporte', nargs='+', choices=['simplex_red', 'highs', 'pulp', 'heuristico'],
+                        default=['simplex_red', 'highs', 'pulp'],
+                        help="'heuristico' usa el límite de tiempo por defecto (no da el óptimo exacto)")
+    parser.add_argument('--motores-servidores', nargs='+', choices=['hungaro', 'hungaro_replicado', 'flujo_costo_minimo'],
+                        default=['hungaro', 'hungaro_replicado', 'flujo_costo_minimo'])
+    parser.add_argument('--solucion-inicial', choices=['vogel', 'costo_minimo', 'esquina_noroeste'], default='vogel')
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--sin-limites', action='store_true', help="Ejecuta todos los motores en todos los tamaños")
+    parser.add_argument('--output', '-o', default='-', help="Archivo JSON de salida ('-' para la salida estándar)")
+    parser.add_argument('--comparar', default=None, help="JSON de una ejecución anterior")
+    parser.add_argument('--umbral', type=float, default=1.25,
+                        help="Cociente de tiempos a partir del cual se marca una regresión")
+    parser.add_argument('--piso', type=float, default=0.01,
+                        help="Segundos por debajo de los cuales los tiempos no se comparan")
+    parser.add_argument('--silencioso', action='store_true')
+    args = parser.parse_args(argumentos)
+
+    salida = {'metadatos': metadatos(args), 'resultados': ejecutar(args)}
+    if args.output == '-':
+        json.dump(salida, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(salida, f, indent=2, ensure_ascii=False)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            anteriores = json.load(f)
+        return 1 if comparar(salida['resultados'], anteriores, args.umbral, args.piso) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Generadores de instancias sintéticas reproducibles para los benchmarks.
+
+Cada generador recibe una semilla y devuelve los mismos arreglos que producen
+los lectores de lectura_instancias, así que las instancias pueden resolverse
+directamente o guardarse en texto o .npz con las funciones de ese módulo.
+"""
+import numpy as np
+
+# Variantes de oferta y demanda de las instancias de transporte
+VARIANTES_TRANSPORTE = ('balanceado', 'exceso_oferta', 'exceso_demanda')
+
+
+def generar_transporte(num_programadores, num_tareas, semilla=0, variante='balanceado',
+                       costo_maximo=100, demanda_maxima=5, desbalance=0.2):
+    """
+    Genera una instancia de asignación de programadores a tareas.
+
+    Args:
+        variante (str): 'balanceado' (oferta total igual a la demanda total),
+            'exceso_oferta' (balancear_oferta_demanda agrega una columna ficticia)
+            o 'exceso_demanda' (agrega una fila ficticia)
+        costo_maximo (int): Los costos son enteros uniformes en [1, costo_maximo]
+        demanda_maxima (int): Las demandas son enteros uniformes en [1, demanda_maxima]
+        desbalance (float): Fracción de la demanda total que sobra o falta en las
+            variantes desbalanceadas
+
+    Returns:
+        tuple: (N, M, C, S, D) como leer_instancia_programadores
+    """
+    if variante not in VARIANTES_TRANSPORTE:
+        raise ValueError(f"Variante desconocida: {variante}")
+    rng = np.random.default_rng(semilla)
+    C = rng.integers(1, costo_maximo + 1, size=(num_programadores, num_tareas)).astype(np.float64)
+    D = rng.integers(1, demanda_maxima + 1, size=num_tareas).astype(np.int64)
+
+    total = int(D.sum())
+    if variante == 'exceso_oferta':
+        total += max(1, int(total * desbalance))
+    elif variante == 'exceso_demanda':
+        total -= max(1, int(total * desbalance))
+    S = _repartir(rng, max(total, num_programadores), num_programadores)
+    return num_programadores, num_tareas, C, S, D
+
+
+def generar_transporte_disperso(num_programadores, num_tareas, semilla=0, variante='balanceado', arcos_por_tarea=10,
+                                costo_maximo=100, demanda_maxima=5, desbalance=0.2):
+    """
+    Genera una instancia dispersa de asignación de programadores a tareas: cada
+    tarea admite unos arcos_por_tarea programadores al azar. Para que siempre
+    tenga solución se agregan además las celdas de una asignación noroeste
+    sobre filas y columnas permutadas al azar.
+
+    Returns:
+        tuple: (N, M, C, S, D) con C como matriz CSR de SciPy (ver lectura_instancias.matriz_arcos)
+    """
+    from lectura_instancias import matriz_arcos
+
+    if variante not in VARIANTES_TRANSPORTE:
+        raise ValueError(f"Variante desconocida: {variante}")
+    rng = np.random.default_rng(semilla)
+    D = rng.integers(1, demanda_maxima + 1, size=num_tareas).astype(np.int64)
+    total = int(D.sum())
+    if variante == 'exceso_oferta':
+        total += max(1, int(total * desbalance))
+    elif variante == 'exceso_demanda':
+        total -= max(1, int(total * desbalance))
+    S = _repartir(rng, max(total, num_programadores), num_programadores)
+
+    # Asignación factible: regla noroeste entre permutaciones de filas y columnas
+    orden_filas = rng.permutation(num_programadores)
+    orden_columnas = rng.permutation(num_tareas)
+    acumulada_oferta = np.cumsum(S[orden_filas])
+    acumulada_demanda = np.cumsum(D[orden_columnas])
+    cortes = np.union1d(acumulada_oferta, acumulada_demanda)
+    inicios = np.concatenate([[0], cortes[:-1]])
+    inicios = inicios[inicios < min(acumulada_oferta[-1], acumulada_demanda[-1])]
+    filas = orden_filas[np.searchsorted(acumulada_oferta, inicios, side='right')]
+    columnas = orden_columnas[np.searchsorted(acumulada_demanda, inicios, side='right')]
+
+    por_tarea = min(arcos_por_tarea, num_programadores)
+    filas = np.concatenate([filas, rng.integers(0, num_programadores, size=num_tareas * por_tarea)])
+    columnas = np.concatenate([columnas, np.repeat(np.arange(num_tareas), por_tarea)])
+    claves = np.unique(filas * num_tareas + columnas)
+    filas, columnas = np.divmod(claves, num_tareas)
+    costos = rng.integers(1, costo_maximo + 1, size=claves.size).astype(np.float64)
+    return num_programadores, num_tareas, matriz_arcos(num_programadores, num_tareas, filas, columnas, costos), S, D
+
+
+def generar_servidores(num_servidores, num_solicitudes, semilla=0, costo_maximo=100,
+                       niveles_prioridad=5, holgura=1.2):
+    """
+    Genera una instancia de asignación de solicitudes a servidores.
+
+    Args:
+        niveles_prioridad (int): Las prioridades son enteros en [1, niveles_prioridad]
+        holgura (float): Capacidad total respecto del número de solicitudes (debe
+            ser al menos 1 para que todas puedan asignarse; None para no limitar
+            la capacidad)
+
+    Returns:
+        tuple: (S, R, C, prioridades, capacidades) como leer_instancia_servidores
+    """
+    rng = np.random.default_rng(semilla)
+    C = rng.integers(1, costo_maximo + 1, size=(num_servidores, num_solicitudes)).astype(np.float64)
+    prioridades = rng.integers(1, niveles_prioridad + 1, size=num_solicitudes).astype(np.float64)
+    capacidades = None
+    if holgura is not None:
+        total = max(num_servidores, int(np.ceil(num_solicitudes * holgura)))
+        capacidades = _repartir(rng, total, num_servidores).astype(np.float64)
+    return num_servidores, num_solicitudes, C, prioridades, capacidades
+
+
+def generar_servidores_disperso(num_servidores, num_solicitudes, semilla=0, arcos_por_solicitud=10, costo_maximo=100,
+                                niveles_prioridad=5, holgura=1.2):
+    """
+    Genera una instancia dispersa de asignación de solicitudes a servidores:
+    cada solicitud admite unos arcos_por_solicitud servidores al azar. Para que
+    siempre tenga solución, a cada solicitud se le agrega además el servidor de
+    un lugar de capacidad distinto, elegido al azar.
+
+    Returns:
+        tuple: (S, R, C, prioridades, capacidades) con C como matriz CSR de SciPy
+    """
+    from lectura_instancias import matriz_arcos
+
+    rng = np.random.default_rng(semilla)
+    total = max(num_servidores, int(np.ceil(num_solicitudes * max(holgura, 1.0))))
+    capacidades = _repartir(rng, total, num_servidores)
+    lugares = rng.permutation(np.repeat(np.arange(num_servidores), capacidades))[:num_solicitudes]
+
+    por_solicitud = min(arcos_por_solicitud, num_servidores)
+    filas = np.concatenate([lugares, rng.integers(0, num_servidores, size=num_solicitudes * por_solicitud)])
+    columnas = np.concatenate([np.arange(num_solicitudes), np.repeat(np.arange(num_solicitudes), por_solicitud)])
+    claves = np.unique(filas * num_solicitudes + columnas)
+    filas, columnas = np.divmod(claves, num_solicitudes)
+    costos = rng.integers(1, costo_maximo + 1, size=claves.size).astype(np.float64)
+    prioridades = rng.integers(1, niveles_prioridad + 1, size=num_solicitudes).astype(np.float64)
+    return (num_servidores, num_solicitudes, matriz_arcos(num_servidores, num_solicitudes, filas, columnas, costos),
+            prioridades, capacidades.astype(np.float64))
+
+
+def _repartir(rng, total, partes):
+    """Reparte un total entero en partes positivas al azar."""
+    cortes = np.sort(rng.choice(np.arange(1, total), size=partes - 1, replace=False)) if partes > 1 else []
+    return np.diff(np.concatenate(([0], cortes, [total]))).astype(np.int64)
@@ -0,0 +1,127 @@
+import hashlib
+import os
+from collections import OrderedDict
+import numpy as np
+
+
+class CacheSoluciones:
+    """
+    Caché de soluciones direccionada por contenido.
+
+    La clave de una instancia es un hash blake2b de sus arreglos de NumPy (bytes,
+    tipo y forma) y de sus parámetros, así que dos instancias con los mismos datos
+    comparten la solución aunque sean objetos distintos. Las soluciones se guardan
+    como diccionarios de arreglos en una LRU en memoria limitada en bytes y, si se
+    indica un directorio, también en disco como archivos .npz, de donde se
+    recuperan cuando ya salieron de la memoria.
+    """
+
+    def __init__(self, limite_bytes=64 * 1024 * 1024, directorio=None):
+
+        self.limite_bytes = limite_bytes # Tamaño máximo de las soluciones en memoria
+        self.directorio = directorio # Directorio del nivel en disco (None para no usarlo)
+        self._entradas = OrderedDict() # Clave -> (solución, bytes), de la menos a la más usada
+        self.bytes_usados = 0
+        self.aciertos = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+        if directorio is not None:
+            os.makedirs(directorio, exist_ok=True)
+
+    @staticmethod
+    def clave(*partes):
+        """Hash de una instancia a partir de sus arreglos y parámetros."""
+        huella = hashlib.blake2b(digest_size=20)
+        for parte in partes:
+            if isinstance(parte, np.ndarray):
+                huella.update(f'{parte.dtype.str}{parte.shape}'.encode())
+                huella.update(np.ascontiguousarray(parte).data)
+            elif hasattr(parte, 'tocsr'):
+                # Matriz dispersa de SciPy: su forma y los tres arreglos CSR
+                parte = parte.tocsr()
+                huella.update(f'csr{parte.shape}'.encode())
+                for arreglo in (parte.indptr, parte.indices, parte.data):
+                    huella.update(arreglo.dtype.str.encode())
+                    huella.update(np.ascontiguousarray(arreglo).data)
+            else:
+                huella.update(repr(parte).encode())
+            huella.update(b'|')
+        return huella.hexdigest()
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, f'{clave}.npz')
+
+    def obtener(self, clave):
+        """
+        Devuelve la solución guardada con esa clave, o None si no está en ningún nivel.
+
+        Returns:
+            dict: Arreglos de la solución (no deben modificarse: son los de la caché)
+        """
+        entrada = self._entradas.get(clave)
+        if entrada is not None:
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return entrada[0]
+
+        if self.directorio is not None and os.path.exists(self._ruta(clave)):
+            with np.load(self._ruta(clave)) as datos:
+                solucion = {nombre: datos[nombre] for nombre in datos.files}
+            self._guardar_en_memoria(clave, solucion)
+            self.aciertos += 1
+            self.aciertos_disco += 1
+            return solucion
+
+        self.fallos += 1
+        return None
+
+    def guardar(self, clave, solucion):
+        """
+        Guarda una solución (diccionario de arreglos o escalares) en memoria y, si hay
+        directorio, en disco.
+        """
+        solucion = {nombre: np.asarray(valor) for nombre, valor in solucion.items()}
+        self._guardar_en_memoria(clave, solucion)
+        if self.directorio is not None:
+            # Se escribe a un temporal y se renombra para no dejar archivos a medias
+            temporal = self._ruta(clave) + '.tmp'
+            with open(temporal, 'wb') as f:
+                np.savez(f, **solucion)
+            os.replace(temporal, self._ruta(clave))
+
+    def _guardar_en_memoria(self, clave, solucion):
+        tamano = sum(valor.nbytes for valor in solucion.values())
+        if tamano > self.limite_bytes:
+            return
+        anterior = self._entradas.pop(clave, None)
+        if anterior is not None:
+            self.bytes_usados -= anterior[1]
+        self._entradas[clave] = (solucion, tamano)
+        self.bytes_usados += tamano
+
+        # Desalojar las menos usadas hasta volver al límite
+        while self.bytes_usados > self.limite_bytes:
+            _, (_, tamano_desalojado) = self._entradas.popitem(last=False)
+            self.bytes_usados -= tamano_desalojado
+            self.desalojos += 1
+
+    def limpiar(self):
+        """Vacía el nivel en memoria (los archivos en disco se conservan)."""
+        self._entradas.clear()
+        self.bytes_usados = 0
+
+    def estadisticas(self):
+        """Contadores de aciertos y fallos y uso de memoria."""
+        consultas = self.aciertos + self.fallos
+        return {
+            'aciertos': self.aciertos,
+            'aciertos_disco': self.aciertos_disco,
+            'fallos': self.fallos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+            'entradas': len(self._entradas),
+            'bytes_usados': self.bytes_usados,
+            'limite_bytes': self.limite_bytes,
+            'desalojos': self.desalojos
+        }
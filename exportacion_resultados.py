@@ -0,0 +1,170 @@
+import json
+import math
+import os
+
+import numpy as np
+
+# Extensión del archivo -> formato de exportación
+FORMATOS = {
+    '.jsonl': 'jsonl',
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+}
+
+TAMANO_BLOQUE = 100000 # Asignaciones que se convierten y escriben de una vez
+
+
+def _bloques(columnas, tamano_bloque):
+    """Recorre las columnas de a tamano_bloque filas (vistas, sin copiar)."""
+    total = len(next(iter(columnas.values()))) if columnas else 0
+    for inicio in range(0, total, tamano_bloque):
+        yield {nombre: valores[inicio:inicio + tamano_bloque] for nombre, valores in columnas.items()}
+
+
+def _formato_linea(columnas, plantilla_columna, separador):
+    """
+    Plantilla % de una línea: %d para enteros y %r para reales, que es la
+    representación más corta que se vuelve a leer como el mismo float64.
+    """
+    return separador.join(plantilla_columna.format(nombre=nombre, valor='%d' if valores.dtype.kind in 'iub' else '%r')
+                          for nombre, valores in columnas.items())
+
+
+class _Nulo:
+    """Valor cuyo %r es el null de JSON."""
+
+    def __repr__(self):
+        return 'null'
+
+
+_NULO = _Nulo()
+
+
+def _valores_json(valores):
+    """
+    Lista de valores de una columna para JSON: los reales no finitos (nan, inf)
+    no existen en JSON y se escriben como null.
+    """
+    lista = valores.tolist()
+    if valores.dtype.kind == 'f':
+        for indice in np.flatnonzero(~np.isfinite(valores)).tolist():
+            lista[indice] = _NULO
+    return lista
+
+
+def reemplazar_no_finitos(datos):
+    """
+    Copia de datos (diccionarios, listas y tuplas anidados) con los reales no
+    finitos cambiados por None, para escribirla con json.dump(..., allow_nan=False):
+    NaN e Infinity no son JSON válido y muchos lectores los rechazan.
+    """
+    if isinstance(datos, float):
+        return datos if math.isfinite(datos) else None
+    if isinstance(datos, dict):
+        return {clave: reemplazar_no_finitos(valor) for clave, valor in datos.items()}
+    if isinstance(datos, (list, tuple)):
+        return [reemplazar_no_finitos(valor) for valor in datos]
+    return datos
+
+
+def escribir_jsonl(columnas, archivo, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Escribe un objeto JSON por asignación en un archivo de texto abierto. Los
+    reales no finitos se escriben como null (ver _valores_json).
+    """
+    plantilla = '{' + _formato_linea(columnas, '"{nombre}": {valor}', ', ') + '}\n'
+    for bloque in _bloques(columnas, tamano_bloque):
+        archivo.write(''.join(map(plantilla.__mod__, zip(*(_valores_json(valores) for valores in bloque.values())))))
+
+
+def escribir_csv(columnas, archivo, tamano_bloque=TAMANO_BLOQUE):
+    """Escribe las asignaciones como CSV con encabezado en un archivo de texto abierto."""
+    archivo.write(','.join(columnas) + '\n')
+    plantilla = _formato_linea(columnas, '{valor}', ',') + '\n'
+    for bloque in _bloques(columnas, tamano_bloque):
+        archivo.write(''.join(map(plantilla.__mod__, zip(*(valores.tolist() for valores in bloque.values())))))
+
+
+def _importar_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Para exportar a Parquet o Arrow se necesita pyarrow (pip install pyarrow).") from None
+    return pyarrow
+
+
+def escribir_parquet(columnas, ruta, tamano_bloque=TAMANO_BLOQUE):
+    """Escribe las asignaciones en Parquet, un grupo de filas por bloque."""
+    pa = _importar_pyarrow()
+    import pyarrow.parquet as pq
+
+    esquema = pa.schema([(nombre, pa.from_numpy_dtype(valores.dtype)) for nombre, valores in columnas.items()])
+    with pq.ParquetWriter(ruta, esquema) as escritor:
+        for bloque in _bloques(columnas, tamano_bloque):
+            escritor.write_table(pa.Table.from_arrays([pa.array(valores) for valores in bloque.values()], schema=esquema))
+
+
+def escribir_arrow(columnas, ruta, tamano_bloque=TAMANO_BLOQUE):
+    """Escribe las asignaciones en formato Arrow IPC (Feather v2), un lote por bloque."""
+    pa = _importar_pyarrow()
+
+    esquema = pa.schema([(nombre, pa.from_numpy_dtype(valores.dtype)) for nombre, valores in columnas.items()])
+    with pa.OSFile(ruta, 'wb') as destino, pa.ipc.new_file(destino, esquema) as escritor:
+        for bloque in _bloques(columnas, tamano_bloque):
+            escritor.write_batch(pa.RecordBatch.from_arrays([pa.array(valores) for valores in bloque.values()],
+                                                           schema=esquema))
+
+
+def ruta_resumen(ruta):
+    """Archivo JSON con el resumen que acompaña a una exportación."""
+    return os.path.splitext(ruta)[0] + '.resumen.json'
+
+
+def exportar_resultado(problema, ruta, formato=None, tamano_bloque=TAMANO_BLOQUE, resumen=True):
+    """
+    Exporta las asignaciones de un problema resuelto (de cualquiera de los dos
+    módulos) directamente desde sus arreglos de NumPy, por bloques, y guarda
+    junto a ellas un JSON con el resumen, los tiempos y la instrumentación.
+
+    Args:
+        problema: AsignacionProgramadoresTareas o AsignacionSolicitudesServidores ya resuelto
+        ruta (str): Archivo de destino
+        formato (str): 'jsonl', 'csv', 'parquet' o 'arrow'; por defecto se deduce
+            de la extensión de la ruta
+        resumen (bool): Si es False no se escribe el JSON con el resumen
+
+    Returns:
+        list: Rutas de los archivos escritos
+    """
+    if formato is None:
+        extension = os.path.splitext(ruta)[1].lower()
+        if extension not in FORMATOS:
+            raise ValueError(f"No se reconoce el formato de {ruta}; use una de {', '.join(FORMATOS)}")
+        formato = FORMATOS[extension]
+
+    columnas = problema.columnas_resultado()
+    if columnas is None:
+        raise ValueError("Debe resolver el problema antes de exportar el resultado.")
+
+    if formato in ('jsonl', 'csv'):
+        with open(ruta, 'w', encoding='utf-8', newline='') as archivo:
+            (escribir_jsonl if formato == 'jsonl' else escribir_csv)(columnas, archivo, tamano_bloque)
+    elif formato == 'parquet':
+        escribir_parquet(columnas, ruta, tamano_bloque)
+    elif formato == 'arrow':
+        escribir_arrow(columnas, ruta, tamano_bloque)
+    else:
+        raise ValueError(f"Formato de exportación desconocido: {formato}")
+
+    escritos = [ruta]
+    if resumen:
+        datos = problema.resultado(incluir_asignaciones=False)
+        datos['formato'] = formato
+        datos['archivo_asignaciones'] = os.path.basename(ruta)
+        datos['num_asignaciones'] = len(next(iter(columnas.values())))
+        with open(ruta_resumen(ruta), 'w', encoding='utf-8') as archivo:
+            json.dump(reemplazar_no_finitos(datos), archivo, ensure_ascii=False, indent=2, allow_nan=False)
+        escritos.append(ruta_resumen(ruta))
+    return escritos
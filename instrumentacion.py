@@ -0,0 +1,136 @@
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+
+class Medida:
+    """Resultado de una ejecución de una fase (disponible al salir del bloque with)."""
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.segundos = 0.0
+        self.pico_memoria = None # Bytes reservados por encima de los del inicio de la fase (con medir_memoria)
+
+
+class Instrumentacion:
+    """
+    Tiempos y memoria por fase de una resolución.
+
+    Cada bloque `with instrumentacion.fase('nombre')` suma su tiempo de pared a la
+    fase; las fases pueden anidarse y cada una cuenta su tiempo completo,
+    incluido el de las fases internas. Con medir_memoria se activa tracemalloc y
+    se guarda el pico de memoria de cada fase (NumPy informa sus reservas a
+    tracemalloc, así que incluye las matrices). Con perfilar se activa cProfile
+    mientras haya alguna fase abierta, para ver qué funciones ocupan el tiempo.
+
+    Las dos capturas opcionales tienen un costo apreciable; sin ellas solo se
+    toman dos lecturas del reloj por fase.
+    """
+
+    def __init__(self, perfilar=False, medir_memoria=False):
+
+        self.perfilar = perfilar
+        self.medir_memoria = medir_memoria
+        self.fases = {} # Nombre -> {'segundos', 'llamadas', 'pico_memoria'}, en orden de primera aparición
+        self._pila = [] # Fases abiertas: [nombre, memoria al inicio, pico acumulado]
+        self._perfil = cProfile.Profile() if perfilar else None
+        self._tracemalloc_propio = False
+
+    @contextmanager
+    def fase(self, nombre):
+        """Mide el bloque como la fase indicada; devuelve su Medida."""
+        medida = Medida(nombre)
+        self.fases.setdefault(nombre, {'segundos': 0.0, 'llamadas': 0, 'pico_memoria': None})
+        if not self._pila:
+            self._iniciar_capturas()
+        if self.medir_memoria:
+            actual, pico = tracemalloc.get_traced_memory()
+            if self._pila:
+                # El pico de la fase exterior se conserva antes de reiniciarlo para esta
+                self._pila[-1][2] = max(self._pila[-1][2], pico)
+            tracemalloc.reset_peak()
+            self._pila.append([nombre, actual, actual])
+        else:
+            self._pila.append([nombre, 0, 0])
+
+        inicio = time.perf_counter()
+        try:
+            yield medida
+        finally:
+            medida.segundos = time.perf_counter() - inicio
+            _, memoria_inicial, pico = self._pila.pop()
+            if self.medir_memoria:
+                pico = max(pico, tracemalloc.get_traced_memory()[1])
+                medida.pico_memoria = pico - memoria_inicial
+                if self._pila:
+                    self._pila[-1][2] = max(self._pila[-1][2], pico)
+            self._registrar(medida)
+            if not self._pila:
+                self._detener_capturas()
+
+    def _iniciar_capturas(self):
+        if self.medir_memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracemalloc_propio = True
+        if self._perfil is not None:
+            self._perfil.enable()
+
+    def _detener_capturas(self):
+        if self._perfil is not None:
+            self._perfil.disable()
+        if self._tracemalloc_propio:
+            tracemalloc.stop()
+            self._tracemalloc_propio = False
+
+    def _registrar(self, medida):
+        registro = self.fases[medida.nombre]
+        registro['segundos'] += medida.segundos
+        registro['llamadas'] += 1
+        if medida.pico_memoria is not None:
+            registro['pico_memoria'] = max(registro['pico_memoria'] or 0, medida.pico_memoria)
+
+    def segundos(self, nombre):
+        """Tiempo acumulado de una fase (0 si no se ejecutó)."""
+        return self.fases.get(nombre, {}).get('segundos', 0.0)
+
+    def perfil(self, limite=25, orden='cumulative'):
+        """
+        Funciones con más tiempo según cProfile (requiere perfilar=True).
+
+        Returns:
+            list: Diccionarios con funcion, llamadas, tiempo_propio y tiempo_acumulado
+        """
+        if self._perfil is None:
+            return None
+        estadisticas = pstats.Stats(self._perfil, stream=io.StringIO()).sort_stats(orden)
+        filas = []
+        for funcion in estadisticas.fcn_list[:limite]:
+            _, llamadas, propio, acumulado, _ = estadisticas.stats[funcion]
+            archivo, linea, nombre = funcion
+            filas.append({'funcion': f"{archivo}:{linea}({nombre})", 'llamadas': llamadas,
+                          'tiempo_propio': propio, 'tiempo_acumulado': acumulado})
+        return filas
+
+    def guardar_perfil(self, ruta):
+        """Guarda el perfil en formato pstats (para snakeviz, gprof2dot, ...)."""
+        if self._perfil is None:
+            raise ValueError("La instrumentación no se creó con perfilar=True.")
+        self._perfil.dump_stats(ruta)
+
+    def a_diccionario(self):
+        """Fases medidas como diccionario serializable a JSON."""
+        datos = {'fases': {nombre: dict(registro) for nombre, registro in self.fases.items()}}
+        if resource is not None:
+            # ru_maxrss está en KiB en Linux
+            datos['pico_rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        if self._perfil is not None:
+            datos['perfil'] = self.perfil()
+        return datos
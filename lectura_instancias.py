@@ -0,0 +1,472 @@
+import io
+import json
+import struct
+import zipfile
+import numpy as np
+
+# Extensión del formato binario de instancias (un .npz sin comprimir)
+EXTENSION_BINARIA = '.npz'
+
+
+class LectorInstancia:
+    """
+    Lee un archivo de instancia en formato de texto línea por línea.
+
+    Las líneas vacías se saltan y cada valor se convierte directamente dentro de
+    un arreglo de NumPy reservado de antemano, de modo que la memoria usada,
+    aparte de los arreglos de salida, es la de una sola línea. Todos los errores
+    indican el número de línea del archivo.
+    """
+
+    def __init__(self, archivo):
+
+        self.archivo = archivo # Archivo de texto abierto
+        self.numero_linea = 0 # Número de la última línea leída (empezando en 1)
+        self._pendiente = None # Línea leída por hay_mas() y todavía no consumida
+
+    def _leer_linea(self):
+        """Siguiente línea no vacía como (numero_linea, texto), o None al final del archivo."""
+        for linea in self.archivo:
+            self.numero_linea += 1
+            texto = linea.strip()
+            if texto:
+                return self.numero_linea, texto
+        return None
+
+    def hay_mas(self):
+        """Indica si quedan líneas con datos por leer."""
+        if self._pendiente is None:
+            self._pendiente = self._leer_linea()
+        return self._pendiente is not None
+
+    def mirar(self, mensaje_faltante):
+        """Devuelve la siguiente línea no vacía como (numero_linea, texto) sin consumirla."""
+        if self.hay_mas():
+            return self._pendiente
+        raise ValueError(mensaje_faltante)
+
+    def siguiente(self, mensaje_faltante):
+        """
+        Devuelve la siguiente línea no vacía como (numero_linea, texto).
+
+        Args:
+            mensaje_faltante (str): Error a lanzar si el archivo ya terminó
+        """
+        if self.hay_mas():
+            linea, self._pendiente = self._pendiente, None
+            return linea
+        raise ValueError(mensaje_faltante)
+
+    def leer_entero_positivo(self, mensaje_faltante, mensaje_invalido):
+        """Lee una línea con un único entero positivo."""
+        numero, texto = self.siguiente(mensaje_faltante)
+        try:
+            valor = int(texto)
+        except ValueError:
+            valor = 0
+        if valor <= 0:
+            raise ValueError(f"{mensaje_invalido} (línea {numero})")
+        return valor
+
+    def leer_valores(self, salida, mensaje_faltante, mensaje_longitud, mensaje_no_numerico):
+        """
+        Lee una línea de valores separados por espacios dentro del arreglo salida.
+
+        Los mensajes pueden usar {valores} (cantidad encontrada) y {esperados};
+        a todos se les agrega el número de línea.
+
+        Returns:
+            int: Número de la línea leída
+        """
+        numero, texto = self.siguiente(mensaje_faltante)
+        partes = texto.split()
+        if len(partes) != len(salida):
+            raise ValueError(f"{mensaje_longitud.format(valores=len(partes), esperados=len(salida))} (línea {numero})")
+        try:
+            salida[:] = partes
+        except ValueError:
+            raise ValueError(f"{mensaje_no_numerico} (línea {numero})")
+        return numero
+
+
+def guardar_instancia_binaria(ruta, tipo, costos, metadatos=None, **vectores):
+    """
+    Guarda una instancia en formato binario: un .npz sin comprimir con la matriz
+    de costos, los vectores del módulo y un JSON de metadatos.
+
+    Al no estar comprimido, la matriz de costos puede abrirse después como
+    np.memmap directamente dentro del archivo.
+
+    Args:
+        ruta (str): Archivo de destino (se recomienda la extensión .npz)
+        tipo (str): 'programadores' o 'servidores'
+        costos (array): Matriz de costos
+        metadatos (dict, opcional): Datos adicionales serializables a JSON
+        **vectores: Vectores de la instancia (los None se omiten)
+    """
+    arreglos = {nombre: np.asarray(valor) for nombre, valor in vectores.items() if valor is not None}
+    arreglos['costos'] = np.ascontiguousarray(costos, dtype=np.float64)
+    arreglos['metadatos'] = np.array(json.dumps(dict(metadatos or {}, tipo=tipo)))
+
+    with open(ruta, 'wb') as f:
+        np.savez(f, **arreglos)
+
+def _abrir_miembro_mapeado(ruta, archivo_zip, nombre):
+    """
+    Abre un arreglo .npy guardado sin comprimir dentro de un .npz como np.memmap
+    de solo lectura, buscando su posición en la cabecera local del zip.
+    """
+    info = archivo_zip.getinfo(nombre)
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"El arreglo {nombre} está comprimido y no puede mapearse en memoria.")
+
+    with open(ruta, 'rb') as f:
+        # Cabecera local del zip: 30 bytes fijos, luego el nombre y el campo extra
+        f.seek(info.header_offset)
+        cabecera = f.read(30)
+        largo_nombre, largo_extra = struct.unpack('<HH', cabecera[26:30])
+        f.seek(info.header_offset + 30 + largo_nombre + largo_extra)
+
+        # Cabecera del .npy (la versión 3.0 solo se usa para nombres de campo no latinos)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            forma, fortran, tipo = np.lib.format.read_array_header_1_0(f)
+        elif version == (2, 0):
+            forma, fortran, tipo = np.lib.format.read_array_header_2_0(f)
+        else:
+            raise ValueError(f"Versión de formato .npy no soportada: {version}")
+        desplazamiento = f.tell()
+
+    return np.memmap(ruta, dtype=tipo, mode='r', offset=desplazamiento, shape=forma,
+                     order='F' if fortran else 'C')
+
+def leer_instancia_binaria(ruta, tipo_esperado=None):
+    """
+    Lee una instancia guardada con guardar_instancia_binaria. La matriz de costos
+    queda mapeada en memoria (solo lectura): abrir el archivo no la lee, y los
+    procesos que abren el mismo archivo comparten sus páginas.
+
+    Returns:
+        dict: 'costos', 'metadatos' y los vectores guardados
+    """
+    with zipfile.ZipFile(ruta) as archivo_zip:
+        nombres = [nombre[:-len('.npy')] for nombre in archivo_zip.namelist()]
+        if 'costos' not in nombres or 'metadatos' not in nombres:
+            raise ValueError("El archivo binario no contiene una instancia (faltan costos o metadatos).")
+        costos = _abrir_miembro_mapeado(ruta, archivo_zip, 'costos.npy')
+
+    instancia = {'costos': costos}
+    with np.load(ruta) as datos:
+        for nombre in nombres:
+            if nombre != 'costos':
+                instancia[nombre] = datos[nombre]
+    instancia['metadatos'] = json.loads(str(instancia['metadatos']))
+
+    tipo = instancia['metadatos'].get('tipo')
+    if tipo_esperado is not None and tipo != tipo_esperado:
+        raise ValueError(f"El archivo contiene una instancia de {tipo}, se esperaba una de {tipo_esperado}.")
+    return instancia
+
+def instancia_desde_bytes(datos, tipo_esperado=None):
+    """
+    Lee una instancia binaria recibida en memoria (por ejemplo, por la red). La
+    matriz de costos se carga completa, ya que no hay archivo que mapear.
+
+    Returns:
+        dict: 'costos', 'metadatos' y los vectores guardados
+    """
+    with np.load(io.BytesIO(datos)) as contenido:
+        if 'costos' not in contenido.files or 'metadatos' not in contenido.files:
+            raise ValueError("El archivo binario no contiene una instancia (faltan costos o metadatos).")
+        instancia = {nombre: contenido[nombre] for nombre in contenido.files}
+    instancia['metadatos'] = json.loads(str(instancia['metadatos']))
+
+    tipo = instancia['metadatos'].get('tipo')
+    if tipo_esperado is not None and tipo != tipo_esperado:
+        raise ValueError(f"El archivo contiene una instancia de {tipo}, se esperaba una de {tipo_esperado}.")
+    return instancia
+
+def matriz_arcos(num_filas, num_columnas, filas, columnas, costos):
+    """
+    Arma la matriz de costos CSR de una instancia dispersa a partir de su lista
+    de arcos permitidos; las celdas que no aparecen quedan prohibidas. Los
+    arcos con costo cero se conservan como permitidos.
+
+    Returns:
+        scipy.sparse.csr_matrix: Matriz num_filas x num_columnas
+    """
+    from scipy.sparse import csr_matrix
+
+    filas = np.asarray(filas, dtype=np.int64)
+    columnas = np.asarray(columnas, dtype=np.int64)
+    costos = np.asarray(costos, dtype=np.float64)
+    if not filas.shape == columnas.shape == costos.shape or filas.ndim != 1:
+        raise ValueError("Las filas, columnas y costos de los arcos deben tener la misma longitud.")
+    if ((filas < 0) | (filas >= num_filas) | (columnas < 0) | (columnas >= num_columnas)).any():
+        raise ValueError("Hay arcos con índices fuera de la matriz de costos.")
+    claves = filas * num_columnas + columnas
+    if np.unique(claves).size != claves.size:
+        raise ValueError("Hay arcos repetidos en la lista de arcos.")
+    return csr_matrix((costos, (filas, columnas)), shape=(num_filas, num_columnas))
+
+def datos_programadores(instancia):
+    """Convierte una instancia binaria de programadores en la tupla (N, M, C, S, D), validando dimensiones."""
+    C = instancia['costos']
+    if instancia['metadatos'].get('disperso'):
+        # Instancia con arcos prohibidos: los costos son los datos de una matriz CSR
+        from scipy.sparse import csr_matrix
+        C = csr_matrix((C, instancia['indices'], instancia['indptr']), shape=tuple(instancia['metadatos']['forma']))
+    S, D = instancia['capacidad_programadores'], instancia['demanda_tareas']
+    if C.ndim != 2 or S.shape != (C.shape[0],) or D.shape != (C.shape[1],):
+        raise ValueError("Las dimensiones de capacidades y demandas no coinciden con la matriz de costos.")
+    return C.shape[0], C.shape[1], C, S, D
+
+def datos_servidores(instancia):
+    """Convierte una instancia binaria de servidores en la tupla (S, R, C, prioridades, capacidades)."""
+    C = instancia['costos']
+    if instancia['metadatos'].get('disperso'):
+        # Instancia con pares prohibidos: los costos son los datos de una matriz CSR
+        from scipy.sparse import csr_matrix
+        C = csr_matrix((C, instancia['indices'], instancia['indptr']), shape=tuple(instancia['metadatos']['forma']))
+    prioridades, capacidades = instancia.get('prioridades'), instancia.get('capacidades')
+    if (C.ndim != 2 or (prioridades is not None and prioridades.shape != (C.shape[1],))
+            or (capacidades is not None and capacidades.shape != (C.shape[0],))):
+        raise ValueError("Error: Las dimensiones de prioridades o capacidades no coinciden con la matriz de costos.")
+    return C.shape[0], C.shape[1], C, prioridades, capacidades
+
+def guardar_instancia_programadores(ruta, C, S, D, metadatos=None):
+    """
+    Guarda una instancia del módulo de programadores en formato binario. Si C es
+    una matriz dispersa de SciPy se guardan sus tres arreglos CSR y la forma.
+    """
+    vectores = {}
+    if hasattr(C, 'tocsr'):
+        C = C.tocsr()
+        metadatos = dict(metadatos or {}, disperso=True, forma=list(C.shape))
+        vectores = {'indices': C.indices, 'indptr': C.indptr}
+        C = C.data
+    guardar_instancia_binaria(ruta, 'programadores', C, metadatos,
+                              capacidad_programadores=np.asarray(S, dtype=np.int64),
+                              demanda_tareas=np.asarray(D, dtype=np.int64), **vectores)
+
+def guardar_instancia_servidores(ruta, C, prioridades=None, capacidades=None, metadatos=None):
+    """
+    Guarda una instancia del módulo de servidores en formato binario. Si C es
+    una matriz dispersa de SciPy se guardan sus tres arreglos CSR y la forma.
+    """
+    vectores = {}
+    if hasattr(C, 'tocsr'):
+        C = C.tocsr()
+        metadatos = dict(metadatos or {}, disperso=True, forma=list(C.shape))
+        vectores = {'indices': C.indices, 'indptr': C.indptr}
+        C = C.data
+    guardar_instancia_binaria(ruta, 'servidores', C, metadatos,
+                              prioridades=None if prioridades is None else np.asarray(prioridades, dtype=np.float64),
+                              capacidades=None if capacidades is None else np.asarray(capacidades, dtype=np.int64),
+                              **vectores)
+
+def leer_instancia_programadores(ruta):
+    """
+    Lee una instancia del módulo de programadores en formato de texto, o en
+    formato binario si la ruta termina en .npz. Si la primera línea tiene tres
+    enteros (N M E) el archivo es una lista de arcos (ver _leer_arcos_programadores).
+
+    Returns:
+        tuple: (N, M, C, S, D) con C como arreglo float64 N x M (o matriz CSR en
+            las instancias dispersas) y S, D como arreglos int64
+    """
+    if str(ruta).endswith(EXTENSION_BINARIA):
+        return datos_programadores(leer_instancia_binaria(ruta, 'programadores'))
+
+    with open(ruta, 'r') as f:
+        lector = LectorInstancia(f)
+        faltan_lineas = "El archivo debe contener al menos 2 líneas (N y M)."
+        if len(lector.mirar(faltan_lineas)[1].split()) == 3:
+            return _leer_arcos_programadores(lector)
+
+        N = lector.leer_entero_positivo(faltan_lineas, "La primera línea debe contener un entero positivo (N).")
+        M = lector.leer_entero_positivo(faltan_lineas, "La segunda línea debe contener un entero positivo (M).")
+        faltan_lineas = f"El archivo debe contener al menos {2 + N + 2} líneas."
+
+        # Leer matriz de costos
+        C = np.empty((N, M), dtype=np.float64)
+        for i in range(N):
+            numero = lector.leer_valores(C[i], faltan_lineas,
+                                         f"La fila {i} de la matriz de costos tiene {{valores}} valores, se esperaban {M}.",
+                                         f"La fila {i} de la matriz de costos contiene valores no numéricos.")
+            # Verificar que todos los valores sean no negativos
+            if (C[i] < 0).any():
+                raise ValueError(f"La fila {i} de la matriz de costos contiene valores negativos. (línea {numero})")
+
+        # Leer capacidades de programadores
+        S = np.empty(N, dtype=np.int64)
+        numero = lector.leer_valores(S, faltan_lineas,
+                                     f"Se esperaban {N} valores para las capacidades de los programadores.",
+                                     "Las capacidades de los programadores deben ser enteros.")
+        if (S <= 0).any():
+            raise ValueError(f"Las capacidades de los programadores deben ser enteros positivos. (línea {numero})")
+
+        # Leer demandas de tareas
+        D = np.empty(M, dtype=np.int64)
+        numero = lector.leer_valores(D, faltan_lineas,
+                                     f"Se esperaban {M} valores para las demandas de las tareas.",
+                                     "Las demandas de las tareas deben ser enteros.")
+        if (D <= 0).any():
+            raise ValueError(f"Las demandas de las tareas deben ser enteros positivos. (línea {numero})")
+
+        return N, M, C, S, D
+
+
+def _leer_arcos_programadores(lector):
+    """
+    Lee una instancia dispersa de programadores en formato de lista de arcos:
+
+        N M E
+        S[0] ... S[N-1]
+        D[0] ... D[M-1]
+        i j C[i][j]        (E líneas, una por arco permitido, índices desde 0)
+
+    Los pares programador-tarea que no aparecen están prohibidos.
+    """
+    numero, texto = lector.siguiente(None)
+    try:
+        N, M, E = (int(valor) for valor in texto.split())
+    except ValueError:
+        N = M = E = 0
+    if N <= 0 or M <= 0 or E < 0:
+        raise ValueError(f"La primera línea debe contener N, M y el número de arcos E (enteros positivos). (línea {numero})")
+    faltan_lineas = f"El archivo debe contener al menos {3 + E} líneas."
+
+    S = np.empty(N, dtype=np.int64)
+    numero = lector.leer_valores(S, faltan_lineas,
+                                 f"Se esperaban {N} valores para las capacidades de los programadores.",
+                                 "Las capacidades de los programadores deben ser enteros.")
+    if (S <= 0).any():
+        raise ValueError(f"Las capacidades de los programadores deben ser enteros positivos. (línea {numero})")
+
+    D = np.empty(M, dtype=np.int64)
+    numero = lector.leer_valores(D, faltan_lineas,
+                                 f"Se esperaban {M} valores para las demandas de las tareas.",
+                                 "Las demandas de las tareas deben ser enteros.")
+    if (D <= 0).any():
+        raise ValueError(f"Las demandas de las tareas deben ser enteros positivos. (línea {numero})")
+
+    filas = np.empty(E, dtype=np.int64)
+    columnas = np.empty(E, dtype=np.int64)
+    costos = np.empty(E, dtype=np.float64)
+    for k in range(E):
+        numero, texto = lector.siguiente(faltan_lineas)
+        partes = texto.split()
+        if len(partes) != 3:
+            raise ValueError(f"Cada arco debe tener programador, tarea y costo. (línea {numero})")
+        try:
+            filas[k], columnas[k], costos[k] = int(partes[0]), int(partes[1]), float(partes[2])
+        except ValueError:
+            raise ValueError(f"El arco contiene valores no numéricos. (línea {numero})")
+        if not (0 <= filas[k] < N and 0 <= columnas[k] < M):
+            raise ValueError(f"El arco ({filas[k]}, {columnas[k]}) está fuera de la matriz {N} x {M}. (línea {numero})")
+        if costos[k] < 0:
+            raise ValueError(f"El costo del arco ({filas[k]}, {columnas[k]}) es negativo. (línea {numero})")
+
+    return N, M, matriz_arcos(N, M, filas, columnas, costos), S, D
+
+
+def leer_instancia_servidores(ruta):
+    """
+    Lee una instancia del módulo de servidores en formato de texto, o en formato
+    binario si la ruta termina en .npz. Las prioridades y capacidades son opcionales.
+    Si la primera línea tiene tres enteros (S R E) el archivo es una lista de
+    arcos (ver _leer_arcos_servidores).
+
+    Returns:
+        tuple: (S, R, C, prioridades, capacidades) con C como arreglo float64 S x R
+            (o matriz CSR en las instancias dispersas)
+    """
+    if str(ruta).endswith(EXTENSION_BINARIA):
+        return datos_servidores(leer_instancia_binaria(ruta, 'servidores'))
+
+    with open(ruta, 'r') as f:
+        lector = LectorInstancia(f)
+        faltan_lineas = "Error: El archivo debe contener al menos 2 líneas (S y R)."
+        if len(lector.mirar(faltan_lineas)[1].split()) == 3:
+            return _leer_arcos_servidores(lector)
+
+        S = lector.leer_entero_positivo(faltan_lineas, "Error: La primera línea debe contener un entero positivo (S).")
+        R = lector.leer_entero_positivo(faltan_lineas, "Error: La segunda línea debe contener un entero positivo (R).")
+        faltan_lineas = f"Error: El archivo debe contener al menos {2 + S} líneas."
+
+        # Leer matriz de costos
+        C = np.empty((S, R), dtype=np.float64)
+        for i in range(S):
+            lector.leer_valores(C[i], faltan_lineas,
+                                f"Error: La fila {i} de la matriz de costos tiene {{valores}} valores, se esperaban {R}.",
+                                f"Error: La fila {i} de la matriz de costos contiene valores no numéricos.")
+
+        # Verificar si hay más líneas para prioridades y capacidades
+        prioridades = None
+        capacidades = None
+
+        if lector.hay_mas():
+            prioridades = np.empty(R, dtype=np.float64)
+            lector.leer_valores(prioridades, None, f"Error: Se esperaban {R} valores para las prioridades.",
+                                "Error: Las prioridades deben ser números.")
+
+        if lector.hay_mas():
+            capacidades = np.empty(S, dtype=np.int64)
+            lector.leer_valores(capacidades, None, f"Error: Se esperaban {S} valores para las capacidades.",
+                                "Error: Las capacidades deben ser enteros.")
+
+        return S, R, C, prioridades, capacidades
+
+
+def _leer_arcos_servidores(lector):
+    """
+    Lee una instancia dispersa de servidores en formato de lista de arcos:
+
+        S R E
+        i j C[i][j]        (E líneas, una por par permitido, índices desde 0)
+        P[0] ... P[R-1]    (opcional)
+        CAP[0] ... CAP[S-1] (opcional)
+
+    Los pares servidor-solicitud que no aparecen están prohibidos.
+    """
+    numero, texto = lector.siguiente(None)
+    try:
+        S, R, E = (int(valor) for valor in texto.split())
+    except ValueError:
+        S = R = E = 0
+    if S <= 0 or R <= 0 or E < 0:
+        raise ValueError(f"Error: La primera línea debe contener S, R y el número de arcos E (enteros positivos). "
+                         f"(línea {numero})")
+    faltan_lineas = f"Error: El archivo debe contener al menos {1 + E} líneas."
+
+    filas = np.empty(E, dtype=np.int64)
+    columnas = np.empty(E, dtype=np.int64)
+    costos = np.empty(E, dtype=np.float64)
+    for k in range(E):
+        numero, texto = lector.siguiente(faltan_lineas)
+        partes = texto.split()
+        if len(partes) != 3:
+            raise ValueError(f"Error: Cada arco debe tener servidor, solicitud y costo. (línea {numero})")
+        try:
+            filas[k], columnas[k], costos[k] = int(partes[0]), int(partes[1]), float(partes[2])
+        except ValueError:
+            raise ValueError(f"Error: El arco contiene valores no numéricos. (línea {numero})")
+        if not (0 <= filas[k] < S and 0 <= columnas[k] < R):
+            raise ValueError(f"Error: El arco ({filas[k]}, {columnas[k]}) está fuera de la matriz {S} x {R}. "
+                             f"(línea {numero})")
+
+    prioridades = None
+    capacidades = None
+
+    if lector.hay_mas():
+        prioridades = np.empty(R, dtype=np.float64)
+        lector.leer_valores(prioridades, None, f"Error: Se esperaban {R} valores para las prioridades.",
+                            "Error: Las prioridades deben ser números.")
+
+    if lector.hay_mas():
+        capacidades = np.empty(S, dtype=np.int64)
+        lector.leer_valores(capacidades, None, f"Error: Se esperaban {S} valores para las capacidades.",
+                            "Error: Las capacidades deben ser enteros.")
+
+    return S, R, matriz_arcos(S, R, filas, columnas, costos), prioridades, capacidades
@@ -1,15 +1,20 @@
+import argparse
+import glob
+import json
 import os
 import sys
-from modulo_asignacion_programadores import MainProgramadores
-from modulo_asignacion_servidores import MainServidores
+
+# Los módulos de asignación (y con ellos numpy, scipy y PuLP) se importan al
+# elegir un módulo o un subcomando, para que el menú aparezca sin esperar.
 
 class MenuPrincipal:
     def __init__(self):
         pass
 
     def limpiar_pantalla(self):
-        """Limpia la pantalla de la consola."""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        """Limpia la pantalla de la consola con secuencias ANSI, sin lanzar un shell."""
+        if sys.stdout.isatty():
+            print("\033[2J\033[H", end="", flush=True)
 
     def mostrar_banner(self):
         """Muestra un banner decorativo para el programa."""
@@ -54,6 +59,7 @@ class MenuPrincipal:
                 print("      MÓDULO DE ASIGNACIÓN DE PROGRAMADORES A TAREAS      ")
                 print("=" * 70)
                 try:
+                    from modulo_asignacion_programadores import MainProgramadores
                     MainProgramadores().main()
                 except Exception as e:
                     print(f"\nError al ejecutar el módulo: {str(e)}")
@@ -65,6 +71,7 @@ class MenuPrincipal:
                 print("      MÓDULO DE ASIGNACIÓN DE SOLICITUDES A SERVIDORES      ")
                 print("=" * 70)
                 try:
+                    from modulo_asignacion_servidores import MainServidores
                     MainServidores().main()
                 except Exception as e:
                     print(f"\nError al ejecutar el módulo: {str(e)}")
@@ -76,7 +83,165 @@ class MenuPrincipal:
                 print("¡Hasta pronto!")
                 sys.exit(0)
 
+def expandir_entradas(entradas, extensiones=('.txt', '.npz')):
+    """
+    Convierte una lista de archivos, directorios o patrones glob en la lista de
+    archivos a resolver. De los directorios se toman los archivos con las
+    extensiones indicadas, en orden alfabético.
+    """
+    archivos = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            archivos.extend(sorted(os.path.join(entrada, nombre) for nombre in os.listdir(entrada)
+                                   if nombre.endswith(extensiones)))
+        elif glob.has_magic(entrada):
+            coincidencias = sorted(glob.glob(entrada))
+            if not coincidencias:
+                raise FileNotFoundError(f"Ningún archivo coincide con {entrada}")
+            archivos.extend(coincidencias)
+        else:
+            archivos.append(entrada)
+    return archivos
+
+def crear_parser():
+    """Argumentos de la línea de comandos no interactiva."""
+    parser = argparse.ArgumentParser(
+        description="Sistema de Optimización de Recursos. Sin argumentos se abre el menú interactivo.")
+    subcomandos = parser.add_subparsers(dest='modulo', required=True)
+    
+    transporte = subcomandos.add_parser('transporte', help="Asignación de programadores a tareas")
+    transporte.add_argument('--metodo', choices=['simplex_red', 'highs', 'pulp', 'heuristico'], default='simplex_red')
+    transporte.add_argument('--solucion-inicial', choices=['vogel', 'costo_minimo', 'esquina_noroeste', 'voraz_aleatorio'],
+                            default='vogel')
+    transporte.add_argument('--limite-segundos', type=float, default=None,
+                            help="Límite de tiempo del método 'heuristico' (por defecto 10 s)")
+    
+    servidores = subcomandos.add_parser('servidores', help="Asignación de solicitudes a servidores")
+    servidores.add_argument('--metodo', choices=['hungaro', 'hungaro_replicado', 'flujo_costo_minimo'], default='hungaro')
+    
+    for subparser in (transporte, servidores):
+        subparser.add_argument('--input', '-i', nargs='+', required=True,
+                               help="Archivos, directorios o patrones glob con las instancias")
+        subparser.add_argument('--output', '-o', default='-',
+                               help="Archivo JSON de salida ('-' para la salida estándar)")
+        subparser.add_argument('--exportar', default=None, metavar='DIRECTORIO',
+                               help="Exporta las asignaciones de cada instancia a este directorio")
+        subparser.add_argument('--formato', choices=['jsonl', 'csv', 'parquet', 'arrow'], default='jsonl',
+                               help="Formato de las asignaciones exportadas (parquet y arrow requieren pyarrow)")
+        subparser.add_argument('--perfilar', action='store_true',
+                               help="Incluye en el resultado las funciones más costosas según cProfile")
+        subparser.add_argument('--medir-memoria', action='store_true',
+                               help="Mide el pico de memoria de cada fase con tracemalloc")
+    
+    servicio = subcomandos.add_parser('servicio', help="Servicio HTTP local que mantiene los procesos calientes")
+    servicio.add_argument('--host', default='127.0.0.1')
+    servicio.add_argument('--puerto', type=int, default=8080)
+    servicio.add_argument('--socket', default=None, help="Escuchar en un socket Unix en lugar de TCP")
+    servicio.add_argument('--procesos', type=int, default=None, help="Procesos de resolución (por defecto, uno por CPU)")
+    servicio.add_argument('--limite-cola', type=int, default=64,
+                          help="Trabajos en espera antes de responder 503 (contrapresión)")
+    servicio.add_argument('--max-cuerpo-mb', type=float, default=64,
+                          help="Tamaño máximo del cuerpo de una petición; por encima se responde 413")
+    
+    convertir = subcomandos.add_parser('convertir', help="Convierte instancias de texto al formato binario .npz")
+    convertir.add_argument('tipo', choices=['transporte', 'servidores'])
+    convertir.add_argument('--input', '-i', nargs='+', required=True,
+                           help="Archivos, directorios o patrones glob con las instancias de texto")
+    convertir.add_argument('--output', '-o', default=None,
+                           help="Directorio de destino (por defecto, junto a cada archivo)")
+    return parser
+
+def convertir_a_binario(archivos, tipo, directorio=None):
+    """
+    Guarda cada instancia de texto en formato binario con el mismo nombre y
+    extensión .npz.
+    
+    Returns:
+        list: Rutas de los archivos generados
+    """
+    from lectura_instancias import (leer_instancia_programadores, leer_instancia_servidores,
+                                    guardar_instancia_programadores, guardar_instancia_servidores)
+    
+    generados = []
+    for archivo in archivos:
+        base = os.path.splitext(os.path.basename(archivo))[0] + '.npz'
+        destino = os.path.join(directorio or os.path.dirname(archivo), base)
+        if tipo == 'transporte':
+            _, _, C, S, D = leer_instancia_programadores(archivo)
+            guardar_instancia_programadores(destino, C, S, D, {'origen': os.path.basename(archivo)})
+        else:
+            _, _, C, prioridades, capacidades = leer_instancia_servidores(archivo)
+            guardar_instancia_servidores(destino, C, prioridades, capacidades, {'origen': os.path.basename(archivo)})
+        generados.append(destino)
+    return generados
+
+def ejecutar_linea_comandos(argumentos=None):
+    """
+    Resuelve las instancias indicadas en la línea de comandos, todas en el mismo
+    proceso, y escribe los resultados en JSON: un objeto si hay una sola
+    instancia, o una lista en el orden de los archivos si hay varias. Un archivo
+    con errores no detiene el resto; su resultado lleva el mensaje en 'error'.
+    
+    Returns:
+        int: Código de salida (0 si todas las instancias se resolvieron)
+    """
+    args = crear_parser().parse_args(argumentos)
+    
+    if args.modulo == 'servicio':
+        import asyncio
+        from servicio import ServicioAsignacion
+        servicio = ServicioAsignacion(args.procesos, args.limite_cola, int(args.max_cuerpo_mb * 1024 * 1024))
+        try:
+            asyncio.run(servicio.servir(args.host, args.puerto, args.socket))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    
+    if args.modulo == 'convertir':
+        for destino in convertir_a_binario(expandir_entradas(args.input, ('.txt',)), args.tipo, args.output):
+            print(destino)
+        return 0
+    
+    archivos = expandir_entradas(args.input)
+    from instrumentacion import Instrumentacion
+    if args.modulo == 'transporte':
+        from modulo_asignacion_programadores import resolver_archivo as resolver_archivo_transporte
+    else:
+        from modulo_asignacion_servidores import resolver_archivo as resolver_archivo_servidores
+    
+    resultados = []
+    for archivo in archivos:
+        instrumentacion = Instrumentacion(args.perfilar, args.medir_memoria)
+        exportar = None
+        if args.exportar:
+            os.makedirs(args.exportar, exist_ok=True)
+            base = os.path.splitext(os.path.basename(archivo))[0]
+            exportar = os.path.join(args.exportar, f'{base}.{args.formato}')
+        try:
+            if args.modulo == 'transporte':
+                resultados.append(resolver_archivo_transporte(archivo, args.metodo, args.solucion_inicial,
+                                                              instrumentacion, exportar, args.limite_segundos))
+            else:
+                resultados.append(resolver_archivo_servidores(archivo, args.metodo, instrumentacion, exportar))
+        except Exception as e:
+            resultados.append({'archivo': archivo, 'metodo': args.metodo, 'error': str(e)})
+    
+    # Los reales no finitos (por ejemplo, un costo infinito) se escriben como null
+    from exportacion_resultados import reemplazar_no_finitos
+    salida = reemplazar_no_finitos(resultados[0] if len(resultados) == 1 else resultados)
+    if args.output == '-':
+        json.dump(salida, sys.stdout, ensure_ascii=False, allow_nan=False)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(salida, f, ensure_ascii=False, allow_nan=False)
+    
+    return 1 if any('error' in resultado for resultado in resultados) else 0
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(ejecutar_linea_comandos())
+    
     try:
         MenuPrincipal().main()
     except KeyboardInterrupt:
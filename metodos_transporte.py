@@ -0,0 +1,1628 @@
+import numpy as np
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+
+
+class ModeloTransporteBase:
+    """
+    Parte común de los modelos de transporte: la oferta, la demanda y el
+    balanceo con una fila o columna ficticia virtual de costo cero, y la
+    actualización de ofertas y demandas. Las subclases guardan los costos
+    (self.costos) y los exponen por celdas con costo(), valores() y arcos().
+    """
+
+    # Solo ModeloTransporteDisperso tiene celdas prohibidas con costo de penalización
+    disperso = False
+    penalizacion = None
+
+    def _balancear(self, oferta, demanda):
+        """Guarda la oferta y la demanda y agrega de forma virtual la fila o columna ficticia."""
+        self.oferta_real = np.array(oferta, dtype=np.int64) # Capacidades S[N] (copia propia, se puede actualizar)
+        self.demanda_real = np.array(demanda, dtype=np.int64) # Demandas D[M]
+        self.num_filas_reales, self.num_columnas_reales = self.costos.shape
+
+        if self.oferta_real.shape != (self.num_filas_reales,) or self.demanda_real.shape != (self.num_columnas_reales,):
+            raise ValueError("Las dimensiones de la oferta y la demanda no coinciden con la matriz de costos.")
+
+        exceso = int(self.oferta_real.sum() - self.demanda_real.sum())
+        self.fila_ficticia = exceso < 0 # Programador ficticio que cubre la demanda sin oferta
+        self.columna_ficticia = exceso > 0 # Tarea ficticia que absorbe la oferta sobrante
+
+        # Dimensiones y vectores del problema balanceado (los vectores son pequeños, se pueden copiar)
+        self.m = self.num_filas_reales + int(self.fila_ficticia)
+        self.n = self.num_columnas_reales + int(self.columna_ficticia)
+        self.oferta = np.append(self.oferta_real, -exceso) if self.fila_ficticia else self.oferta_real
+        self.demanda = np.append(self.demanda_real, exceso) if self.columna_ficticia else self.demanda_real
+
+    def costo_total(self, filas, columnas, cantidades):
+        """Costo de una solución dada por sus celdas y cantidades."""
+        return float(np.dot(self.valores(filas, columnas), cantidades))
+
+    def _actualizar_cantidad(self, vector_real, vector, indice, cantidad, signo_exceso):
+        """
+        Cambia una oferta o demanda real y compensa el cambio en la fila o columna
+        ficticia. Devuelve la diferencia aplicada, o None si el cambio alteraría la
+        estructura del balanceo (aparecería o cambiaría de lado la celda ficticia),
+        en cuyo caso no se modifica nada.
+        """
+        # Un índice negativo cambiaría otra fila o columna real y se reoptimizaría otro nodo
+        if not 0 <= indice < len(vector_real):
+            raise IndexError("Solo se pueden cambiar las ofertas y demandas de filas y columnas reales (no ficticias).")
+        if cantidad <= 0:
+            raise ValueError("Las ofertas y demandas deben ser enteros positivos.")
+        diferencia = int(cantidad) - int(vector_real[indice])
+        if diferencia == 0:
+            return 0
+        exceso = int(self.oferta_real.sum() - self.demanda_real.sum()) + signo_exceso * diferencia
+        if not ((self.columna_ficticia and exceso >= 0) or (self.fila_ficticia and exceso <= 0)):
+            return None
+
+        vector_real[indice] = cantidad
+        if vector is not vector_real:
+            vector[indice] = cantidad
+        # La celda ficticia puede quedar con cantidad cero: el problema sigue balanceado
+        if self.columna_ficticia:
+            self.demanda[-1] = exceso
+        else:
+            self.oferta[-1] = -exceso
+        return diferencia
+
+    def actualizar_oferta(self, i, cantidad):
+        """Cambia la oferta de la fila real i (ver _actualizar_cantidad)."""
+        return self._actualizar_cantidad(self.oferta_real, self.oferta, i, cantidad, 1)
+
+    def actualizar_demanda(self, j, cantidad):
+        """Cambia la demanda de la columna real j (ver _actualizar_cantidad)."""
+        return self._actualizar_cantidad(self.demanda_real, self.demanda, j, cantidad, -1)
+
+
+class ModeloTransporte(ModeloTransporteBase):
+    """
+    Problema de transporte respaldado por arreglos de NumPy.
+
+    Los costos se guardan en un único arreglo float64 contiguo C[N][M] y las
+    ofertas y demandas en arreglos de enteros. Si el problema no está
+    balanceado se agrega una fila o columna ficticia de costo cero de forma
+    virtual: nunca se copia la matriz, y los bloques que la incluyen se
+    arman al vuelo con el tamaño del bloque pedido.
+    """
+
+    def __init__(self, matriz_costos, oferta, demanda):
+
+        self.costos = np.ascontiguousarray(matriz_costos, dtype=np.float64) # Matriz de costos real C[N][M]
+        self._balancear(oferta, demanda)
+
+    def costo_maximo(self):
+        """Mayor costo real en valor absoluto (escala de las tolerancias del simplex)."""
+        return float(np.abs(self.costos).max()) if self.costos.size else 0.0
+
+    def arcos(self):
+        """
+        Celdas del problema balanceado como arreglos (filas, columnas, costos),
+        en orden de filas. En el modelo denso son todas las m x n celdas.
+        """
+        filas, columnas = np.divmod(np.arange(self.m * self.n, dtype=np.int64), self.n)
+        return filas, columnas, self.valores(filas, columnas)
+
+    def costo(self, i, j):
+        """Costo de la celda (i, j) del problema balanceado."""
+        if i >= self.num_filas_reales or j >= self.num_columnas_reales:
+            return 0.0
+        return float(self.costos[i, j])
+
+    def valores(self, filas, columnas):
+        """Costos de varias celdas del problema balanceado (vectorizado)."""
+        filas = np.asarray(filas)
+        columnas = np.asarray(columnas)
+        if not (self.fila_ficticia or self.columna_ficticia):
+            return self.costos[filas, columnas]
+        resultado = np.zeros(np.broadcast(filas, columnas).shape, dtype=np.float64)
+        reales = (filas < self.num_filas_reales) & (columnas < self.num_columnas_reales)
+        filas, columnas = np.broadcast_arrays(filas, columnas)
+        resultado[reales] = self.costos[filas[reales], columnas[reales]]
+        return resultado
+
+    def filas(self, inicio, fin):
+        """Bloque de filas [inicio, fin) del problema balanceado; es una vista si no hay celdas ficticias."""
+        fin_real = min(fin, self.num_filas_reales)
+        if not self.columna_ficticia and fin_real == fin:
+            return self.costos[inicio:fin]
+        bloque = np.zeros((fin - inicio, self.n), dtype=np.float64)
+        if inicio < fin_real:
+            bloque[:fin_real - inicio, :self.num_columnas_reales] = self.costos[inicio:fin_real]
+        return bloque
+
+    def columnas(self, inicio, fin):
+        """Bloque de columnas [inicio, fin) del problema balanceado; es una vista si no hay celdas ficticias."""
+        fin_real = min(fin, self.num_columnas_reales)
+        if not self.fila_ficticia and fin_real == fin:
+            return self.costos[:, inicio:fin]
+        bloque = np.zeros((self.m, fin - inicio), dtype=np.float64)
+        if inicio < fin_real:
+            bloque[:self.num_filas_reales, :fin_real - inicio] = self.costos[:, inicio:fin_real]
+        return bloque
+
+    def submatriz(self, filas, columnas):
+        """
+        Costos del producto cartesiano filas x columnas del problema balanceado.
+        Los índices deben venir ordenados de forma creciente (la fila o columna
+        ficticia, si aparece, es la última).
+        """
+        filas_reales = filas[filas < self.num_filas_reales]
+        columnas_reales = columnas[columnas < self.num_columnas_reales]
+        if len(filas_reales) == len(filas) and len(columnas_reales) == len(columnas):
+            return self.costos[np.ix_(filas, columnas)]
+        resultado = np.zeros((len(filas), len(columnas)), dtype=np.float64)
+        resultado[:len(filas_reales), :len(columnas_reales)] = self.costos[np.ix_(filas_reales, columnas_reales)]
+        return resultado
+
+    def actualizar_costos(self, filas, columnas, valores):
+        """
+        Cambia los costos de una o varias celdas reales.
+
+        Si la matriz de costos no se puede escribir (por ejemplo, un archivo mapeado
+        en memoria) se copia una única vez antes del primer cambio.
+
+        Returns:
+            tuple: Arreglos (filas, columnas, diferencias) con el cambio de cada celda
+        """
+        filas, columnas, valores = np.broadcast_arrays(np.atleast_1d(filas), np.atleast_1d(columnas),
+                                                       np.atleast_1d(np.asarray(valores, dtype=np.float64)))
+        if ((filas < 0) | (filas >= self.num_filas_reales) | (columnas < 0) | (columnas >= self.num_columnas_reales)).any():
+            raise IndexError("Solo se pueden cambiar los costos de celdas reales (no ficticias).")
+        if not self.costos.flags.writeable:
+            self.costos = np.array(self.costos)
+
+        diferencias = valores - self.costos[filas, columnas]
+        self.costos[filas, columnas] = valores
+        return filas, columnas, diferencias
+
+class ModeloTransporteDisperso(ModeloTransporteBase):
+    """
+    Problema de transporte con arcos prohibidos, respaldado por una matriz CSR.
+
+    Solo las celdas guardadas en la matriz dispersa de costos (formato CSR de
+    SciPy) son arcos permitidos; las demás no ocupan memoria y no se recorren.
+    La fila o columna ficticia del balanceo sigue siendo virtual y admite todas
+    sus celdas. Los métodos constructivos pueden necesitar alguna celda
+    prohibida para cubrir la oferta o completar el árbol de la base: esas celdas
+    cuestan self.penalizacion, mayor que el costo de cualquier ciclo de arcos
+    permitidos, así que el simplex las vacía siempre que exista una solución
+    con los arcos permitidos.
+    """
+
+    disperso = True
+
+    def __init__(self, matriz_costos, oferta, demanda):
+
+        matriz = matriz_costos.tocsr()
+        if matriz.dtype != np.float64:
+            matriz = matriz.astype(np.float64)
+        if not matriz.has_canonical_format:
+            matriz = matriz.copy()
+            matriz.sum_duplicates()
+
+        self.costos = matriz # Costos de los arcos permitidos en formato CSR (N x M)
+        self._balancear(oferta, demanda)
+
+        self.costos_arcos = matriz.data # Costo de cada arco permitido, en orden de filas
+        self.columnas_arcos = matriz.indices # Columna de cada arco
+        self.filas_arcos = np.repeat(np.arange(self.num_filas_reales, dtype=np.int64), np.diff(matriz.indptr))
+        # Clave fila * M + columna de cada arco: es creciente, así que las celdas se ubican con searchsorted
+        self._claves = self.filas_arcos * self.num_columnas_reales + self.columnas_arcos
+        self._verificar_arcos()
+        self.penalizacion = self._calcular_penalizacion()
+
+    @property
+    def num_arcos(self):
+        """Número de arcos permitidos (sin contar los de la fila o columna ficticia)."""
+        return self.costos_arcos.size
+
+    def _calcular_penalizacion(self):
+        """Costo de una celda prohibida: supera al de cualquier ciclo de a lo sumo m + n arcos permitidos."""
+        return (self.m + self.n) * (self.costo_maximo() + 1.0)
+
+    def _verificar_arcos(self):
+        """
+        Comprueba que cada fila que debe enviar toda su oferta y cada columna que
+        debe recibir toda su demanda por celdas reales tenga algún arco permitido.
+        """
+        if not self.columna_ficticia:
+            sin_arcos = np.flatnonzero((np.diff(self.costos.indptr) == 0) & (self.oferta_real > 0))
+            if sin_arcos.size:
+                raise ValueError(f"La fila {sin_arcos[0]} tiene oferta pero ningún arco permitido: "
+                                 "el problema no tiene solución factible.")
+        if not self.fila_ficticia:
+            arcos_por_columna = np.bincount(self.columnas_arcos, minlength=self.num_columnas_reales)
+            sin_arcos = np.flatnonzero((arcos_por_columna == 0) & (self.demanda_real > 0))
+            if sin_arcos.size:
+                raise ValueError(f"La columna {sin_arcos[0]} tiene demanda pero ningún arco permitido: "
+                                 "el problema no tiene solución factible.")
+
+    def _ubicar(self, filas, columnas):
+        """
+        Posición de varias celdas reales entre los arcos permitidos.
+
+        Returns:
+            tuple: (posiciones, presentes); la posición de una celda prohibida no es válida
+        """
+        claves = np.asarray(filas, dtype=np.int64) * self.num_columnas_reales + np.asarray(columnas, dtype=np.int64)
+        if not self._claves.size:
+            return np.zeros(claves.shape, dtype=np.int64), np.zeros(claves.shape, dtype=bool)
+        posiciones = np.minimum(np.searchsorted(self._claves, claves), self._claves.size - 1)
+        return posiciones, self._claves[posiciones] == claves
+
+    def costo_maximo(self):
+        """Mayor costo de un arco permitido en valor absoluto."""
+        return float(np.abs(self.costos_arcos).max()) if self.costos_arcos.size else 0.0
+
+    def arcos_ficticios(self):
+        """Celdas (filas, columnas) de la fila o columna ficticia; todas están permitidas."""
+        if self.columna_ficticia:
+            return (np.arange(self.num_filas_reales, dtype=np.int64),
+                    np.full(self.num_filas_reales, self.num_columnas_reales, dtype=np.int64))
+        if self.fila_ficticia:
+            return (np.full(self.num_columnas_reales, self.num_filas_reales, dtype=np.int64),
+                    np.arange(self.num_columnas_reales, dtype=np.int64))
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    def arcos(self):
+        """
+        Arcos permitidos del problema balanceado como arreglos (filas, columnas,
+        costos): primero los reales en orden de filas y luego los de la fila o
+        columna ficticia.
+        """
+        filas_ficticias, columnas_ficticias = self.arcos_ficticios()
+        return (np.concatenate([self.filas_arcos, filas_ficticias]),
+                np.concatenate([self.columnas_arcos.astype(np.int64), columnas_ficticias]),
+                np.concatenate([self.costos_arcos, np.zeros(filas_ficticias.size)]))
+
+    def permitidas(self, filas, columnas):
+        """Indica qué celdas del problema balanceado son arcos permitidos (vectorizado)."""
+        filas, columnas = np.broadcast_arrays(np.asarray(filas), np.asarray(columnas))
+        resultado = np.ones(filas.shape, dtype=bool)
+        reales = (filas < self.num_filas_reales) & (columnas < self.num_columnas_reales)
+        resultado[reales] = self._ubicar(filas[reales], columnas[reales])[1]
+        return resultado
+
+    def costo(self, i, j):
+        """Costo de la celda (i, j) del problema balanceado (la penalización si está prohibida)."""
+        if i >= self.num_filas_reales or j >= self.num_columnas_reales:
+            return 0.0
+        inicio, fin = self.costos.indptr[i], self.costos.indptr[i + 1]
+        posicion = inicio + int(np.searchsorted(self.columnas_arcos[inicio:fin], j))
+        if posicion < fin and self.columnas_arcos[posicion] == j:
+            return float(self.costos_arcos[posicion])
+        return self.penalizacion
+
+    def valores(self, filas, columnas):
+        """Costos de varias celdas del problema balanceado (vectorizado)."""
+        filas, columnas = np.broadcast_arrays(np.asarray(filas), np.asarray(columnas))
+        resultado = np.zeros(filas.shape, dtype=np.float64)
+        reales = (filas < self.num_filas_reales) & (columnas < self.num_columnas_reales)
+        posiciones, presentes = self._ubicar(filas[reales], columnas[reales])
+        resultado[reales] = np.where(presentes, self.costos_arcos[posiciones], self.penalizacion)
+        return resultado
+
+    def actualizar_costos(self, filas, columnas, valores):
+        """
+        Cambia los costos de uno o varios arcos permitidos (no se pueden permitir
+        celdas nuevas). Si el costo máximo crece, crece también la penalización.
+
+        Returns:
+            tuple: Arreglos (filas, columnas, diferencias) con el cambio de cada celda
+        """
+        filas, columnas, valores = np.broadcast_arrays(np.atleast_1d(filas), np.atleast_1d(columnas),
+                                                       np.atleast_1d(np.asarray(valores, dtype=np.float64)))
+        if ((filas < 0) | (filas >= self.num_filas_reales) | (columnas < 0) | (columnas >= self.num_columnas_reales)).any():
+            raise IndexError("Solo se pueden cambiar los costos de celdas reales (no ficticias).")
+        posiciones, presentes = self._ubicar(filas, columnas)
+        if not presentes.all():
+            raise IndexError("Solo se pueden cambiar los costos de arcos permitidos.")
+        if not self.costos_arcos.flags.writeable:
+            self.costos.data = np.array(self.costos_arcos)
+            self.costos_arcos = self.costos.data
+
+        diferencias = valores - self.costos_arcos[posiciones]
+        self.costos_arcos[posiciones] = valores
+        self.penalizacion = max(self.penalizacion, self._calcular_penalizacion())
+        return filas, columnas, diferencias
+
+
+def crear_modelo(matriz_costos, oferta, demanda):
+    """
+    Crea el modelo de transporte adecuado para la matriz de costos: un
+    ModeloTransporteDisperso si es una matriz dispersa de SciPy (solo sus
+    celdas guardadas son arcos permitidos) o un ModeloTransporte denso si no.
+    """
+    if hasattr(matriz_costos, 'tocsr'):
+        return ModeloTransporteDisperso(matriz_costos, oferta, demanda)
+    return ModeloTransporte(matriz_costos, oferta, demanda)
+
+
+class AsignacionesDispersas:
+    """
+    Resultado de una asignación como matriz de flujo dispersa (formato COO).
+
+    Cada celda con flujo positivo aparece una sola vez con su cantidad, en lugar
+    de repetir una tupla por cada unidad asignada. La expansión por unidades se
+    hace de forma perezosa al iterar, con el mismo formato de tupla
+    (fila, columna, costo) que usaban los reportes.
+    """
+
+    def __init__(self, filas, columnas, cantidades, costos, etiqueta_fila=None, etiqueta_columna=None):
+
+        self.filas = np.asarray(filas, dtype=np.int64) # Índice de fila de cada celda
+        self.columnas = np.asarray(columnas, dtype=np.int64) # Índice de columna de cada celda
+        self.cantidades = np.asarray(cantidades, dtype=np.int64) # Unidades asignadas en cada celda
+        self.costos = np.asarray(costos, dtype=np.float64) # Costo unitario de cada celda
+        self.etiqueta_fila = etiqueta_fila # Función opcional índice -> identificador para los reportes
+        self.etiqueta_columna = etiqueta_columna
+
+    @property
+    def num_celdas(self):
+        """Número de celdas con flujo positivo."""
+        return self.filas.size
+
+    def __len__(self):
+        """Número total de unidades asignadas."""
+        return int(self.cantidades.sum())
+
+    def __iter__(self):
+        return self.iterar_unidades()
+
+    def iterar_unidades(self):
+        """Genera una tupla (fila, columna, costo) por cada unidad asignada."""
+        etiqueta_fila = self.etiqueta_fila or (lambda i: i)
+        etiqueta_columna = self.etiqueta_columna or (lambda j: j)
+        for i, j, cantidad, costo in zip(self.filas.tolist(), self.columnas.tolist(),
+                                         self.cantidades.tolist(), self.costos.tolist()):
+            asignacion = (etiqueta_fila(i), etiqueta_columna(j), costo)
+            for _ in range(cantidad):
+                yield asignacion
+
+    def costo_total(self):
+        return float(np.dot(self.costos, self.cantidades))
+
+    def a_diccionario(self):
+        """Celdas de la asignación en columnas de listas, listas para serializar a JSON."""
+        return {
+            'filas': self.filas.tolist(),
+            'columnas': self.columnas.tolist(),
+            'cantidades': self.cantidades.tolist(),
+            'costos': self.costos.tolist()
+        }
+
+    def totales_por_fila(self, num_filas):
+        """Unidades y costo total de cada fila, agregados con np.bincount."""
+        unidades = np.bincount(self.filas, weights=self.cantidades, minlength=num_filas).astype(np.int64)
+        costo = np.bincount(self.filas, weights=self.cantidades * self.costos, minlength=num_filas)
+        return unidades, costo
+
+    def totales_por_columna(self, num_columnas):
+        """Unidades y costo total de cada columna, agregados con np.bincount."""
+        unidades = np.bincount(self.columnas, weights=self.cantidades, minlength=num_columnas).astype(np.int64)
+        costo = np.bincount(self.columnas, weights=self.cantidades * self.costos, minlength=num_columnas)
+        return unidades, costo
+
+
+class SimplexTransporte:
+    """
+    Método simplex de redes para el problema de transporte balanceado.
+
+    La base se representa como un árbol de expansión sobre el grafo bipartito
+    (nodos 0..m-1 para las filas y m..m+n-1 para las columnas). Cada arco básico
+    se guarda en su nodo hijo, junto con el flujo que transporta, de modo que
+    un pivote solo recorre el ciclo y el subárbol que cambia de lugar.
+
+    Además de los hijos de cada nodo se guardan sus hijos internos (los que a su
+    vez tienen hijos). Así un subárbol con muchas hojas, como un servidor con
+    miles de solicitudes, se actualiza recorriendo solo sus nodos internos y
+    marcando las hojas de forma vectorizada a partir del arreglo de padres.
+    """
+
+    # Número aproximado de celdas que se evalúan por bloque al buscar la variable entrante
+    TAMANO_BLOQUE = 1 << 16
+
+    def __init__(self, modelo):
+
+        self.modelo = modelo # ModeloTransporte (o disperso) con el balanceo ya resuelto
+        self.m, self.n = modelo.m, modelo.n
+
+        num_nodos = self.m + self.n
+        # Las listas de Python son más rápidas que los arreglos para los accesos escalares de cada pivote
+        self.padre = [-1] * num_nodos # Padre de cada nodo en el árbol (la raíz es la fila 0)
+        self.flujo = [0] * num_nodos # Flujo del arco que une cada nodo con su padre
+        self.hijos = [set() for _ in range(num_nodos)]
+        self.internos = [set() for _ in range(num_nodos)] # Hijos que a su vez tienen hijos
+        # Copia en NumPy del arreglo de padres; la raíz apunta a un nodo centinela (num_nodos)
+        self._padres = np.full(num_nodos + 1, num_nodos, dtype=np.int64)
+        self.potenciales = np.zeros(num_nodos, dtype=np.float64) # u[i] para las filas y v[j] para las columnas
+        self.iteraciones = 0
+        self.es_optima = False # Si la última optimización terminó sin costos reducidos negativos
+
+        self.tolerancia = 1e-9 * max(1.0, modelo.costo_maximo())
+        self.filas_por_bloque = max(1, self.TAMANO_BLOQUE // max(1, self.n))
+        self._bloque_actual = 0
+
+    def cargar_base(self, base):
+        """
+        Inicializa el árbol, los flujos y los potenciales a partir de una base.
+
+        Args:
+            base (tuple): Arreglos (filas, columnas, cantidades) con m + n - 1 celdas
+                que forman un árbol de expansión
+        """
+        filas, columnas, cantidades = base
+        if len(filas) != self.m + self.n - 1:
+            raise ValueError(f"La base debe tener {self.m + self.n - 1} celdas, se recibieron {len(filas)}.")
+
+        adyacentes = [[] for _ in range(self.m + self.n)]
+        for i, j, cantidad in zip(filas.tolist(), columnas.tolist(), cantidades.tolist()):
+            adyacentes[i].append((self.m + j, cantidad))
+            adyacentes[self.m + j].append((i, cantidad))
+
+        self.padre = [-1] * (self.m + self.n)
+        self.flujo = [0] * (self.m + self.n)
+        self.hijos = [set() for _ in range(self.m + self.n)]
+        self.potenciales[:] = 0.0
+
+        visitados = np.zeros(self.m + self.n, dtype=bool)
+        visitados[0] = True
+        pila = [0]
+        while pila:
+            nodo = pila.pop()
+            for vecino, cantidad in adyacentes[nodo]:
+                if visitados[vecino]:
+                    continue
+                visitados[vecino] = True
+                self.padre[vecino] = nodo
+                self.flujo[vecino] = int(cantidad)
+                self.hijos[nodo].add(vecino)
+                self.potenciales[vecino] = self._costo_arco(vecino, nodo) - self.potenciales[nodo]
+                pila.append(vecino)
+
+        if not visitados.all():
+            raise ValueError("Las celdas básicas no forman un árbol de expansión.")
+
+        self.internos = [{hijo for hijo in hijos if self.hijos[hijo]} for hijos in self.hijos]
+        self._padres[:-1] = self.padre
+        self._padres[0] = self.m + self.n
+
+    def _desenganchar(self, nodo):
+        """Quita nodo de los hijos de su padre, manteniendo los conjuntos de hijos internos."""
+        padre = self.padre[nodo]
+        hermanos = self.hijos[padre]
+        hermanos.discard(nodo)
+        self.internos[padre].discard(nodo)
+        if not hermanos and self.padre[padre] != -1:
+            # El padre se quedó sin hijos: deja de ser interno para su propio padre
+            self.internos[self.padre[padre]].discard(padre)
+
+    def _enganchar(self, nodo, padre):
+        """Cuelga nodo de padre, manteniendo los conjuntos de hijos internos."""
+        if not self.hijos[padre] and self.padre[padre] != -1:
+            self.internos[self.padre[padre]].add(padre)
+        self.hijos[padre].add(nodo)
+        if self.hijos[nodo]:
+            self.internos[padre].add(nodo)
+        self.padre[nodo] = padre
+        self._padres[nodo] = padre
+
+    def _costo_arco(self, a, b):
+        """Costo de la celda que une los nodos a y b (uno fila y otro columna)."""
+        if a < self.m:
+            return self.modelo.costo(a, b - self.m)
+        return self.modelo.costo(b, a - self.m)
+
+    def _buscar_entrante(self):
+        """
+        Busca por bloques de filas una celda con costo reducido negativo.
+
+        Returns:
+            tuple: (i, j, costo_reducido) o None si la base actual es óptima
+        """
+        num_bloques = -(-self.m // self.filas_por_bloque)
+        u = self.potenciales[:self.m]
+        v = self.potenciales[self.m:]
+        for _ in range(num_bloques):
+            inicio = self._bloque_actual * self.filas_por_bloque
+            fin = min(inicio + self.filas_por_bloque, self.m)
+            self._bloque_actual = (self._bloque_actual + 1) % num_bloques
+
+            reducidos = self.modelo.filas(inicio, fin) - u[inicio:fin, None] - v[None, :]
+            posicion = int(np.argmin(reducidos))
+            fila, columna = divmod(posicion, self.n)
+            minimo = reducidos[fila, columna]
+            if minimo < -self.tolerancia:
+                return inicio + fila, columna, minimo
+        return None
+
+    def _subarbol(self, raiz, limite):
+        """Nodos del subárbol que cuelga de raiz; None si supera el límite indicado."""
+        nodos = [raiz]
+        pila = [raiz]
+        while pila:
+            hijos = self.hijos[pila.pop()]
+            nodos.extend(hijos)
+            pila.extend(hijos)
+            if len(nodos) > limite:
+                return None
+        return nodos
+
+    def _nodos_subarbol(self, raiz):
+        """
+        Arreglo con los nodos del subárbol de raiz.
+
+        Los subárboles pequeños se recorren directamente. En los grandes solo se
+        recorren los nodos internos; el resto del subárbol son hojas cuyo padre
+        es uno de ellos, y se marcan de una vez con el arreglo de padres.
+        """
+        nodos = self._subarbol(raiz, limite=64)
+        if nodos is not None:
+            return np.asarray(nodos, dtype=np.int64)
+        internos = [raiz]
+        pila = [raiz]
+        while pila:
+            hijos = self.internos[pila.pop()]
+            internos.extend(hijos)
+            pila.extend(hijos)
+        marcados = np.zeros(self.m + self.n + 1, dtype=bool)
+        marcados[internos] = True
+        return np.flatnonzero(marcados[:-1] | marcados[self._padres[:-1]])
+
+    def _desplazar_potenciales(self, raiz, delta):
+        """Suma delta a las filas y resta delta a las columnas del subárbol de raiz."""
+        nodos = self._nodos_subarbol(raiz)
+        es_fila = nodos < self.m
+        self.potenciales[nodos[es_fila]] += delta
+        self.potenciales[nodos[~es_fila]] -= delta
+
+    def _camino_a_raiz(self, nodo, hasta):
+        """Nodos desde nodo (incluido) hasta el ancestro hasta (excluido)."""
+        camino = []
+        while nodo != hasta:
+            camino.append(nodo)
+            nodo = self.padre[nodo]
+        return camino
+
+    def _ancestro_comun(self, a, b):
+        """
+        Ancestro común más cercano de los nodos a y b: se sube alternadamente desde
+        ambos hasta que uno alcanza un nodo ya visitado por el otro, sin recorrer
+        el árbol hasta la raíz.
+        """
+        padre = self.padre
+        visitados_a = {a}
+        visitados_b = {b}
+        if a == b:
+            return a
+        while True:
+            if a != -1:
+                a = padre[a]
+                if a in visitados_b:
+                    return a
+                visitados_a.add(a)
+            if b != -1:
+                b = padre[b]
+                if b in visitados_a:
+                    return b
+                visitados_b.add(b)
+
+    def _pivotear(self, i, j, reducido, saliente=None):
+        """
+        Introduce la celda (i, j) a la base y retira el arco bloqueante del ciclo.
+
+        Si se indica saliente (pivote del simplex dual), ese arco es el que sale: su
+        flujo es negativo y la celda entrante lo lleva exactamente a cero.
+        """
+        nodo_fila = i
+        nodo_columna = self.m + j
+        apice = self._ancestro_comun(nodo_fila, nodo_columna)
+
+        camino_fila = self._camino_a_raiz(nodo_fila, apice)
+        camino_columna = self._camino_a_raiz(nodo_columna, apice)
+
+        # En ambos lados los arcos alternan signo empezando por '-' junto a la celda entrante.
+        # Orden de recorrido del ciclo: ápice -> fila, celda entrante, columna -> ápice
+        ciclo = [(nodo, k % 2 == 0) for k, nodo in reversed(list(enumerate(camino_fila)))]
+        ciclo += [(nodo, k % 2 == 0) for k, nodo in enumerate(camino_columna)]
+
+        if saliente is None:
+            theta = None
+            for nodo, disminuye in ciclo:
+                if disminuye and (theta is None or self.flujo[nodo] <= theta):
+                    # Con empates se retira el último arco bloqueante del recorrido
+                    theta = self.flujo[nodo]
+                    saliente = nodo
+        else:
+            theta = -self.flujo[saliente]
+
+        for nodo, disminuye in ciclo:
+            self.flujo[nodo] += -theta if disminuye else theta
+
+        # El subárbol que cuelga del arco saliente se vuelve a colgar de la celda entrante
+        if saliente in camino_fila:
+            nueva_raiz, ancla = nodo_fila, nodo_columna
+            camino = camino_fila[:camino_fila.index(saliente) + 1]
+        else:
+            nueva_raiz, ancla = nodo_columna, nodo_fila
+            camino = camino_columna[:camino_columna.index(saliente) + 1]
+
+        # Potenciales: la celda entrante debe quedar con costo reducido cero
+        self._desplazar_potenciales(saliente, reducido if nueva_raiz < self.m else -reducido)
+
+        # Invertir los punteros a lo largo del camino nueva_raiz -> saliente
+        flujo_anterior = theta
+        padre_nuevo = ancla
+        for nodo in camino:
+            flujo_nodo = self.flujo[nodo]
+            self._desenganchar(nodo)
+            self._enganchar(nodo, padre_nuevo)
+            self.flujo[nodo] = flujo_anterior
+            flujo_anterior = flujo_nodo
+            padre_nuevo = nodo
+
+    def optimizar(self, max_iteraciones=None, plazo=None):
+        """
+        Aplica pivotes hasta que ningún costo reducido sea negativo.
+
+        Args:
+            max_iteraciones (int): Límite de pivotes (por defecto proporcional al tamaño)
+            plazo (float, opcional): Instante de time.perf_counter() a partir del cual no
+                se pivotea más aunque la base no sea óptima (se hace al menos un pivote
+                por llamada); cada pivote no empeora el costo, así que la base queda
+                como resultado de una búsqueda local acotada (ver self.es_optima)
+
+        Returns:
+            int: Número de pivotes realizados
+        """
+        if max_iteraciones is None:
+            max_iteraciones = 50 * (self.m + self.n) + 1000
+
+        pivotes = 0
+        self.es_optima = False
+        while True:
+            entrante = self._buscar_entrante()
+            if entrante is None:
+                self.es_optima = True
+                break
+            if pivotes >= max_iteraciones:
+                raise RuntimeError(f"El método simplex de redes no convergió en {max_iteraciones} iteraciones.")
+            self._pivotear(*entrante)
+            pivotes += 1
+            if plazo is not None and time.perf_counter() >= plazo:
+                break
+
+        self.iteraciones += pivotes
+        return pivotes
+
+    def reoptimizar_costos(self, filas, columnas, diferencias):
+        """
+        Recupera el óptimo después de cambiar los costos de algunas celdas en el modelo.
+
+        La base anterior sigue siendo factible. Si una celda cambiada es básica, se
+        desplazan los potenciales del lado del árbol que cuelga de ella para que su
+        costo reducido vuelva a ser cero; luego se aplican pivotes primales. Si solo
+        cambiaron celdas no básicas y ninguna quedó con costo reducido negativo, la
+        base sigue siendo óptima sin revisar el resto de la matriz.
+
+        Args:
+            filas, columnas (array): Celdas cuyo costo cambió
+            diferencias (array): Costo nuevo menos costo anterior de cada celda
+
+        Returns:
+            int: Número de pivotes realizados
+        """
+        alguna_basica = False
+        candidatas = []
+        for i, j, diferencia in zip(np.asarray(filas).tolist(), np.asarray(columnas).tolist(),
+                                    np.asarray(diferencias).tolist()):
+            nodo_columna = self.m + j
+            if self.padre[i] == nodo_columna:
+                self._desplazar_potenciales(i, diferencia)
+                alguna_basica = True
+            elif self.padre[nodo_columna] == i:
+                self._desplazar_potenciales(nodo_columna, -diferencia)
+                alguna_basica = True
+            else:
+                candidatas.append((i, j))
+
+        if not alguna_basica:
+            reducidos = [(self.modelo.costo(i, j) - self.potenciales[i] - self.potenciales[self.m + j], i, j)
+                         for i, j in candidatas]
+            if not reducidos or min(reducidos)[0] >= -self.tolerancia:
+                return 0
+            reducido, i, j = min(reducidos)
+            self._pivotear(i, j, reducido)
+            self.iteraciones += 1
+            return 1 + self.optimizar()
+        return self.optimizar()
+
+    def _ajustar_camino(self, a, signo_a, b, signo_b, delta):
+        """
+        Ajusta los flujos del árbol después de cambiar las cantidades de dos nodos
+        en delta unidades. signo es +1 si el nodo necesita delta unidades más en sus
+        arcos (más oferta en una fila o más demanda en una columna) y -1 si necesita
+        menos. Solo cambian los arcos del camino entre a y b, con signos alternados.
+        """
+        apice = self._ancestro_comun(a, b)
+        for nodo, signo in ((a, signo_a), (b, signo_b)):
+            for nodo in self._camino_a_raiz(nodo, apice):
+                self.flujo[nodo] += signo * delta
+                signo = -signo
+
+    def _entrante_dual(self, filas_candidatas, columnas_candidatas):
+        """
+        Celda de menor costo reducido entre las filas y columnas candidatas
+        (máscaras booleanas), o None si no hay ninguna.
+
+        Returns:
+            tuple: (i, j, costo_reducido)
+        """
+        filas = np.flatnonzero(filas_candidatas)
+        columnas = np.flatnonzero(columnas_candidatas)
+        if len(filas) == 0 or len(columnas) == 0:
+            return None
+        u = self.potenciales[:self.m]
+        v = self.potenciales[self.m:]
+        reducidos = self.modelo.submatriz(filas, columnas) - u[filas, None] - v[None, columnas]
+        fila, columna = divmod(int(np.argmin(reducidos)), len(columnas))
+        return int(filas[fila]), int(columnas[columna]), reducidos[fila, columna]
+
+    def reoptimizar_cantidades(self, nodo, nodo_ficticio, signo_ficticio, delta, max_iteraciones=None):
+        """
+        Recupera el óptimo después de cambiar en delta la oferta o demanda de un nodo,
+        compensada en la fila o columna ficticia.
+
+        Los potenciales no cambian, así que la base sigue siendo dual factible; si algún
+        flujo queda negativo se aplican pivotes del simplex dual: sale el arco con el
+        flujo más negativo y entra, entre las celdas que cruzan el corte que deja, la de
+        menor costo reducido. Al final se comprueba la optimalidad con pivotes primales.
+
+        Args:
+            nodo (int): Nodo cuya cantidad aumentó en delta (fila i o columna m + j)
+            nodo_ficticio (int): Nodo de la fila o columna ficticia que compensa el cambio
+            signo_ficticio (int): +1 si la cantidad ficticia aumenta, -1 si disminuye
+            delta (int): Cambio de la cantidad del nodo
+
+        Returns:
+            int: Número de pivotes realizados
+        """
+        if delta == 0:
+            return 0
+        self._ajustar_camino(nodo, 1, nodo_ficticio, signo_ficticio, delta)
+
+        if max_iteraciones is None:
+            max_iteraciones = 50 * (self.m + self.n) + 1000
+
+        pivotes = 0
+        while True:
+            flujos = np.asarray(self.flujo)
+            saliente = int(np.argmin(flujos))
+            if flujos[saliente] >= 0:
+                break
+            if pivotes >= max_iteraciones:
+                raise RuntimeError(f"El simplex dual no convergió en {max_iteraciones} iteraciones.")
+
+            # Si el arco saliente cuelga de una fila, su subárbol necesita recibir flujo
+            # (entran celdas fila de afuera -> columna de adentro); si cuelga de una
+            # columna, el subárbol tiene flujo de más (fila de adentro -> columna de afuera)
+            en_subarbol = np.zeros(self.m + self.n, dtype=bool)
+            en_subarbol[self._nodos_subarbol(saliente)] = True
+            if saliente < self.m:
+                entrante = self._entrante_dual(~en_subarbol[:self.m], en_subarbol[self.m:])
+            else:
+                entrante = self._entrante_dual(en_subarbol[:self.m], ~en_subarbol[self.m:])
+            if entrante is None:
+                raise RuntimeError("El problema actualizado no tiene solución factible.")
+
+            self._pivotear(*entrante, saliente=saliente)
+            pivotes += 1
+
+        self.iteraciones += pivotes
+        return pivotes + self.optimizar()
+
+    def celdas_basicas(self):
+        """
+        Returns:
+            tuple: Arreglos (filas, columnas, cantidades) de las celdas básicas
+        """
+        padre = np.asarray(self.padre, dtype=np.int64)
+        nodos = np.flatnonzero(padre >= 0)
+        padres = padre[nodos]
+        es_fila = nodos < self.m
+        filas = np.where(es_fila, nodos, padres)
+        columnas = np.where(es_fila, padres, nodos) - self.m
+        return filas, columnas, np.asarray(self.flujo, dtype=np.int64)[nodos]
+
+    def resolver(self, base_inicial=None):
+        """
+        Resuelve el problema de transporte (fase de mejora MODI).
+
+        Args:
+            base_inicial (tuple): Base (filas, columnas, cantidades) producida por alguna de
+                las SOLUCIONES_INICIALES; por defecto se usa el método de Vogel
+
+        Returns:
+            tuple: (filas, columnas, cantidades, costo_total) de las celdas con flujo positivo
+        """
+        if base_inicial is None:
+            base_inicial = vogel(self.modelo)
+        self.cargar_base(base_inicial)
+        self.optimizar()
+        return self.solucion()
+
+    def solucion(self):
+        """
+        Returns:
+            tuple: (filas, columnas, cantidades, costo_total) de las celdas básicas con flujo positivo
+        """
+        filas, columnas, cantidades = self.celdas_basicas()
+        positivas = np.flatnonzero(cantidades > 0)
+        positivas = positivas[np.lexsort((columnas[positivas], filas[positivas]))]
+        filas, columnas, cantidades = filas[positivas], columnas[positivas], cantidades[positivas]
+        return filas, columnas, cantidades, self.modelo.costo_total(filas, columnas, cantidades)
+
+
+class SimplexTransporteDisperso(SimplexTransporte):
+    """
+    Simplex de redes sobre un ModeloTransporteDisperso.
+
+    Los costos reducidos se calculan solo sobre los arcos permitidos, por
+    bloques de TAMANO_BLOQUE arcos, más un último bloque con las celdas de la
+    fila o columna ficticia; buscar la variable entrante cuesta O(arcos) y no
+    O(m·n). Las celdas prohibidas solo pueden estar en la base inicial, con
+    costo de penalización, y nunca vuelven a entrar.
+    """
+
+    # Arcos por bloque: cada arco cuesta tres accesos indirectos, así que conviene
+    # cortar antes la búsqueda que en los bloques densos
+    TAMANO_BLOQUE = 1 << 14
+
+    def __init__(self, modelo):
+
+        super().__init__(modelo)
+        self.filas_ficticias, self.columnas_ficticias = modelo.arcos_ficticios()
+        self.costos_ficticios = np.zeros(self.filas_ficticias.size, dtype=np.float64)
+        self.num_bloques = -(-modelo.num_arcos // self.TAMANO_BLOQUE) + 1
+
+    def _arcos_bloque(self, bloque):
+        """Arreglos (filas, columnas, costos) de un bloque de arcos; el último es el de la celda ficticia."""
+        if bloque == self.num_bloques - 1:
+            return self.filas_ficticias, self.columnas_ficticias, self.costos_ficticios
+        inicio = bloque * self.TAMANO_BLOQUE
+        fin = inicio + self.TAMANO_BLOQUE
+        modelo = self.modelo
+        return modelo.filas_arcos[inicio:fin], modelo.columnas_arcos[inicio:fin], modelo.costos_arcos[inicio:fin]
+
+    def _buscar_entrante(self):
+        """
+        Busca por bloques de arcos permitidos uno con costo reducido negativo.
+
+        Returns:
+            tuple: (i, j, costo_reducido) o None si la base actual es óptima
+        """
+        u = self.potenciales[:self.m]
+        v = self.potenciales[self.m:]
+        for _ in range(self.num_bloques):
+            filas, columnas, costos = self._arcos_bloque(self._bloque_actual)
+            self._bloque_actual = (self._bloque_actual + 1) % self.num_bloques
+            if not filas.size:
+                continue
+
+            reducidos = costos - u[filas] - v[columnas]
+            posicion = int(np.argmin(reducidos))
+            if reducidos[posicion] < -self.tolerancia:
+                return int(filas[posicion]), int(columnas[posicion]), reducidos[posicion]
+        return None
+
+    def _entrante_dual(self, filas_candidatas, columnas_candidatas):
+        """Como en SimplexTransporte, pero solo entre los arcos permitidos que cruzan el corte."""
+        u = self.potenciales[:self.m]
+        v = self.potenciales[self.m:]
+        mejor = None
+        for bloque in range(self.num_bloques):
+            filas, columnas, costos = self._arcos_bloque(bloque)
+            cruzan = np.flatnonzero(filas_candidatas[filas] & columnas_candidatas[columnas])
+            if not cruzan.size:
+                continue
+            filas, columnas = filas[cruzan], columnas[cruzan]
+            reducidos = costos[cruzan] - u[filas] - v[columnas]
+            posicion = int(np.argmin(reducidos))
+            if mejor is None or reducidos[posicion] < mejor[2]:
+                mejor = int(filas[posicion]), int(columnas[posicion]), reducidos[posicion]
+        return mejor
+
+    def solucion(self):
+        """
+        Como en SimplexTransporte; si en el óptimo queda flujo en alguna celda
+        prohibida, el problema no tiene solución con los arcos permitidos.
+        """
+        filas, columnas, cantidades, costo_total = super().solucion()
+        prohibidas = ~self.modelo.permitidas(filas, columnas)
+        if prohibidas.any():
+            raise RuntimeError(f"El problema no tiene solución factible con los arcos permitidos: "
+                               f"{int(cantidades[prohibidas].sum())} unidades quedan en celdas prohibidas.")
+        return filas, columnas, cantidades, costo_total
+
+
+def completar_base(m, n, filas, columnas, cantidades):
+    """
+    Completa una solución inicial hasta obtener una base de m + n - 1 celdas.
+
+    Los métodos constructivos producen un bosque; cuando hay degeneración (una
+    fila y una columna se agotan a la vez) faltan celdas para que sea un árbol
+    de expansión. Se agregan celdas con cantidad cero en la fila 0 o la columna 0
+    uniendo componentes distintas, por lo que nunca se forman ciclos.
+
+    Returns:
+        tuple: Arreglos (filas, columnas, cantidades) de la base completa
+    """
+    conjunto = list(range(m + n))
+
+    def raiz(nodo):
+        while conjunto[nodo] != nodo:
+            conjunto[nodo] = conjunto[conjunto[nodo]]
+            nodo = conjunto[nodo]
+        return nodo
+
+    for i, j in zip(filas.tolist(), columnas.tolist()):
+        conjunto[raiz(i)] = raiz(m + j)
+
+    extra_filas, extra_columnas = [], []
+
+    def unir(i, j):
+        a, b = raiz(i), raiz(m + j)
+        if a != b:
+            conjunto[a] = b
+            extra_filas.append(i)
+            extra_columnas.append(j)
+
+    unir(0, 0)
+    for i in range(1, m):
+        unir(i, 0)
+    for j in range(1, n):
+        unir(0, j)
+
+    if not extra_filas:
+        return filas, columnas, cantidades
+    return (np.concatenate([filas, np.asarray(extra_filas, dtype=np.int64)]),
+            np.concatenate([columnas, np.asarray(extra_columnas, dtype=np.int64)]),
+            np.concatenate([cantidades, np.zeros(len(extra_filas), dtype=np.int64)]))
+
+
+class ArranqueInterrumpido(Exception):
+    """Una solución inicial se detuvo porque ya no se espera su resultado (ver multiarranque)."""
+
+
+def _verificar_detencion(detener):
+    """Interrumpe la heurística si se pidió detenerla."""
+    if detener is not None and detener.is_set():
+        raise ArranqueInterrumpido()
+
+
+def esquina_noroeste(modelo):
+    """
+    Solución inicial por la regla de la esquina noroeste.
+
+    La asignación noroeste equivale a intersecar los intervalos de las ofertas y
+    demandas acumuladas, por lo que se obtiene sin recorrer la tabla celda a celda.
+
+    Returns:
+        tuple: Base (filas, columnas, cantidades) con m + n - 1 celdas
+    """
+    return completar_base(modelo.m, modelo.n, *_noroeste(modelo.oferta, modelo.demanda))
+
+
+def _noroeste(oferta, demanda):
+    """Celdas (filas, columnas, cantidades) de la regla noroeste para vectores con la misma suma."""
+    acumulada_oferta = np.cumsum(oferta)
+    acumulada_demanda = np.cumsum(demanda)
+
+    cortes = np.union1d(acumulada_oferta, acumulada_demanda)
+    cortes = cortes[cortes > 0]
+    if not cortes.size:
+        vacio = np.zeros(0, dtype=np.int64)
+        return vacio, vacio, vacio
+    inicios = np.concatenate([[0], cortes[:-1]])
+
+    filas = np.searchsorted(acumulada_oferta, inicios, side='right')
+    columnas = np.searchsorted(acumulada_demanda, inicios, side='right')
+    return filas, columnas, cortes - inicios
+
+
+def costo_minimo(modelo, tamano_lote=1 << 16, orden=None, detener=None, lotes=None):
+    """
+    Solución inicial por el método del costo mínimo.
+
+    Las celdas reales se recorren en orden creciente de costo por lotes; en cada
+    lote se descartan de forma vectorizada las celdas cuya fila o columna ya se
+    agotó y solo las restantes se asignan una a una. Como en el método clásico,
+    la fila o columna ficticia se asigna al final con lo que haya sobrado.
+    En el modelo disperso solo se recorren los arcos permitidos (ver
+    _cubrir_restantes).
+
+    Args:
+        orden (array, opcional): Orden en que se recorren las celdas reales (índices
+            planos de la matriz, o de los arcos en el modelo disperso); por defecto,
+            de menor a mayor costo
+        detener (threading.Event, opcional): Si se activa, la heurística se interrumpe
+            entre lotes con ArranqueInterrumpido
+        lotes (iterable, opcional): En lugar de orden, los índices ya partidos en
+            lotes, que pueden generarse a medida que se recorren (ver voraz_aleatorio)
+
+    Returns:
+        tuple: Base (filas, columnas, cantidades) con m + n - 1 celdas
+    """
+    n = modelo.num_columnas_reales
+    restante_oferta = modelo.oferta_real.copy()
+    restante_demanda = modelo.demanda_real.copy()
+    pendiente = int(min(restante_oferta.sum(), restante_demanda.sum()))
+
+    if lotes is None:
+        if orden is None:
+            orden = _orden_costos(modelo)
+        lotes = (orden[inicio:inicio + tamano_lote] for inicio in range(0, orden.size, tamano_lote))
+    filas, columnas, cantidades = [], [], []
+    for lote in lotes:
+        if pendiente == 0:
+            break
+        _verificar_detencion(detener)
+        if modelo.disperso:
+            filas_lote, columnas_lote = modelo.filas_arcos[lote], modelo.columnas_arcos[lote]
+        else:
+            filas_lote, columnas_lote = np.divmod(lote, n)
+        vivas = (restante_oferta[filas_lote] > 0) & (restante_demanda[columnas_lote] > 0)
+        for i, j in zip(filas_lote[vivas].tolist(), columnas_lote[vivas].tolist()):
+            cantidad = min(restante_oferta[i], restante_demanda[j])
+            if cantidad == 0:
+                continue
+            restante_oferta[i] -= cantidad
+            restante_demanda[j] -= cantidad
+            pendiente -= cantidad
+            filas.append(i)
+            columnas.append(j)
+            cantidades.append(cantidad)
+            if pendiente == 0:
+                break
+
+    filas = np.asarray(filas, dtype=np.int64)
+    columnas = np.asarray(columnas, dtype=np.int64)
+    cantidades = np.asarray(cantidades, dtype=np.int64)
+    if modelo.disperso:
+        return completar_base(modelo.m, modelo.n, *_cubrir_restantes(modelo, filas, columnas, cantidades,
+                                                                    restante_oferta, restante_demanda))
+    if modelo.columna_ficticia:
+        sobrantes = np.flatnonzero(restante_oferta)
+        filas = np.concatenate([filas, sobrantes])
+        columnas = np.concatenate([columnas, np.full(sobrantes.size, n)])
+        cantidades = np.concatenate([cantidades, restante_oferta[sobrantes]])
+    elif modelo.fila_ficticia:
+        faltantes = np.flatnonzero(restante_demanda)
+        filas = np.concatenate([filas, np.full(faltantes.size, modelo.num_filas_reales)])
+        columnas = np.concatenate([columnas, faltantes])
+        cantidades = np.concatenate([cantidades, restante_demanda[faltantes]])
+
+    return completar_base(modelo.m, modelo.n, filas, columnas, cantidades)
+
+
+def _cubrir_restantes(modelo, filas, columnas, cantidades, restante_oferta, restante_demanda):
+    """
+    Completa la solución del costo mínimo en un modelo disperso. Lo que los arcos
+    permitidos no alcanzaron a cubrir va primero a la fila o columna ficticia,
+    que admite todas las celdas, y el resto por la regla noroeste a celdas
+    prohibidas con costo de penalización, que el simplex vacía después. Cada
+    celda agregada agota su fila o su columna, así que no se forman ciclos.
+
+    Returns:
+        tuple: Arreglos (filas, columnas, cantidades) de la solución completa
+    """
+    def repartir(restos, total):
+        """Reparte total entre los restos en orden, como lo haría el costo mínimo con costos iguales."""
+        acumulada = np.cumsum(restos)
+        return np.minimum(acumulada, total) - np.minimum(acumulada - restos, total)
+
+    partes = [(filas, columnas, cantidades)]
+    if modelo.columna_ficticia:
+        asignado = repartir(restante_oferta, int(modelo.demanda[-1]))
+        usadas = np.flatnonzero(asignado)
+        partes.append((usadas, np.full(usadas.size, modelo.num_columnas_reales), asignado[usadas]))
+        restante_oferta = restante_oferta - asignado
+        restante_demanda = np.append(restante_demanda, modelo.demanda[-1] - asignado.sum())
+    elif modelo.fila_ficticia:
+        asignado = repartir(restante_demanda, int(modelo.oferta[-1]))
+        usadas = np.flatnonzero(asignado)
+        partes.append((np.full(usadas.size, modelo.num_filas_reales), usadas, asignado[usadas]))
+        restante_demanda = restante_demanda - asignado
+        restante_oferta = np.append(restante_oferta, modelo.oferta[-1] - asignado.sum())
+    partes.append(_noroeste(restante_oferta, restante_demanda))
+    return tuple(np.concatenate([parte[k] for parte in partes]).astype(np.int64) for k in range(3))
+
+
+def _ordenar_por_lotes(bloque, num_lineas, largo, tamano_lote=1 << 22, ejecutor=None, detener=None):
+    """
+    Argsort de cada línea en lotes, guardado con el entero más pequeño que alcance.
+    Con un ejecutor (ThreadPoolExecutor) los lotes se ordenan en paralelo: el
+    argsort de NumPy libera el GIL y cada lote escribe en filas distintas. Si se
+    activa detener, se interrumpe entre lotes (ver _verificar_detencion).
+    """
+    tipo = np.int32 if largo < 2 ** 31 else np.int64
+    orden = np.empty((num_lineas, largo), dtype=tipo)
+    lineas_por_lote = max(1, tamano_lote // max(1, largo))
+
+    def ordenar(inicio):
+        _verificar_detencion(detener)
+        fin = min(inicio + lineas_por_lote, num_lineas)
+        orden[inicio:fin] = np.argsort(bloque(inicio, fin), axis=1, kind='stable')
+
+    inicios = range(0, num_lineas, lineas_por_lote)
+    if ejecutor is None:
+        for inicio in inicios:
+            ordenar(inicio)
+    else:
+        for _ in ejecutor.map(ordenar, inicios):
+            pass
+    return orden
+
+
+class _PenalizacionesVogel:
+    """
+    Penalizaciones de Vogel de un lado de la tabla (filas o columnas).
+
+    Para cada línea se guarda su orden de costos y dos punteros a las dos celdas
+    vivas más baratas. Al eliminar una línea del otro lado solo se recalculan las
+    líneas cuyos punteros apuntaban a ella, y los punteros únicamente avanzan.
+    """
+
+    def __init__(self, bloque, valores, vivas, vivas_otro_lado, ejecutor=None, detener=None):
+        num_lineas, largo = vivas.size, vivas_otro_lado.size
+        self.valores = valores # valores(lineas, indices) devuelve los costos de esas celdas
+        self.orden = _ordenar_por_lotes(bloque, num_lineas, largo, ejecutor=ejecutor, detener=detener)
+        self.vivas = vivas
+        self.primero = np.zeros(num_lineas, dtype=np.int64)
+        self.segundo = np.ones(num_lineas, dtype=np.int64)
+        self.penalizacion = np.full(num_lineas, -np.inf)
+        self.largo = largo
+        self.vivas_otro_lado = vivas_otro_lado
+        self.recalcular(np.flatnonzero(vivas), desde_cero=True)
+
+    def _avanzar(self, lineas, punteros, minimo):
+        """Avanza los punteros de las líneas dadas hasta la siguiente celda viva."""
+        punteros[lineas] = np.maximum(punteros[lineas], minimo)
+        pendientes = lineas
+        while pendientes.size:
+            posiciones = punteros[pendientes]
+            fuera = posiciones >= self.largo
+            indices = self.orden[pendientes[~fuera], posiciones[~fuera]]
+            muertas = np.zeros(pendientes.size, dtype=bool)
+            muertas[~fuera] = ~self.vivas_otro_lado[indices]
+            pendientes = pendientes[muertas]
+            punteros[pendientes] += 1
+
+    def recalcular(self, lineas, desde_cero=False):
+        """Actualiza los dos mejores candidatos y la penalización de las líneas dadas."""
+        if not lineas.size:
+            return
+        if desde_cero:
+            self._avanzar(lineas, self.primero, 0)
+        else:
+            mover = ~self.vivas_otro_lado[self.orden[lineas, np.minimum(self.primero[lineas], self.largo - 1)]]
+            self.primero[lineas[mover]] = self.segundo[lineas[mover]]
+            self._avanzar(lineas[mover], self.primero, 0)
+        self._avanzar(lineas, self.segundo, self.primero[lineas] + 1)
+
+        primero = self.primero[lineas]
+        segundo = self.segundo[lineas]
+        indice_primero = self.orden[lineas, np.minimum(primero, self.largo - 1)]
+        costo_primero = self.valores(lineas, indice_primero)
+        tiene_segundo = segundo < self.largo
+        costo_segundo = self.valores(lineas, self.orden[lineas, np.minimum(segundo, self.largo - 1)])
+        # Con una sola celda viva la penalización es su propio costo
+        self.penalizacion[lineas] = np.where(tiene_segundo, costo_segundo - costo_primero, costo_primero)
+
+    def mejor_celda(self, linea):
+        """Índice del otro lado con el menor costo vivo en la línea."""
+        return int(self.orden[linea, self.primero[linea]])
+
+    def eliminar_otro_lado(self, indice):
+        """Recalcula las líneas afectadas al eliminar el índice del otro lado."""
+        vivas = np.flatnonzero(self.vivas)
+        primero = self.orden[vivas, np.minimum(self.primero[vivas], self.largo - 1)]
+        segundo = self.orden[vivas, np.minimum(self.segundo[vivas], self.largo - 1)]
+        afectadas = vivas[(primero == indice) | ((segundo == indice) & (self.segundo[vivas] < self.largo))]
+        self.recalcular(afectadas)
+
+
+def vogel(modelo, ejecutor=None, detener=None):
+    """
+    Solución inicial por el método de aproximación de Vogel.
+
+    Las penalizaciones se mantienen de forma incremental con _PenalizacionesVogel:
+    cada paso cuesta O(m + n) operaciones vectorizadas en lugar de volver a
+    recorrer toda la matriz. Las penalizaciones necesitan el orden de costos de
+    cada línea completa, así que en el modelo disperso se usa el costo mínimo
+    sobre los arcos permitidos.
+
+    Args:
+        ejecutor (ThreadPoolExecutor, opcional): Si se da, el orden de costos de
+            las filas y de las columnas (la parte más cara) se calcula en paralelo
+        detener (threading.Event, opcional): Si se activa, la heurística se interrumpe
+            con ArranqueInterrumpido
+
+    Returns:
+        tuple: Base (filas, columnas, cantidades) con m + n - 1 celdas
+    """
+    if modelo.disperso:
+        return costo_minimo(modelo, detener=detener)
+
+    restante_oferta = modelo.oferta.copy()
+    restante_demanda = modelo.demanda.copy()
+    filas_vivas = restante_oferta > 0
+    columnas_vivas = restante_demanda > 0
+
+    por_filas = _PenalizacionesVogel(modelo.filas, modelo.valores, filas_vivas, columnas_vivas, ejecutor, detener)
+    por_columnas = _PenalizacionesVogel(lambda inicio, fin: modelo.columnas(inicio, fin).T,
+                                        lambda lineas, indices: modelo.valores(indices, lineas),
+                                        columnas_vivas, filas_vivas, ejecutor, detener)
+
+    filas, columnas, cantidades = [], [], []
+    while filas_vivas.any() and columnas_vivas.any():
+        _verificar_detencion(detener)
+        fila = int(np.argmax(np.where(filas_vivas, por_filas.penalizacion, -np.inf)))
+        columna = int(np.argmax(np.where(columnas_vivas, por_columnas.penalizacion, -np.inf)))
+        if por_filas.penalizacion[fila] >= por_columnas.penalizacion[columna]:
+            i, j = fila, por_filas.mejor_celda(fila)
+        else:
+            i, j = por_columnas.mejor_celda(columna), columna
+
+        cantidad = min(restante_oferta[i], restante_demanda[j])
+        restante_oferta[i] -= cantidad
+        restante_demanda[j] -= cantidad
+        filas.append(i)
+        columnas.append(j)
+        cantidades.append(cantidad)
+
+        if restante_oferta[i] == 0:
+            filas_vivas[i] = False
+            por_filas.penalizacion[i] = -np.inf
+            por_columnas.eliminar_otro_lado(i)
+        if restante_demanda[j] == 0:
+            columnas_vivas[j] = False
+            por_columnas.penalizacion[j] = -np.inf
+            por_filas.eliminar_otro_lado(j)
+
+    return completar_base(modelo.m, modelo.n, np.asarray(filas, dtype=np.int64),
+                          np.asarray(columnas, dtype=np.int64), np.asarray(cantidades, dtype=np.int64))
+
+
+def _orden_costos(modelo):
+    """Índices planos de las celdas reales (o de los arcos) de menor a mayor costo."""
+    return np.argsort(modelo.costos_arcos if modelo.disperso else modelo.costos, axis=None, kind='stable')
+
+
+def _lotes_perturbados(costos, orden, rng, ruido, tamano_lote):
+    """
+    Índices de las celdas en orden creciente de costo perturbado, por lotes, sin
+    armar los costos perturbados de toda la matriz.
+
+    Una celda de costo c >= 0 tiene costo perturbado en [c, c · (1 + ruido)), así
+    que puede salir en cuanto todas las celdas que faltan leer del orden base
+    cuestan al menos eso. Se leen tramos del orden base y solo se guardan las
+    celdas leídas que todavía no pueden salir; el orden que resulta es el mismo
+    que el de ordenar todos los costos perturbados.
+    """
+    pendientes = np.empty(0, dtype=np.int64)
+    valores = np.empty(0)
+    leidas = 0
+    while leidas < orden.size:
+        # Tramos al menos tan largos como lo pendiente: cada celda se reordena O(1) veces en promedio
+        nuevas = orden[leidas:leidas + max(tamano_lote, pendientes.size)]
+        leidas += nuevas.size
+        perturbados = rng.random(nuevas.size)
+        perturbados *= ruido
+        perturbados += 1.0
+        perturbados *= costos[nuevas]
+        pendientes = np.concatenate([pendientes, nuevas])
+        valores = np.concatenate([valores, perturbados])
+        if leidas < orden.size:
+            # Menor costo perturbado posible de las celdas sin leer (un costo negativo baja)
+            frontera = costos[orden[leidas]]
+            frontera = frontera if frontera >= 0 else frontera * (1 + ruido)
+            salen = valores < frontera
+        else:
+            salen = np.ones(valores.size, dtype=bool)
+        elegidas = np.flatnonzero(salen)
+        yield pendientes[elegidas[np.argsort(valores[elegidas], kind='stable')]]
+        pendientes, valores = pendientes[~salen], valores[~salen]
+
+
+def voraz_aleatorio(modelo, semilla=None, ruido=0.1, detener=None, orden=None, tamano_lote=1 << 16):
+    """
+    Solución inicial voraz aleatorizada: el costo mínimo recorriendo las celdas
+    en orden de costo perturbado, cada costo multiplicado por un factor al azar
+    en [1, 1 + ruido). Con distintas semillas desempata y reordena de forma
+    distinta las celdas de costo parecido, así que sirve para multiarranque.
+
+    Los costos perturbados se generan por tramos del orden de los costos sin
+    perturbar (ver _lotes_perturbados): además de ese orden, que puede
+    compartirse entre arranques, cada arranque solo guarda las celdas leídas
+    que aún no se asignaron, no una copia perturbada de toda la matriz.
+
+    Args:
+        semilla: Semilla o SeedSequence de numpy.random.default_rng
+        ruido (float): Perturbación relativa máxima de cada costo
+        detener (threading.Event, opcional): Ver costo_minimo
+        orden (array, opcional): Orden de los costos sin perturbar (ver _orden_costos)
+        tamano_lote (int): Celdas del orden base que se leen y perturban de una vez
+
+    Returns:
+        tuple: Base (filas, columnas, cantidades) con m + n - 1 celdas
+    """
+    rng = np.random.default_rng(semilla)
+    costos = modelo.costos_arcos if modelo.disperso else modelo.costos.ravel()
+    if orden is None:
+        orden = _orden_costos(modelo)
+    _verificar_detencion(detener)
+    return costo_minimo(modelo, detener=detener, lotes=_lotes_perturbados(costos, orden, rng, ruido, tamano_lote))
+
+
+def _memoria_libre():
+    """Bytes de memoria física libre, o None si el sistema no lo informa."""
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def multiarranque(modelo, heuristicas=('vogel', 'costo_minimo', 'voraz_aleatorio'), num_aleatorios=4,
+                  max_hilos=None, semilla=0, plazo=None, limite_memoria=None):
+    """
+    Ejecuta varias soluciones iniciales a la vez en un ThreadPoolExecutor.
+
+    Todos los hilos leen el mismo modelo (la matriz de costos no se copia ni se
+    modifica); los ordenamientos y las operaciones vectorizadas de NumPy liberan
+    el GIL, que es donde estas heurísticas pasan la mayor parte del tiempo. Se
+    espera a los arranques hasta el plazo; los que no terminan a tiempo se
+    descartan y se les pide detenerse (los hilos no se pueden interrumpir, así
+    que cada heurística revisa un evento compartido entre lotes y abandona).
+    Si ninguno terminó a tiempo se usa la esquina noroeste, que cuesta
+    O(m + n) y se calcula en el hilo que llama.
+
+    El orden de los costos se calcula una vez y lo comparten el costo mínimo y
+    los arranques aleatorios. Cada arranque aleatorio guarda además, en el peor
+    caso (costos casi iguales), un índice y un costo perturbado por celda, así
+    que los hilos simultáneos se limitan para que ese peor caso quepa en
+    limite_memoria.
+
+    Args:
+        heuristicas (tuple): Nombres de SOLUCIONES_INICIALES a ejecutar
+        num_aleatorios (int): Arranques de 'voraz_aleatorio', cada uno con su semilla
+        max_hilos (int, opcional): Número de hilos; por defecto, uno por CPU
+        semilla (int): Semilla de la que se derivan las de los arranques aleatorios
+        plazo (float, opcional): Instante de time.perf_counter() hasta el que se espera;
+            sin plazo se espera a la primera que termine y no a las demás
+        limite_memoria (int, opcional): Bytes para los arranques simultáneos; por
+            defecto, la mitad de la memoria física libre
+
+    Returns:
+        list: Tuplas (nombre, base, costo) de los arranques terminados, de menor a mayor costo
+    """
+    desconocidas = [nombre for nombre in heuristicas if nombre not in SOLUCIONES_INICIALES]
+    if desconocidas:
+        raise ValueError(f"Solución inicial desconocida: {desconocidas[0]}. "
+                         f"Use una de: {', '.join(SOLUCIONES_INICIALES)}")
+    max_hilos = max_hilos or os.cpu_count() or 1
+    if limite_memoria is None:
+        libre = _memoria_libre()
+        limite_memoria = None if libre is None else libre // 2
+    if limite_memoria is not None:
+        celdas = modelo.costos_arcos.size if modelo.disperso else modelo.costos.size
+        max_hilos = max(1, min(max_hilos, limite_memoria // max(1, 16 * celdas)))
+    orden = _orden_costos(modelo) if {'costo_minimo', 'voraz_aleatorio'} & set(heuristicas) else None
+
+    # Vogel ordena sus líneas en otro ejecutor: si usara el mismo podría esperar
+    # lotes encolados detrás de los arranques que ocupan todos los hilos
+    ordenador = ThreadPoolExecutor(max_workers=max_hilos) if max_hilos > 1 and 'vogel' in heuristicas else None
+    detener = threading.Event() # Se activa al dejar de esperar: los arranques pendientes abandonan
+    arranques = []
+    for nombre in heuristicas:
+        if nombre == 'voraz_aleatorio':
+            for k, semilla_arranque in enumerate(np.random.SeedSequence(semilla).spawn(num_aleatorios)):
+                arranques.append((f"{nombre}_{k}", partial(voraz_aleatorio, modelo, semilla_arranque, detener=detener,
+                                                           orden=orden)))
+        elif nombre == 'vogel':
+            arranques.append((nombre, partial(vogel, modelo, ordenador, detener)))
+        elif nombre == 'costo_minimo':
+            arranques.append((nombre, partial(costo_minimo, modelo, orden=orden, detener=detener)))
+        else:
+            arranques.append((nombre, partial(SOLUCIONES_INICIALES[nombre], modelo)))
+
+    ejecutor = ThreadPoolExecutor(max_workers=max_hilos)
+    try:
+        futuros = {ejecutor.submit(funcion): (posicion, nombre) for posicion, (nombre, funcion) in enumerate(arranques)}
+        restante = None if plazo is None else max(0.0, plazo - time.perf_counter())
+        terminados, pendientes = wait(futuros, timeout=restante, return_when=FIRST_COMPLETED)
+        if terminados and pendientes and plazo is not None:
+            terminados |= wait(pendientes, timeout=max(0.0, plazo - time.perf_counter()))[0]
+    finally:
+        detener.set()
+        ejecutor.shutdown(wait=False, cancel_futures=True)
+        if ordenador is not None:
+            ordenador.shutdown(wait=False, cancel_futures=True)
+
+    resultados = []
+    for futuro in terminados:
+        if futuro.exception() is not None:
+            continue
+        posicion, nombre = futuros[futuro]
+        base = futuro.result()
+        resultados.append((modelo.costo_total(*base), posicion, nombre, base))
+    if not terminados:
+        # Ningún arranque terminó antes del plazo
+        base = esquina_noroeste(modelo)
+        resultados.append((modelo.costo_total(*base), len(arranques), 'esquina_noroeste', base))
+    elif not resultados:
+        # Todos los arranques terminados fallaron: se propaga el primer error
+        raise next(futuro.exception() for futuro in terminados)
+    resultados.sort(key=lambda resultado: resultado[:2])
+    return [(nombre, base, costo) for costo, _, nombre, base in resultados]
+
+
+def cota_inferior(modelo, potenciales_filas=None, rondas=2, tamano_bloque=1 << 20):
+    """
+    Cota inferior del costo óptimo a partir de una estimación de los potenciales
+    duales de las filas (por ejemplo, los de un simplex detenido antes del óptimo).
+
+    Se alterna v[j] = min_i(c[i][j] - u[i]) y u[i] = min_j(c[i][j] - v[j]): así
+    u[i] + v[j] <= c[i][j] en todas las celdas permitidas, la solución dual es
+    factible y, por dualidad débil, oferta·u + demanda·v no supera el costo de
+    ninguna solución. Cada paso maximiza el dual en u o en v con el otro fijo,
+    así que ninguna ronda empeora la cota; con los potenciales de una base
+    óptima la cota es exacta. El modelo denso se recorre por bloques de unas
+    tamano_bloque celdas; en el disperso solo se recorren los arcos permitidos.
+
+    Args:
+        potenciales_filas (array, opcional): Estimación de u, una por fila del problema
+            balanceado; por defecto u = 0 (v[j] parte del menor costo de la columna j)
+        rondas (int): Veces que se recalculan v y u
+
+    Returns:
+        float: Cota inferior del costo total
+    """
+    if modelo.disperso:
+        filas, columnas, costos = modelo.arcos()
+
+        def minimos(indices, tamano, potenciales):
+            resultado = np.full(tamano, np.inf)
+            np.minimum.at(resultado, indices, costos - potenciales)
+            # Una línea sin arcos no tiene restricción dual: cualquier potencial vale
+            resultado[~np.isfinite(resultado)] = 0.0
+            return resultado
+
+        columnas_desde = lambda u: minimos(columnas, modelo.n, u[filas])
+        filas_desde = lambda v: minimos(filas, modelo.m, v[columnas])
+    else:
+        filas_por_bloque = max(1, tamano_bloque // max(1, modelo.n))
+        bloques = [(inicio, min(inicio + filas_por_bloque, modelo.m)) for inicio in range(0, modelo.m, filas_por_bloque)]
+
+        def columnas_desde(u):
+            v = np.full(modelo.n, np.inf)
+            for inicio, fin in bloques:
+                np.minimum(v, (modelo.filas(inicio, fin) - u[inicio:fin, None]).min(axis=0), out=v)
+            return v
+
+        def filas_desde(v):
+            u = np.empty(modelo.m, dtype=np.float64)
+            for inicio, fin in bloques:
+                u[inicio:fin] = (modelo.filas(inicio, fin) - v).min(axis=1)
+            return u
+
+    if potenciales_filas is None:
+        u = np.zeros(modelo.m, dtype=np.float64)
+    else:
+        u = np.asarray(potenciales_filas, dtype=np.float64)
+    for _ in range(max(1, rondas)):
+        v = columnas_desde(u)
+        u = filas_desde(v)
+    return float(np.dot(modelo.oferta, u) + np.dot(modelo.demanda, v))
+
+
+def construir_modelo_matricial(modelo):
+    """
+    Construye la forma matricial del problema de transporte balanceado:
+    minimizar c·x sujeto a A_ub·x <= oferta (una fila por programador) y
+    A_eq·x = demanda (una fila por tarea), con la variable de la celda (i, j)
+    en la posición i * n + j.
+
+    Las matrices se arman directamente en formato CSR a partir de índices de
+    NumPy, sin crear un objeto de Python por variable ni por restricción. En el
+    modelo disperso hay una variable por arco permitido (ver
+    ModeloTransporteDisperso.arcos) y el diccionario incluye también la fila y
+    la columna de cada variable.
+
+    Returns:
+        dict: Vector c y matrices/vectores A_ub, b_ub, A_eq, b_eq (y filas, columnas)
+    """
+    from scipy.sparse import csr_matrix
+
+    m, n = modelo.m, modelo.n
+    if modelo.disperso:
+        filas, columnas, c = modelo.arcos()
+        unos = np.ones(c.size, dtype=np.float64)
+        variables = np.arange(c.size, dtype=np.int64)
+        return {
+            'c': c,
+            'A_ub': csr_matrix((unos, (filas, variables)), shape=(m, c.size)),
+            'b_ub': modelo.oferta.astype(np.float64),
+            'A_eq': csr_matrix((unos, (columnas, variables)), shape=(n, c.size)),
+            'b_eq': modelo.demanda.astype(np.float64),
+            'filas': filas,
+            'columnas': columnas,
+        }
+    num_variables = m * n
+
+    if modelo.fila_ficticia or modelo.columna_ficticia:
+        c = np.zeros((m, n), dtype=np.float64)
+        c[:modelo.num_filas_reales, :modelo.num_columnas_reales] = modelo.costos
+        c = c.ravel()
+    else:
+        c = modelo.costos.ravel()
+
+    unos = np.ones(num_variables, dtype=np.float64)
+    variables = np.arange(num_variables, dtype=np.int64)
+    # Fila i de A_ub: variables i*n .. i*n + n - 1; fila j de A_eq: variables j, j + n, j + 2n, ...
+    A_ub = csr_matrix((unos, variables, np.arange(0, num_variables + 1, n)), shape=(m, num_variables))
+    A_eq = csr_matrix((unos, variables.reshape(m, n).T.ravel(), np.arange(0, num_variables + 1, m)),
+                      shape=(n, num_variables))
+
+    return {
+        'c': c,
+        'A_ub': A_ub,
+        'b_ub': modelo.oferta.astype(np.float64),
+        'A_eq': A_eq,
+        'b_eq': modelo.demanda.astype(np.float64),
+    }
+
+
+def resolver_modelo_matricial(modelo, matrices):
+    """
+    Resuelve la forma matricial con HiGHS (scipy.optimize.linprog).
+
+    La matriz de restricciones del transporte es totalmente unimodular, así que
+    la solución básica que devuelve HiGHS ya es entera; solo se redondea para
+    eliminar el ruido numérico.
+
+    Returns:
+        tuple: (filas, columnas, cantidades, costo_total) de las celdas con flujo positivo
+    """
+    # scipy.optimize tarda en importarse y solo lo usa este motor
+    from scipy.optimize import linprog
+
+    resultado = linprog(matrices['c'], A_ub=matrices['A_ub'], b_ub=matrices['b_ub'],
+                        A_eq=matrices['A_eq'], b_eq=matrices['b_eq'], bounds=(0, None), method='highs')
+    if not resultado.success:
+        raise RuntimeError(f"HiGHS no encontró una solución óptima: {resultado.message}")
+
+    cantidades = np.rint(resultado.x).astype(np.int64)
+    positivas = np.flatnonzero(cantidades > 0)
+    if 'filas' in matrices:
+        filas, columnas = matrices['filas'][positivas], matrices['columnas'][positivas]
+        positivas = positivas[np.lexsort((columnas, filas))]
+        filas, columnas = matrices['filas'][positivas], matrices['columnas'][positivas]
+    else:
+        filas, columnas = np.divmod(positivas, modelo.n)
+    cantidades = cantidades[positivas]
+    return filas, columnas, cantidades, modelo.costo_total(filas, columnas, cantidades)
+
+
+# Métodos de solución inicial disponibles para arrancar el simplex de redes
+SOLUCIONES_INICIALES = {
+    'esquina_noroeste': esquina_noroeste,
+    'costo_minimo': costo_minimo,
+    'vogel': vogel,
+    'voraz_aleatorio': voraz_aleatorio,
+}
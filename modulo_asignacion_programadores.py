@@ -1,173 +1,623 @@
-import pandas as pd
-from pulp import *
+import json
 import numpy as np
 import os
+import sys
+import time
+from instrumentacion import Instrumentacion
+from lectura_instancias import leer_instancia_programadores
+from metodos_transporte import (AsignacionesDispersas, SimplexTransporte, SimplexTransporteDisperso, SOLUCIONES_INICIALES,
+                                construir_modelo_matricial, cota_inferior, crear_modelo, multiarranque,
+                                resolver_modelo_matricial)
+
+# Motores aceptados por AsignacionProgramadoresTareas.resolver
+METODOS_RESOLUCION = ('simplex_red', 'highs', 'pulp', 'heuristico')
 
 class AsignacionProgramadoresTareas:
 
-    def __init__(self, num_programadores, num_tareas, matriz_costos, capacidad_programadores, demanda_tareas):
+    def __init__(self, num_programadores, num_tareas, matriz_costos, capacidad_programadores, demanda_tareas, cache=None,
+                 instrumentacion=None):
         
         self.num_programadores = num_programadores # num_programadores (int): Número de programadores disponibles
         self.num_tareas = num_tareas # num_tareas (int): Número de tareas a realizar
-        self.matriz_costos = matriz_costos # Matriz de costos C[N][M]
+        self.matriz_costos = matriz_costos # Matriz de costos C[N][M] (densa, o dispersa de SciPy con solo los arcos permitidos)
         self.capacidad_programadores = capacidad_programadores # Vector S[N] que indica la cantidad máxima de tareas 
         self.demanda_tareas = demanda_tareas # Vector D[M] que indica la cantidad de programadores requeridos por cada tarea
+        self.instrumentacion = instrumentacion or Instrumentacion() # Tiempos y memoria por fase (ver instrumentacion.py)
         
-        # Crear identificadores para programadores y tareas
-        self.programadores = [f'Programador_{i}' for i in range(num_programadores)]
-        self.tareas = [f'Tarea_{j}' for j in range(num_tareas)]
-        
-        # Convertir listas a diccionarios para compatibilidad con PuLP
-        self.oferta = {self.programadores[i]: capacidad_programadores[i] for i in range(num_programadores)}
-        self.demanda = {self.tareas[j]: demanda_tareas[j] for j in range(num_tareas)}
-        
-        # Crear matriz de costos como diccionario de diccionarios
-        self.costo_asignacion = {}
-        for i in range(num_programadores):
-            self.costo_asignacion[self.programadores[i]] = {}
-            for j in range(num_tareas):
-                self.costo_asignacion[self.programadores[i]][self.tareas[j]] = matriz_costos[i][j]
-
-        # Balancear si es necesario
+        # Balancear si es necesario (de forma virtual, sin copiar la matriz de costos)
         self.balancear_oferta_demanda()
         
-        # Inicializar el problema de optimización
-        self.prob = LpProblem('AsignacionProgramadoresTareas', LpMinimize)
+        # El problema de PuLP se construye solo si se usa ese motor
+        self.prob = None
         self.asignaciones = None
         self.costo_total = None
+        self.tiempos = {} # Segundos por fase de la última resolución (construcción del modelo, resolución, ...)
+        self.simplex = None # Simplex de redes de la última resolución, reutilizado por las actualizaciones incrementales
+        self.heuristica = None # Arranques, cota inferior y brecha de la última resolución heurística
+        self.cache = cache # CacheSoluciones opcional consultada por resolver
+        self._reporte = None # Reporte de texto de las asignaciones actuales, generado al pedirlo
 
 
     def balancear_oferta_demanda(self):
         """
         Balancea el problema de transporte agregando una fila o columna ficticia
         si la suma de la oferta y la demanda no coincide.
+        
+        Los datos se guardan en un ModeloTransporte (arreglo float64 de costos y
+        arreglos de enteros para oferta y demanda), o en un ModeloTransporteDisperso
+        si la matriz de costos es dispersa: sus celdas ausentes son pares
+        programador-tarea prohibidos. La fila o columna ficticia es virtual: solo
+        se ajustan las dimensiones y los vectores de oferta y demanda.
         """
-        total_oferta = sum(self.capacidad_programadores)
-        total_demanda = sum(self.demanda_tareas)
-
-        if total_oferta == total_demanda:
-            return  # No se necesita balanceo
-
-        if total_oferta > total_demanda:
-            # Agregar columna ficticia (tarea ficticia)
-            exceso = total_oferta - total_demanda
-            for fila in self.matriz_costos:
-                fila.append(0)  # Costo cero o alto si se quiere penalizar
-            self.num_tareas += 1
-            self.demanda_tareas.append(exceso)
-            tarea_ficticia = f'Tarea_Ficticia'
-            self.tareas.append(tarea_ficticia)
-            for i in range(self.num_programadores):
-                self.costo_asignacion[self.programadores[i]][tarea_ficticia] = 0
-            self.demanda[tarea_ficticia] = exceso
-
-        elif total_demanda > total_oferta:
-            # Agregar fila ficticia (programador ficticio)
-            exceso = total_demanda - total_oferta
-            fila_ficticia = [0] * self.num_tareas  # Costo cero o alto
-            self.matriz_costos.append(fila_ficticia)
-            self.num_programadores += 1
-            self.capacidad_programadores.append(exceso)
-            programador_ficticio = f'Programador_Ficticio'
-            self.programadores.append(programador_ficticio)
-            self.costo_asignacion[programador_ficticio] = {}
-            for j in range(self.num_tareas):
-                self.costo_asignacion[programador_ficticio][self.tareas[j]] = 0
-            self.oferta[programador_ficticio] = exceso
-
-    def resolver_pulp(self):
-        """
-        Resuelve el problema de asignación utilizando PuLP.
+        with self.instrumentacion.fase('balanceo'):
+            self.modelo = crear_modelo(self.matriz_costos, self.capacidad_programadores, self.demanda_tareas)
+        
+        self.matriz_costos = self.modelo.costos
+        self.num_programadores = self.modelo.m
+        self.num_tareas = self.modelo.n
+        self.capacidad_programadores = self.modelo.oferta
+        self.demanda_tareas = self.modelo.demanda
+
+    def etiqueta_programador(self, i):
+        """Identificador del programador i para los reportes."""
+        if i >= self.modelo.num_filas_reales:
+            return 'Programador_Ficticio'
+        return f'Programador_{i}'
+
+    def etiqueta_tarea(self, j):
+        """Identificador de la tarea j para los reportes."""
+        if j >= self.modelo.num_columnas_reales:
+            return 'Tarea_Ficticia'
+        return f'Tarea_{j}'
+
+    @property
+    def programadores(self):
+        """Identificadores de todos los programadores, generados solo cuando se piden."""
+        return [self.etiqueta_programador(i) for i in range(self.num_programadores)]
+
+    @property
+    def tareas(self):
+        """Identificadores de todas las tareas, generados solo cuando se piden."""
+        return [self.etiqueta_tarea(j) for j in range(self.num_tareas)]
+
+    def calcular_solucion_inicial(self, metodo='vogel'):
         """
-        # Definir las variables de decisión
-        rutas = [(i, j) for i in self.programadores for j in self.tareas]
-        cantidad = LpVariable.dicts('Cantidad_Asignada', (self.programadores, self.tareas), 0, None, LpInteger)
+        Calcula una solución básica factible con un método constructivo.
         
-        # Definir la función objetivo (minimizar costo total)
-        self.prob += lpSum(cantidad[i][j] * self.costo_asignacion[i][j] for (i, j) in rutas)
+        Args:
+            metodo (str): 'esquina_noroeste', 'costo_minimo', 'vogel' o 'voraz_aleatorio'
+            
+        Returns:
+            tuple: Base (filas, columnas, cantidades) y su costo total
+        """
+        if metodo not in SOLUCIONES_INICIALES:
+            raise ValueError(f"Método de solución inicial desconocido: {metodo}")
+        base = SOLUCIONES_INICIALES[metodo](self.modelo)
+        return base, self.modelo.costo_total(*base)
+
+    def resolver_pulp(self, solucion_inicial=None):
+        """
+        Resuelve el problema de asignación utilizando PuLP.
         
-        # Restricciones de demanda: cada tarea debe recibir exactamente la cantidad de programadores requeridos
-        for j in self.tareas:
-            self.prob += lpSum(cantidad[i][j] for i in self.programadores) == self.demanda[j]
+        Args:
+            solucion_inicial (str): Método constructivo opcional cuya solución se
+                entrega a CBC como punto de partida (warm start)
+        """
+        self.simplex = None
+        self.tiempos = {}
+        self.heuristica = None
+        with self.instrumentacion.fase('construccion_modelo') as medida:
+            # PuLP solo se importa cuando se elige este motor
+            from pulp import LpInteger, LpMinimize, LpProblem, LpStatus, LpVariable, PULP_CBC_CMD, lpSum, value
+            
+            programadores = self.programadores
+            tareas = self.tareas
+            self.prob = LpProblem('AsignacionProgramadoresTareas', LpMinimize)
             
-        # Restricciones de oferta: cada programador no puede exceder su capacidad máxima
-        for i in self.programadores:
-            self.prob += lpSum(cantidad[i][j] for j in self.tareas) <= self.oferta[i]
+            # Definir las variables de decisión: una por celda, o solo por arco permitido en el modelo disperso
+            filas_rutas, columnas_rutas, costos_rutas = self.modelo.arcos()
+            rutas = list(zip(filas_rutas.tolist(), columnas_rutas.tolist()))
+            cantidad = {(i, j): LpVariable(f'Cantidad_Asignada_{programadores[i]}_{tareas[j]}', 0, None, LpInteger)
+                        for i, j in rutas}
+            
+            if solucion_inicial is not None:
+                (filas, columnas, cantidades), _ = self.calcular_solucion_inicial(solucion_inicial)
+                for i, j, valor in zip(filas.tolist(), columnas.tolist(), cantidades.tolist()):
+                    if (i, j) in cantidad:
+                        cantidad[i, j].setInitialValue(int(valor))
+            
+            # Definir la función objetivo (minimizar costo total)
+            self.prob += lpSum(cantidad[ruta] * costo for ruta, costo in zip(rutas, costos_rutas.tolist()))
+            
+            por_tarea = [[] for _ in range(self.num_tareas)]
+            por_programador = [[] for _ in range(self.num_programadores)]
+            for (i, j), variable in cantidad.items():
+                por_tarea[j].append(variable)
+                por_programador[i].append(variable)
+            
+            # Restricciones de demanda: cada tarea debe recibir exactamente la cantidad de programadores requeridos
+            for j, variables in enumerate(por_tarea):
+                self.prob += lpSum(variables) == int(self.demanda_tareas[j])
+                
+            # Restricciones de oferta: cada programador no puede exceder su capacidad máxima
+            for i, variables in enumerate(por_programador):
+                self.prob += lpSum(variables) <= int(self.capacidad_programadores[i])
+        self.tiempos['construccion_modelo'] = medida.segundos
         
         # Resolver el problema
-        self.prob.solve(PULP_CBC_CMD(msg=False))
-        
-        # Guardar las asignaciones y el costo total
-        self.asignaciones = []
-        for i in self.programadores:
-            for j in self.tareas:
-                if cantidad[i][j].value() > 0:
-                    for _ in range(int(cantidad[i][j].value())):
-                        self.asignaciones.append((i, j, self.costo_asignacion[i][j]))
-        
-        self.costo_total = value(self.prob.objective)
+        with self.instrumentacion.fase('resolucion') as medida:
+            self.prob.solve(PULP_CBC_CMD(msg=False, warmStart=solucion_inicial is not None))
+        self.tiempos['resolucion'] = medida.segundos
+        if LpStatus[self.prob.status] != 'Optimal':
+            raise RuntimeError(f"CBC no encontró una solución óptima: {LpStatus[self.prob.status]}")
+        
+        # Guardar las asignaciones y el costo total (se lee varValue una vez por variable)
+        with self.instrumentacion.fase('extraccion'):
+            valores = np.fromiter((variable.varValue or 0 for variable in cantidad.values()),
+                                  dtype=np.float64, count=len(rutas))
+            valores = np.rint(valores).astype(np.int64)
+            positivas = np.flatnonzero(valores > 0)
+            positivas = positivas[np.lexsort((columnas_rutas[positivas], filas_rutas[positivas]))]
+            filas, columnas = filas_rutas[positivas], columnas_rutas[positivas]
+            self._guardar_asignaciones(filas, columnas, valores[positivas])
+            self.costo_total = value(self.prob.objective)
         
         return self.asignaciones, self.costo_total
 
-    def generar_reporte(self):
+    def resolver_simplex_red(self, solucion_inicial='vogel'):
         """
-        Genera un reporte detallado de la optimización.
+        Resuelve el problema de asignación con el método simplex de redes, sin
+        construir un modelo de PuLP ni lanzar el proceso externo de CBC.
+        
+        Args:
+            solucion_inicial (str): Método constructivo que da la base inicial de la
+                fase de mejora MODI ('esquina_noroeste', 'costo_minimo' o 'vogel')
         """
-        if self.asignaciones is None:
-            return "Debe resolver el problema primero."
+        self.tiempos = {}
+        self.heuristica = None
+        with self.instrumentacion.fase('solucion_inicial') as medida:
+            base, _ = self.calcular_solucion_inicial(solucion_inicial)
+        self.tiempos['solucion_inicial'] = medida.segundos
+        
+        with self.instrumentacion.fase('resolucion') as medida:
+            self.simplex = (SimplexTransporteDisperso if self.modelo.disperso else SimplexTransporte)(self.modelo)
+            filas, columnas, cantidades, self.costo_total = self.simplex.resolver(base)
+        self.tiempos['resolucion'] = medida.segundos
+        
+        with self.instrumentacion.fase('extraccion'):
+            self._guardar_asignaciones(filas, columnas, cantidades)
+        return self.asignaciones, self.costo_total
+
+    def resolver_heuristico(self, limite_segundos=10.0, heuristicas=('vogel', 'costo_minimo', 'voraz_aleatorio'),
+                            num_aleatorios=4, max_hilos=None, semilla=0):
+        """
+        Resuelve el problema de forma aproximada dentro de un límite de tiempo,
+        para instancias en las que el óptimo exacto tarda demasiado.
+        
+        Varias soluciones iniciales se calculan a la vez en un pool de hilos sobre
+        la misma matriz de costos (ver metodos_transporte.multiarranque) durante a
+        lo sumo la mitad del límite; si ninguna termina se parte de la esquina
+        noroeste. La mejor se mejora con pivotes del simplex de redes hasta llegar
+        al óptimo o agotar el tiempo, y se calcula una cota inferior dual del
+        costo óptimo (ver metodos_transporte.cota_inferior): una vez desde los
+        mínimos por columna antes de la búsqueda y, si no se llegó al óptimo,
+        otra desde los potenciales alcanzados, con su tiempo reservado del
+        límite. Los arranques, la cota y la brecha quedan en self.heuristica.
         
-        reporte = "REPORTE DE ASIGNACIÓN DE PROGRAMADORES A TAREAS\n"
-        reporte += "=" * 50 + "\n\n"
+        Args:
+            limite_segundos (float): Tiempo total para los arranques, la cota inferior y la
+                búsqueda local. En el modo disperso la búsqueda local puede pasarse del
+                límite si hace falta para vaciar las celdas prohibidas de la base inicial
+            heuristicas (tuple): Soluciones iniciales a ejecutar en paralelo
+            num_aleatorios (int): Arranques voraces aleatorizados ('voraz_aleatorio')
+            max_hilos (int, opcional): Hilos del pool; por defecto, uno por CPU. Se reducen si
+                no caben en la mitad de la memoria libre (ver multiarranque)
+            semilla (int): Semilla de los arranques aleatorizados
+        """
+        if limite_segundos <= 0:
+            raise ValueError("El límite de tiempo debe ser positivo.")
+        inicio = time.perf_counter()
+        plazo = inicio + limite_segundos
+        self.tiempos = {}
+        self.heuristica = None
+        with self.instrumentacion.fase('solucion_inicial') as medida:
+            # Los arranques tienen hasta la mitad del tiempo; el resto queda para la cota y la búsqueda local
+            arranques = multiarranque(self.modelo, heuristicas, num_aleatorios, max_hilos, semilla,
+                                      inicio + limite_segundos / 2)
+        self.tiempos['solucion_inicial'] = medida.segundos
+        
+        with self.instrumentacion.fase('cota_inferior') as medida:
+            cota = cota_inferior(self.modelo)
+        # La cota desde los potenciales finales recorre los mismos costos: se le reserva el mismo tiempo
+        reserva_cota = medida.segundos
+        self.tiempos['cota_inferior'] = medida.segundos
+        
+        nombre, base, _ = arranques[0]
+        with self.instrumentacion.fase('busqueda_local') as medida:
+            self.simplex = (SimplexTransporteDisperso if self.modelo.disperso else SimplexTransporte)(self.modelo)
+            self.simplex.cargar_base(base)
+            pivotes = self.simplex.optimizar(plazo=plazo - reserva_cota)
+            # Con flujo en celdas prohibidas la solución no es factible: se sigue pivoteando
+            # de a tramos, aunque se pase el plazo, hasta vaciarlas (o llegar al óptimo)
+            while not self.simplex.es_optima and self._flujo_prohibido():
+                pivotes += self.simplex.optimizar(plazo=time.perf_counter() + limite_segundos / 10)
+        self.tiempos['busqueda_local'] = medida.segundos
+        
+        with self.instrumentacion.fase('extraccion'):
+            filas, columnas, cantidades, self.costo_total = self.simplex.solucion()
+            self._guardar_asignaciones(filas, columnas, cantidades)
+        
+        if self.simplex.es_optima:
+            # Sin costos reducidos negativos la solución es óptima
+            cota = max(cota, self.costo_total)
+        elif not self._flujo_prohibido():
+            # Los potenciales de una base lejos del óptimo pueden dar una cota peor que la
+            # de los mínimos por columna: se usa la mejor de las dos
+            with self.instrumentacion.fase('cota_inferior') as medida:
+                cota = max(cota, cota_inferior(self.modelo, self.simplex.potenciales[:self.modelo.m]))
+            self.tiempos['cota_inferior'] += medida.segundos
+        
+        brecha = max(0.0, self.costo_total - cota)
+        self.heuristica = {
+            'arranques': {nombre_arranque: costo for nombre_arranque, _, costo in arranques},
+            'mejor_arranque': nombre,
+            'pivotes': pivotes,
+            'optima': bool(self.simplex.es_optima),
+            'cota_inferior': cota,
+            'brecha': brecha,
+            'brecha_relativa': brecha / max(abs(self.costo_total), 1.0)
+        }
+        return self.asignaciones, self.costo_total
+
+    def _flujo_prohibido(self):
+        """Indica si la base actual del simplex envía flujo por alguna celda prohibida."""
+        if not self.modelo.disperso:
+            return False
+        filas, columnas, cantidades = self.simplex.celdas_basicas()
+        return bool((cantidades[~self.modelo.permitidas(filas, columnas)] > 0).any())
+
+    def resolver_highs(self):
+        """
+        Resuelve el problema como programa lineal en forma matricial con HiGHS.
         
-        reporte += "RESUMEN:\n"
-        reporte += f"- Número de programadores: {self.num_programadores}\n"
-        reporte += f"- Número de tareas: {self.num_tareas}\n"
-        reporte += f"- Costo total mínimo: {self.costo_total}\n\n"
+        La matriz de restricciones se construye en formato disperso directamente
+        desde arreglos de NumPy; los tiempos de construcción del modelo y de
+        resolución quedan por separado en self.tiempos.
+        """
+        self.simplex = None
+        self.tiempos = {}
+        self.heuristica = None
+        with self.instrumentacion.fase('construccion_modelo') as medida:
+            matrices = construir_modelo_matricial(self.modelo)
+        self.tiempos['construccion_modelo'] = medida.segundos
+        
+        with self.instrumentacion.fase('resolucion') as medida:
+            filas, columnas, cantidades, self.costo_total = resolver_modelo_matricial(self.modelo, matrices)
+        self.tiempos['resolucion'] = medida.segundos
+        
+        with self.instrumentacion.fase('extraccion'):
+            self._guardar_asignaciones(filas, columnas, cantidades)
+        return self.asignaciones, self.costo_total
+
+    def actualizar_costos(self, i, j, valor):
+        """
+        Cambia el costo de una o varias celdas y vuelve a optimizar partiendo de la
+        base y los potenciales de la última resolución con simplex de redes. Si no
+        la hay, se resuelve desde cero con ese método. En el modo disperso solo se
+        pueden cambiar arcos permitidos; si el cambio sube la penalización de las
+        celdas prohibidas, también se resuelve desde cero.
         
-        reporte += "ASIGNACIONES DETALLADAS:\n"
-        reporte += "-" * 50 + "\n"
-        reporte += f"{'Programador':<15} | {'Tarea':<15} | {'Costo':<10}\n"
-        reporte += "-" * 50 + "\n"
+        Args:
+            i, j: Programador(es) y tarea(s) de las celdas a cambiar (enteros o arreglos)
+            valor: Costo(s) nuevo(s)
+            
+        Returns:
+            tuple: (asignaciones, costo_total)
+        """
+        penalizacion = self.modelo.penalizacion
+        filas, columnas, diferencias = self.modelo.actualizar_costos(i, j, valor)
+        self.matriz_costos = self.modelo.costos
+        if self.simplex is None or self.modelo.penalizacion != penalizacion:
+            return self.resolver_simplex_red()
+        
+        self.tiempos = {}
+        self.heuristica = None
+        with self.instrumentacion.fase('reoptimizacion') as medida:
+            self.simplex.reoptimizar_costos(filas, columnas, diferencias)
+        self.tiempos['reoptimizacion'] = medida.segundos
+        return self._guardar_solucion_simplex()
+
+    def actualizar_demanda(self, j, demanda):
+        """
+        Cambia la demanda de la tarea j y vuelve a optimizar desde la base anterior
+        con pivotes del simplex dual (la diferencia la absorbe la fila o columna
+        ficticia). Si el cambio altera el balanceo (aparece la celda ficticia o
+        cambia de lado) se vuelve a balancear y se resuelve desde cero.
         
-        for prog, tarea, costo in self.asignaciones:
-            reporte += f"{prog:<15} | {tarea:<15} | {costo:<10.2f}\n"
+        Returns:
+            tuple: (asignaciones, costo_total)
+        """
+        diferencia = self.modelo.actualizar_demanda(j, demanda)
+        # Una columna más de demanda se compensa con menos demanda ficticia o más oferta ficticia
+        return self._reoptimizar_cantidad(diferencia, self.modelo.m + j, -1 if self.modelo.columna_ficticia else 1,
+                                          demanda_tarea=(j, demanda))
+
+    def actualizar_capacidad(self, i, capacidad):
+        """
+        Cambia la capacidad del programador i y vuelve a optimizar desde la base
+        anterior (ver actualizar_demanda).
         
-        reporte += "-" * 50 + "\n\n"
+        Returns:
+            tuple: (asignaciones, costo_total)
+        """
+        diferencia = self.modelo.actualizar_oferta(i, capacidad)
+        # Una fila con más oferta se compensa con más demanda ficticia o menos oferta ficticia
+        return self._reoptimizar_cantidad(diferencia, i, 1 if self.modelo.columna_ficticia else -1,
+                                          capacidad_programador=(i, capacidad))
+
+    def _reoptimizar_cantidad(self, diferencia, nodo, signo_ficticio, demanda_tarea=None, capacidad_programador=None):
+        """Aplica un cambio de oferta o demanda de forma incremental o, si no se puede, desde cero."""
+        if diferencia is None:
+            # El balanceo cambia de estructura: se arma un modelo nuevo con los vectores reales
+            oferta = self.modelo.oferta_real.copy()
+            demanda = self.modelo.demanda_real.copy()
+            if demanda_tarea is not None:
+                demanda[demanda_tarea[0]] = demanda_tarea[1]
+            if capacidad_programador is not None:
+                oferta[capacidad_programador[0]] = capacidad_programador[1]
+            self.matriz_costos, self.capacidad_programadores, self.demanda_tareas = self.modelo.costos, oferta, demanda
+            self.balancear_oferta_demanda()
+            return self.resolver_simplex_red()
+        if self.simplex is None:
+            return self.resolver_simplex_red()
+        
+        self.tiempos = {}
+        self.heuristica = None
+        with self.instrumentacion.fase('reoptimizacion') as medida:
+            nodo_ficticio = self.modelo.m + self.modelo.n - 1 if self.modelo.columna_ficticia else self.modelo.m - 1
+            self.simplex.reoptimizar_cantidades(nodo, nodo_ficticio, signo_ficticio, diferencia)
+        self.tiempos['reoptimizacion'] = medida.segundos
+        return self._guardar_solucion_simplex()
+
+    def _guardar_solucion_simplex(self):
+        """Guarda como asignaciones la solución actual del simplex de redes."""
+        with self.instrumentacion.fase('extraccion'):
+            filas, columnas, cantidades, self.costo_total = self.simplex.solucion()
+            self._guardar_asignaciones(filas, columnas, cantidades)
+        return self.asignaciones, self.costo_total
+
+    def _guardar_asignaciones(self, filas, columnas, cantidades):
+        """
+        Guarda las asignaciones como matriz de flujo dispersa. Iterar sobre
+        self.asignaciones sigue produciendo una tupla (programador, tarea, costo)
+        por unidad, pero solo cuando se recorre.
+        """
+        self.asignaciones = AsignacionesDispersas(filas, columnas, cantidades, self.modelo.valores(filas, columnas),
+                                                  self.etiqueta_programador, self.etiqueta_tarea)
+        self._reporte = None
+
+    def resolver(self, metodo='simplex_red', solucion_inicial='vogel', limite_segundos=None):
+        """
+        Resuelve el problema con el motor indicado.
         
-        # Análisis por programador
-        reporte += "ANÁLISIS POR PROGRAMADOR:\n"
-        reporte += "-" * 50 + "\n"
+        Si el problema tiene caché, se consulta antes de resolver con cualquiera de
+        los motores. La clave incluye el motor y sus opciones además de los costos,
+        la oferta y la demanda: con soluciones óptimas alternativas cada motor
+        puede devolver una distinta, y la del modo heurístico depende del límite.
         
-        prog_stats = {}
-        for prog, tarea, costo in self.asignaciones:
-            if prog not in prog_stats:
-                prog_stats[prog] = {"tareas": 0, "costo_total": 0}
-            prog_stats[prog]["tareas"] += 1
-            prog_stats[prog]["costo_total"] += costo
+        Args:
+            metodo (str): 'pulp' (modelo entero con CBC), 'simplex_red' (simplex de redes en proceso),
+                'highs' (programa lineal en forma matricial) o 'heuristico' (multiarranque con
+                búsqueda local acotada en tiempo, ver resolver_heuristico)
+            solucion_inicial (str): Método constructivo de arranque; con PuLP se usa como
+                warm start solo si se indica explícitamente (el modo heurístico usa varios)
+            limite_segundos (float, opcional): Límite de tiempo del modo heurístico
+            
+        Returns:
+            tuple: (asignaciones, costo_total)
+        """
+        if metodo not in METODOS_RESOLUCION:
+            raise ValueError(f"Método de resolución desconocido: {metodo}")
+        
+        clave = None
+        if self.cache is not None:
+            with self.instrumentacion.fase('cache') as medida:
+                clave = self.cache.clave(metodo, solucion_inicial, limite_segundos,
+                                         self.modelo.costos, self.modelo.oferta, self.modelo.demanda)
+                solucion = self.cache.obtener(clave)
+                if solucion is not None:
+                    # Sin simplex guardado, las actualizaciones incrementales resuelven desde cero
+                    self.simplex = None
+                    self.heuristica = json.loads(solucion['heuristica'].item()) if 'heuristica' in solucion else None
+                    self._guardar_asignaciones(solucion['filas'], solucion['columnas'], solucion['cantidades'])
+                    self.costo_total = float(solucion['costo_total'])
+            if solucion is not None:
+                self.tiempos = {'cache': medida.segundos}
+                return self.asignaciones, self.costo_total
+        
+        if metodo == 'pulp':
+            self.resolver_pulp(solucion_inicial)
+        elif metodo == 'simplex_red':
+            self.resolver_simplex_red(solucion_inicial)
+        elif metodo == 'highs':
+            self.resolver_highs()
+        elif limite_segundos is None:
+            self.resolver_heuristico()
+        else:
+            self.resolver_heuristico(limite_segundos)
+        
+        if clave is not None:
+            solucion = {'filas': self.asignaciones.filas, 'columnas': self.asignaciones.columnas,
+                        'cantidades': self.asignaciones.cantidades, 'costo_total': self.costo_total}
+            if self.heuristica is not None:
+                solucion['heuristica'] = json.dumps(self.heuristica)
+            self.cache.guardar(clave, solucion)
+        return self.asignaciones, self.costo_total
+
+    def resultado(self, incluir_asignaciones=True):
+        """
+        Resumen de la última resolución como diccionario serializable a JSON. Los
+        índices iguales a num_programadores o num_tareas reales corresponden a la
+        fila o columna ficticia del balanceo.
         
-        for prog, stats in prog_stats.items():
-            reporte += f"{prog}: {stats['tareas']} tareas asignadas, costo total: {stats['costo_total']:.2f}\n"
+        Args:
+            incluir_asignaciones (bool): Si es False se omiten las listas de
+                asignaciones (por ejemplo, cuando se exportan aparte)
+        """
+        if self.asignaciones is None:
+            return None
+        resultado = {
+            'costo_total': float(self.costo_total),
+            'num_programadores': self.modelo.num_filas_reales,
+            'num_tareas': self.modelo.num_columnas_reales,
+            'fila_ficticia': bool(self.modelo.fila_ficticia),
+            'columna_ficticia': bool(self.modelo.columna_ficticia),
+            'disperso': bool(self.modelo.disperso),
+            'tiempos': dict(self.tiempos),
+            'instrumentacion': self.instrumentacion.a_diccionario()
+        }
+        if self.heuristica is not None:
+            resultado['heuristica'] = dict(self.heuristica)
+        if incluir_asignaciones:
+            resultado['asignaciones'] = self.asignaciones.a_diccionario()
+        return resultado
+
+    def columnas_resultado(self):
+        """
+        Asignaciones como columnas de NumPy (una fila por celda con flujo), para
+        exportarlas sin pasar por objetos de Python (ver exportacion_resultados).
+        """
+        if self.asignaciones is None:
+            return None
+        return {
+            'programador': self.asignaciones.filas,
+            'tarea': self.asignaciones.columnas,
+            'cantidad': self.asignaciones.cantidades,
+            'costo': self.asignaciones.costos
+        }
+
+    def lineas_reporte(self, tamano_bloque=10000):
+        """
+        Genera el reporte detallado por bloques de texto, de modo que pueda
+        escribirse en un archivo sin armar antes la cadena completa. Las
+        asignaciones se formatean de a tamano_bloque celdas y los totales por
+        programador y por tarea se agregan con np.bincount.
+        """
+        if self.asignaciones is None:
+            yield "Debe resolver el problema primero."
+            return
+        
+        if self.heuristica is None or self.heuristica['optima']:
+            costo = f"- Costo total mínimo: {self.costo_total}\n\n"
+        else:
+            costo = (f"- Costo total (heurístico): {self.costo_total}\n"
+                     f"- Cota inferior: {self.heuristica['cota_inferior']} "
+                     f"(brecha {100 * self.heuristica['brecha_relativa']:.2f}%)\n\n")
+        yield ("REPORTE DE ASIGNACIÓN DE PROGRAMADORES A TAREAS\n"
+               + "=" * 50 + "\n\n"
+               + "RESUMEN:\n"
+               + f"- Número de programadores: {self.num_programadores}\n"
+               + f"- Número de tareas: {self.num_tareas}\n"
+               + costo
+               + "ASIGNACIONES DETALLADAS:\n"
+               + "-" * 60 + "\n"
+               + f"{'Programador':<20} | {'Tarea':<15} | {'Cantidad':<8} | {'Costo':<10}\n"
+               + "-" * 60 + "\n")
+        
+        # Las etiquetas ya alineadas se arman una vez por programador y por tarea
+        programadores = [f"{etiqueta:<20}" for etiqueta in self.programadores]
+        tareas = [f"{etiqueta:<15}" for etiqueta in self.tareas]
+        asignaciones = self.asignaciones
+        for inicio in range(0, asignaciones.num_celdas, tamano_bloque):
+            fin = inicio + tamano_bloque
+            # El formato con % sobre tuplas es bastante más rápido que una f-string por línea
+            yield "".join(["%s | %s | %-8d | %-10.2f\n" % fila
+                           for fila in zip([programadores[i] for i in asignaciones.filas[inicio:fin].tolist()],
+                                           [tareas[j] for j in asignaciones.columnas[inicio:fin].tolist()],
+                                           asignaciones.cantidades[inicio:fin].tolist(),
+                                           asignaciones.costos[inicio:fin].tolist())])
         
-        reporte += "-" * 50 + "\n\n"
+        # Análisis por programador
+        yield "-" * 60 + "\n\n" + "ANÁLISIS POR PROGRAMADOR:\n" + "-" * 60 + "\n"
+        cantidades, costos = asignaciones.totales_por_fila(self.num_programadores)
+        activos = np.flatnonzero(cantidades)
+        yield "".join(f"{self.etiqueta_programador(i)}: {cantidad} tareas asignadas, costo total: {costo:.2f}\n"
+                      for i, cantidad, costo in zip(activos.tolist(), cantidades[activos].tolist(),
+                                                    costos[activos].tolist()))
         
         # Análisis por tarea
-        reporte += "ANÁLISIS POR TAREA:\n"
-        reporte += "-" * 50 + "\n"
-        
-        tarea_stats = {}
-        for prog, tarea, costo in self.asignaciones:
-            if tarea not in tarea_stats:
-                tarea_stats[tarea] = {"programadores": 0, "costo_total": 0}
-            tarea_stats[tarea]["programadores"] += 1
-            tarea_stats[tarea]["costo_total"] += costo
-        
-        for tarea, stats in tarea_stats.items():
-            reporte += f"{tarea}: {stats['programadores']} programadores asignados, costo total: {stats['costo_total']:.2f}\n"
-        
-        return reporte
+        yield "-" * 60 + "\n\n" + "ANÁLISIS POR TAREA:\n" + "-" * 60 + "\n"
+        cantidades, costos = asignaciones.totales_por_columna(self.num_tareas)
+        activas = np.flatnonzero(cantidades)
+        for inicio in range(0, len(activas), tamano_bloque):
+            bloque = activas[inicio:inicio + tamano_bloque]
+            yield "".join(f"{self.etiqueta_tarea(j)}: {cantidad} programadores asignados, costo total: {costo:.2f}\n"
+                          for j, cantidad, costo in zip(bloque.tolist(), cantidades[bloque].tolist(),
+                                                        costos[bloque].tolist()))
+
+    def generar_reporte(self):
+        """
+        Genera un reporte detallado de la optimización. Se arma una sola vez y
+        se guarda hasta que cambien las asignaciones.
+        """
+        if self.asignaciones is None:
+            return "Debe resolver el problema primero."
+        if self._reporte is None:
+            with self.instrumentacion.fase('reporte'):
+                self._reporte = "".join(self.lineas_reporte())
+        return self._reporte
 
+    def escribir_reporte(self, archivo):
+        """
+        Escribe el reporte detallado en un objeto tipo archivo a medida que se
+        genera (o el ya generado, si existe).
+        """
+        if self._reporte is not None or self.asignaciones is None:
+            archivo.write(self.generar_reporte())
+            return
+        bloques = []
+        with self.instrumentacion.fase('reporte'):
+            for bloque in self.lineas_reporte():
+                archivo.write(bloque)
+                bloques.append(bloque)
+        self._reporte = "".join(bloques)
 
 
+
+def resolver_archivo(ruta, metodo='simplex_red', solucion_inicial='vogel', instrumentacion=None, exportar=None,
+                     limite_segundos=None):
+    """
+    Lee una instancia desde archivo y la resuelve sin interacción por consola.
+    
+    Args:
+        ruta (str): Archivo con el formato de MainProgramadores.leer_datos_archivo
+        metodo (str): Motor de resolución (ver AsignacionProgramadoresTareas.resolver)
+        solucion_inicial (str): Método constructivo de arranque
+        instrumentacion (Instrumentacion, opcional): Para activar el perfil de cProfile
+            o la medición de memoria; por defecto solo se miden tiempos
+        exportar (str, opcional): Archivo .jsonl, .csv, .parquet o .arrow donde exportar
+            las asignaciones (ver exportacion_resultados); el resultado las omite
+        limite_segundos (float, opcional): Límite de tiempo del método 'heuristico'
+        
+    Returns:
+        dict: Resultado de AsignacionProgramadoresTareas.resultado con la ruta y el método
+    """
+    instrumentacion = instrumentacion or Instrumentacion()
+    with instrumentacion.fase('lectura'):
+        N, M, C, S, D = MainProgramadores().leer_datos_archivo(ruta)
+    problema = AsignacionProgramadoresTareas(N, M, C, S, D, instrumentacion=instrumentacion)
+    problema.resolver(metodo, solucion_inicial, limite_segundos)
+    
+    resultado = {'archivo': str(ruta), 'metodo': metodo}
+    if exportar is None:
+        resultado.update(problema.resultado())
+        return resultado
+    
+    from exportacion_resultados import exportar_resultado
+    resultado.update(problema.resultado(incluir_asignaciones=False))
+    resultado['exportado'] = exportar_resultado(problema, exportar)
+    return resultado
+
 class MainProgramadores:
     def __init__(self):
         pass
@@ -301,85 +751,12 @@ class MainProgramadores:
         return N, M, C, S, D
 
     def leer_datos_archivo(self,ruta):
-        
+        """
+        Lee la instancia línea por línea directamente en arreglos de NumPy
+        (ver lectura_instancias.leer_instancia_programadores).
+        """
         try:
-            with open(ruta, 'r') as f:
-                lineas = [line.strip() for line in f.readlines() if line.strip()]
-                
-                if len(lineas) < 2:
-                    raise ValueError("El archivo debe contener al menos 2 líneas (N y M).")
-                    
-                try:
-                    N = int(lineas[0])  # Número de programadores
-                    if N <= 0:
-                        raise ValueError("El número de programadores (N) debe ser un entero positivo.")
-                except ValueError:
-                    raise ValueError("La primera línea debe contener un entero positivo (N).")
-                    
-                try:
-                    M = int(lineas[1])  # Número de tareas
-                    if M <= 0:
-                        raise ValueError("El número de tareas (M) debe ser un entero positivo.")
-                except ValueError:
-                    raise ValueError("La segunda línea debe contener un entero positivo (M).")
-                
-                # Verificar que haya suficientes líneas en el archivo
-                if len(lineas) < 2 + N + 2:  # N+M+2 líneas (N, M, matriz NxM, S, D)
-                    raise ValueError(f"El archivo debe contener al menos {2 + N + 2} líneas.")
-                
-                # Leer matriz de costos
-                C = []
-                for i in range(2, 2 + N):
-                    try:
-                        if i >= len(lineas):
-                            raise ValueError(f"Faltan líneas en el archivo para la matriz de costos.")
-                        
-                        fila = list(map(float, lineas[i].split()))
-                        if len(fila) != M:
-                            raise ValueError(f"La fila {i-2} de la matriz de costos tiene {len(fila)} valores, se esperaban {M}.")
-                        
-                        # Verificar que todos los valores sean no negativos
-                        if any(x < 0 for x in fila):
-                            raise ValueError(f"La fila {i-2} de la matriz de costos contiene valores negativos.")
-                            
-                        C.append(fila)
-                    except ValueError as e:
-                        if "could not convert string to float" in str(e):
-                            raise ValueError(f"La fila {i-2} de la matriz de costos contiene valores no numéricos.")
-                        else:
-                            raise e
-                
-                # Leer capacidades de programadores
-                try:
-                    S = list(map(int, lineas[2 + N].split()))
-                    if len(S) != N:
-                        raise ValueError(f"Se esperaban {N} valores para las capacidades de los programadores.")
-                    
-                    # Verificar que todos los valores sean positivos
-                    if any(x <= 0 for x in S):
-                        raise ValueError("Las capacidades de los programadores deben ser enteros positivos.")
-                except ValueError as e:
-                    if "invalid literal for int" in str(e):
-                        raise ValueError("Las capacidades de los programadores deben ser enteros.")
-                    else:
-                        raise e
-                
-                # Leer demandas de tareas
-                try:
-                    D = list(map(int, lineas[3 + N].split()))
-                    if len(D) != M:
-                        raise ValueError(f"Se esperaban {M} valores para las demandas de las tareas.")
-                    
-                    # Verificar que todos los valores sean positivos
-                    if any(x <= 0 for x in D):
-                        raise ValueError("Las demandas de las tareas deben ser enteros positivos.")
-                except ValueError as e:
-                    if "invalid literal for int" in str(e):
-                        raise ValueError("Las demandas de las tareas deben ser enteros.")
-                    else:
-                        raise e
-                
-                return N, M, C, S, D
+            return leer_instancia_programadores(ruta)
         except Exception as e:
             raise ValueError(f"Error al leer el archivo: {str(e)}")
 
@@ -409,34 +786,55 @@ class MainProgramadores:
             # Seleccionar método de resolución
             print("\nSeleccione el método de resolución inicial:")
             print("1. Resolver metodo de transporte con PuLP")
+            print("2. Esquina Noroeste + mejora con simplex de redes (MODI)")
+            print("3. Costo Mínimo + mejora con simplex de redes (MODI)")
+            print("4. Aproximación de Vogel + mejora con simplex de redes (MODI)")
+            print("5. Programa lineal en forma matricial con HiGHS")
             
-            metodo = self.validar_opcion("Seleccione una opción (1): ", ['1'])
+            metodo = self.validar_opcion("Seleccione una opción (1-5): ", ['1', '2', '3', '4', '5'])
             
             if metodo == '1':
                 print("\nResolviendo directamente con PuLP...")
-            
-            # Resolver con PuLP
-            asignaciones, costo_total = problema.resolver_pulp()
+                asignaciones, costo_total = problema.resolver('pulp', solucion_inicial=None)
+            elif metodo == '5':
+                print("\nResolviendo con HiGHS...")
+                asignaciones, costo_total = problema.resolver('highs')
+            else:
+                solucion_inicial = {'2': 'esquina_noroeste', '3': 'costo_minimo', '4': 'vogel'}[metodo]
+                _, costo_inicial = problema.calcular_solucion_inicial(solucion_inicial)
+                print(f"\nCosto de la solución inicial: {costo_inicial}")
+                print("Mejorando con el método simplex de redes...")
+                asignaciones, costo_total = problema.resolver('simplex_red', solucion_inicial)
             
             # Mostrar resultados
             print("\n=== RESULTADOS DE LA OPTIMIZACIÓN ===")
             print(f"Costo total mínimo: {costo_total}")
             print(f"Número total de asignaciones: {len(asignaciones)}")
+            for fase, segundos in problema.tiempos.items():
+                print(f"Tiempo de {fase.replace('_', ' ')}: {segundos:.4f} s")
             
             # Preguntar si se desea ver el reporte detallado
             ver_reporte = self.validar_opcion("\n¿Desea ver el reporte detallado? (s/n): ", ['s', 'n'])
             if ver_reporte.lower() == 's':
-                reporte = problema.generar_reporte()
-                print("\n" + reporte)
+                print()
+                problema.escribir_reporte(sys.stdout)
             
             # Preguntar si se desea guardar el reporte
             guardar_reporte = self.validar_opcion("\n¿Desea guardar el reporte en un archivo? (s/n): ", ['s', 'n'])
             if guardar_reporte.lower() == 's':
                 nombre_archivo = input("Ingrese el nombre del archivo (sin extensión): ")
                 with open(f"{nombre_archivo}.txt", 'w') as f:
-                    f.write(problema.generar_reporte())
+                    problema.escribir_reporte(f)
                 print(f"Reporte guardado en {nombre_archivo}.txt")
             
+            # Preguntar si se desean exportar las asignaciones en un formato tabular
+            exportar = self.validar_opcion("\n¿Desea exportar las asignaciones (JSON Lines, CSV, Parquet)? (s/n): ", ['s', 'n'])
+            if exportar.lower() == 's':
+                from exportacion_resultados import exportar_resultado
+                ruta = input("Ingrese el nombre del archivo (.jsonl, .csv, .parquet o .arrow): ")
+                for escrito in exportar_resultado(problema, ruta):
+                    print(f"Archivo guardado en {escrito}")
+            
         except Exception as e:
             print(f"Error: {str(e)}")
 
@@ -1,173 +1,1356 @@
 import numpy as np
-from scipy.optimize import linear_sum_assignment
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 import os
+import sys
+import time
+from instrumentacion import Instrumentacion
+from lectura_instancias import leer_instancia_servidores
+from metodos_transporte import AsignacionesDispersas, SimplexTransporteDisperso, costo_minimo, crear_modelo
+
+def contar_inversiones(prioridades, costos):
+    """
+    Cuenta, para cada solicitud, cuántas solicitudes de menor prioridad (valor
+    estrictamente mayor) tienen un costo estrictamente menor.
+    
+    Las solicitudes se ordenan por (prioridad, costo) y se cuentan las inversiones
+    de costo con un merge sort por niveles: en cada nivel, cada elemento de una
+    mitad izquierda busca con searchsorted cuántos elementos de la mitad derecha
+    de su bloque son menores. Total O(R log² R) en operaciones de NumPy.
+    
+    Args:
+        prioridades (array): Prioridad de cada solicitud
+        costos (array): Costo asignado a cada solicitud
+        
+    Returns:
+        array: Número de pares violados en los que participa cada solicitud como
+            la de mayor prioridad
+    """
+    total = len(costos)
+    orden = np.lexsort((costos, prioridades))
+    rangos = np.searchsorted(np.unique(costos), costos)[orden] # Empates de costo comparten rango
+    base = int(rangos.max()) + 1 if total else 1
+    
+    conteo = np.zeros(total, dtype=np.int64) # Indexado por posición en el orden (prioridad, costo)
+    posiciones = np.arange(total)
+    indices = np.arange(total)
+    ancho = 1
+    while ancho < total:
+        bloques = indices // (2 * ancho)
+        derecha = (indices // ancho) % 2 == 1
+        claves = bloques * base + rangos
+        
+        # Cada mitad está ordenada por costo, así que las claves de las mitades derechas ya están ordenadas
+        claves_derecha = claves[derecha]
+        izquierda = ~derecha
+        conteo[posiciones[izquierda]] += (np.searchsorted(claves_derecha, claves[izquierda])
+                                          - np.searchsorted(claves_derecha, bloques[izquierda] * base))
+        
+        # Mezclar las dos mitades de cada bloque
+        mezcla = np.argsort(claves, kind='stable')
+        rangos = rangos[mezcla]
+        posiciones = posiciones[mezcla]
+        ancho *= 2
+    
+    resultado = np.empty(total, dtype=np.int64)
+    resultado[orden] = conteo
+    return resultado
+
+def listar_inversiones(prioridades, costos, conteo, maximo=None):
+    """
+    Enumera los pares (i, j) en los que la solicitud i tiene mayor prioridad
+    (valor menor) que j pero un costo estrictamente mayor.
+    
+    Solo se recorren las solicitudes con conteo positivo, cada una con una
+    pasada vectorizada sobre todas las solicitudes, y el recorrido se corta al
+    llegar a maximo pares: con un máximo el costo es O(maximo · R).
+    
+    Args:
+        prioridades (array): Prioridad de cada solicitud
+        costos (array): Costo asignado a cada solicitud
+        conteo (array): Resultado de contar_inversiones para los mismos datos
+        maximo (int, opcional): Número máximo de pares a devolver
+        
+    Returns:
+        array: Matriz K x 2 de índices (i, j), ordenada por i y luego por j
+    """
+    prioridades = np.asarray(prioridades)
+    costos = np.asarray(costos)
+    restantes = int(conteo.sum()) if maximo is None else maximo
+    pares = []
+    for i in np.flatnonzero(conteo).tolist():
+        if restantes <= 0:
+            break
+        menores = np.flatnonzero((prioridades > prioridades[i]) & (costos < costos[i]))[:restantes]
+        pares.append(np.column_stack([np.full(menores.size, i), menores]))
+        restantes -= menores.size
+    return np.concatenate(pares) if pares else np.zeros((0, 2), dtype=np.int64)
+
+def _pesos_exactos(pesos, num_nodos):
+    """
+    Redondea pesos positivos a múltiplos de una potencia de dos elegida para que
+    cualquier suma de a lo sumo num_nodos de ellos sea exacta en float64. El
+    emparejamiento disperso de SciPy (LAPJVsp) puede quedar en un ciclo infinito
+    por errores de redondeo (por ejemplo, con costos divididos por 3); con
+    aritmética exacta eso no ocurre. El error relativo es del orden de 2^-40.
+    """
+    bits = 52 - int(np.ceil(np.log2(num_nodos + 1))) - int(np.ceil(np.log2(pesos.max() + 1)))
+    escala = 2.0 ** bits
+    return np.maximum(np.rint(pesos * escala), 1.0) / escala
+
+def _dijkstra_denso(reducidos, origen, patrones):
+    """
+    Caminos más cortos desde un nodo sobre una matriz densa de costos no
+    negativos (np.inf donde no hay arco) con el Dijkstra compilado de SciPy.
+
+    El grafo entre servidores es casi completo, así que se pasa como un CSR con
+    todas las celdas: el patrón (indptr, indices) se arma una vez por tamaño y se
+    guarda en patrones, de modo que solo cambian los datos. Los arcos ausentes
+    quedan con costo np.inf y nunca mejoran una distancia; pasar la matriz densa
+    no sirve porque SciPy toma los costos cero como arcos ausentes.
+
+    Returns:
+        tuple: (distancias, predecesores); los nodos inalcanzables tienen distancia
+            np.inf y predecesor negativo
+    """
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra
+
+    n = len(reducidos)
+    patron = patrones.get(n)
+    if patron is None:
+        patron = (np.arange(0, n * n + 1, n, dtype=np.int32), np.tile(np.arange(n, dtype=np.int32), n))
+        patrones[n] = patron
+    grafo = csr_matrix((np.ascontiguousarray(reducidos).ravel(), patron[1], patron[0]), shape=(n, n))
+    return dijkstra(grafo, indices=origen, return_predecessors=True)
+
+def precios_por_capacidad(costos, capacidades, servidor, cargas, max_rondas=20):
+    """
+    Reparte las solicitudes respetando casi todas las capacidades con precios
+    por servidor, en rondas vectorizadas de O(R · S).
+
+    Cada solicitud está siempre en un servidor que minimiza costo + precio. En
+    cada ronda, a cada servidor con exceso se le sube el precio lo justo para
+    que salgan tantas solicitudes como le sobran, cada una hacia su mejor
+    alternativa. Un precio solo sube mientras el servidor tiene exceso, así que
+    un servidor con precio positivo nunca queda con lugares libres. Los empates
+    se rompen a favor de los servidores con lugar libre, lo que no cambia el
+    costo. Las rondas se cortan cuando dejan de reducir el exceso; el exceso que
+    quede lo resuelve caminos_por_capacidad.
+
+    Args:
+        costos (array): Matriz S x R de costos
+        capacidades (array): Lugares enteros de cada servidor
+        servidor (array): Servidor de cada solicitud; se actualiza en el lugar
+        cargas (array): Solicitudes de cada servidor; se actualiza en el lugar
+
+    Returns:
+        array: Precio de cada servidor
+    """
+    S = costos.shape[0]
+    precios = np.zeros(S)
+    exceso = int(np.maximum(cargas - capacidades, 0).sum())
+    for _ in range(max_rondas):
+        if exceso == 0:
+            break
+        orden = np.argsort(servidor, kind='stable')
+        limites = np.concatenate([[0], np.cumsum(np.bincount(servidor, minlength=S))])
+        llegadas = [[] for _ in range(S)] # Solicitudes que recibió cada servidor en esta ronda
+        for i in np.argsort(capacidades - cargas, kind='stable').tolist():
+            sobran = int(cargas[i] - capacidades[i])
+            if sobran <= 0:
+                continue
+            solicitudes = np.concatenate([orden[limites[i]:limites[i + 1]]] + llegadas[i])
+            con_precio = costos[:, solicitudes] + precios[:, None]
+            propio = con_precio[i].copy()
+            con_precio[i] = np.inf
+            minimo = con_precio.min(axis=0)
+            # Entre alternativas empatadas se prefiere un servidor con lugar libre, y entre
+            # brechas empatadas salen primero esas solicitudes: con costos enteros los empates
+            # son masivos y, si no, las solicitudes rebotan entre servidores llenos
+            empatadas = con_precio == minimo
+            con_lugar = empatadas & (cargas < capacidades)[:, None]
+            hay_lugar = con_lugar.any(axis=0)
+            alternativa = np.where(hay_lugar, con_lugar.argmax(axis=0), empatadas.argmax(axis=0))
+            brecha = minimo - propio
+            salen = np.lexsort((~hay_lugar, brecha))[:sobran]
+            precios[i] += brecha[salen].max()
+            destinos = alternativa[salen]
+            servidor[solicitudes[salen]] = destinos
+            cargas[i] -= sobran
+            cargas += np.bincount(destinos, minlength=S)
+            for destino in np.unique(destinos).tolist():
+                llegadas[destino].append(solicitudes[salen[destinos == destino]])
+        anterior, exceso = exceso, int(np.maximum(cargas - capacidades, 0).sum())
+        if exceso > 0.9 * anterior:
+            break
+    return precios
+
+class _GrafoServidores:
+    """
+    Grafo entre servidores para mover solicitudes: el arco x -> y cuesta lo
+    mínimo que cuesta mover alguna solicitud de x a y (como en AsignacionEnLinea).
+    Las solicitudes de cada servidor se guardan en arreglos con borrado por
+    intercambio con el último, y al mover una solicitud solo se recalculan los
+    arcos que dependían de ella.
+    """
+
+    def __init__(self, costos, servidor):
+        S, R = costos.shape
+        self.costos = costos
+        orden = np.argsort(servidor, kind='stable')
+        self.tamanos = np.bincount(servidor, minlength=S)
+        limites = np.concatenate([[0], np.cumsum(self.tamanos)])
+        self.listas = [np.concatenate([orden[limites[x]:limites[x + 1]], np.empty(16, dtype=np.int64)])
+                       for x in range(S)] # Solicitudes de cada servidor en sus primeras tamanos[x] posiciones
+        self.posicion = np.empty(R, dtype=np.int64) # Posición de cada solicitud en la lista de su servidor
+        self.posicion[orden] = np.arange(R) - np.repeat(limites[:-1], self.tamanos)
+        self.arcos = np.full((S, S), np.inf)
+        self.mover = np.full((S, S), -1, dtype=np.int64) # Solicitud que conviene mover de x a y
+        for x in range(S):
+            self._recalcular(x, np.arange(S))
+
+    def _recalcular(self, x, columnas):
+        solicitudes = self.listas[x][:self.tamanos[x]]
+        if solicitudes.size == 0:
+            self.arcos[x, columnas] = np.inf
+            self.mover[x, columnas] = -1
+        else:
+            diferencias = self.costos[np.ix_(columnas, solicitudes)] - self.costos[x, solicitudes]
+            mejores = diferencias.argmin(axis=1)
+            self.arcos[x, columnas] = diferencias[np.arange(columnas.size), mejores]
+            self.mover[x, columnas] = solicitudes[mejores]
+        self.arcos[x, x] = np.inf
+
+    def mover_solicitud(self, solicitud, origen, destino):
+        listas, posicion, tamanos = self.listas, self.posicion, self.tamanos
+        ultima = listas[origen][tamanos[origen] - 1]
+        listas[origen][posicion[solicitud]] = ultima
+        posicion[ultima] = posicion[solicitud]
+        tamanos[origen] -= 1
+        columnas = np.flatnonzero(self.mover[origen] == solicitud)
+        if columnas.size:
+            self._recalcular(origen, columnas)
+
+        if tamanos[destino] == len(listas[destino]):
+            listas[destino] = np.concatenate([listas[destino], np.empty(len(listas[destino]), dtype=np.int64)])
+        listas[destino][tamanos[destino]] = solicitud
+        posicion[solicitud] = tamanos[destino]
+        tamanos[destino] += 1
+        diferencias = self.costos[:, solicitud] - self.costos[destino, solicitud]
+        mejora = diferencias < self.arcos[destino]
+        mejora[destino] = False
+        self.arcos[destino, mejora] = diferencias[mejora]
+        self.mover[destino, mejora] = solicitud
+
+def caminos_por_capacidad(costos, capacidades, servidor, cargas, precios):
+    """
+    Termina la asignación de precios_por_capacidad con caminos aumentantes más
+    cortos sobre el grafo de S servidores: cada solicitud que sobra en un
+    servidor se mueve, quizá desplazando otras, hasta un servidor con lugar
+    libre. Los potenciales de Johnson parten de los precios, así que Dijkstra
+    trabaja con costos reducidos no negativos y cada camino cuesta O(S²) más
+    el recálculo de los arcos tocados. Como el punto de partida ya es óptimo
+    para sus propias cargas, el resultado es la asignación de costo mínimo.
+
+    Args:
+        servidor (array): Servidor de cada solicitud; se actualiza en el lugar
+        cargas (array): Solicitudes de cada servidor; se actualiza en el lugar
+        precios (array): Precios devueltos por precios_por_capacidad
+    """
+    S = costos.shape[0]
+    fuente, sumidero = S + 1, S
+    if not (cargas > capacidades).any():
+        return
+    grafo = _GrafoServidores(costos, servidor)
+    potenciales = np.append(-precios, 0.0)
+    reducidos = np.full((S + 2, S + 2), np.inf)
+    patrones = {}
+    while True:
+        con_exceso = np.flatnonzero(cargas > capacidades)
+        if con_exceso.size == 0:
+            return
+        # Servidores con lugar libre -> sumidero; fuente -> servidores con exceso, con costos
+        # reducidos no negativos
+        red = reducidos[:S + 1, :S + 1]
+        red[:S, :S] = grafo.arcos
+        red[:S, sumidero] = np.where(cargas < capacidades, 0.0, np.inf)
+        red += potenciales[:, None]
+        red -= potenciales
+        np.maximum(red, 0.0, out=red)
+        reducidos[fuente, con_exceso] = potenciales[con_exceso].max() - potenciales[con_exceso]
+        distancias, previo = _dijkstra_denso(reducidos, fuente, patrones)
+        reducidos[fuente] = np.inf
+        if not np.isfinite(distancias[sumidero]):
+            raise ValueError("No existe una asignación que respete las capacidades con costos finitos.")
+
+        camino = [int(previo[sumidero])]
+        while previo[camino[-1]] != fuente:
+            camino.append(int(previo[camino[-1]]))
+        camino.reverse()
+        movimientos = [(int(grafo.mover[origen, destino]), origen, destino)
+                       for origen, destino in zip(camino, camino[1:])]
+
+        potenciales += np.minimum(distancias[:S + 1], distancias[sumidero])
+        for solicitud, origen, destino in movimientos:
+            grafo.mover_solicitud(solicitud, origen, destino)
+            servidor[solicitud] = destino
+        cargas[camino[0]] -= 1
+        cargas[camino[-1]] += 1
+
+# Métodos aceptados por AsignacionSolicitudesServidores.resolver
+METODOS_RESOLUCION = ('hungaro', 'hungaro_replicado', 'flujo_costo_minimo')
+
+# Celdas máximas de la matriz replicada de resolver_hungaro_replicado (160 MB en float64);
+# por encima se resuelve con resolver_flujo_costo_minimo
+LIMITE_CELDAS_REPLICADAS = 20_000_000
 
 class AsignacionSolicitudesServidores:
-    def __init__(self, num_servidores, num_solicitudes, matriz_costos, prioridades=None, capacidades=None):
+    def __init__(self, num_servidores, num_solicitudes, matriz_costos, prioridades=None, capacidades=None,
+                 tipo_datos=np.float64, en_sitio=False, cache=None, instrumentacion=None):
+        """
+        Args:
+            matriz_costos: Matriz S x R de tiempos, o matriz dispersa de SciPy cuyas celdas
+                guardadas son los únicos pares servidor-solicitud permitidos
+            tipo_datos: Tipo de punto flotante de la matriz de costos (np.float64 o np.float32)
+            en_sitio (bool): Si es True, el ajuste por prioridad sobrescribe matriz_costos en
+                lugar de reservar una segunda matriz
+            cache (CacheSoluciones, opcional): Caché de soluciones consultada por
+                resolver antes de resolver con cualquiera de los métodos
+            instrumentacion (Instrumentacion, opcional): Tiempos y memoria por fase; por
+                defecto se crea una que solo mide tiempos
+        """
         
         self.num_servidores = num_servidores # Número de servidores disponibles
         self.num_solicitudes = num_solicitudes # Número de solicitudes a procesar
-        self.matriz_costos = np.array(matriz_costos) # Matriz de costos C[S][R] donde cada elemento C[i][j]
+        self.disperso = hasattr(matriz_costos, 'tocsr') # Con una matriz dispersa, toda solicitud debe ir a un servidor permitido
+        if self.disperso:
+            matriz_costos = matriz_costos.tocsr()
+            if matriz_costos.dtype != tipo_datos:
+                matriz_costos = matriz_costos.astype(tipo_datos)
+            if not matriz_costos.has_canonical_format:
+                matriz_costos = matriz_costos.copy()
+                matriz_costos.sum_duplicates()
+            self.matriz_costos = matriz_costos # Costos de los pares permitidos en formato CSR
+        else:
+            self.matriz_costos = np.asarray(matriz_costos, dtype=tipo_datos) # Matriz de costos C[S][R] donde cada elemento C[i][j]
         self.prioridades = prioridades if prioridades is not None else np.ones(num_solicitudes) # Vector de prioridades para cada solicitud (valores más bajos indican mayor prioridad)
         self.capacidades = capacidades if capacidades is not None else np.ones(num_servidores) * float('inf') # Vector de capacidades para cada servidor
+        self.en_sitio = en_sitio
+        self.cache = cache
+        self.instrumentacion = instrumentacion or Instrumentacion()
         
-        # Ajustar la matriz de costos según las prioridades
-        self.matriz_costos_ajustada = self.ajustar_costos_por_prioridad()
+        # Factor por el que se divide cada columna (solicitud) según su prioridad
+        self.factores_prioridad = self.calcular_factores_prioridad()
+        
+        # La matriz ajustada se calcula al usarla; el método húngaro la escribe directamente
+        # dentro de la matriz cuadrada para no reservar dos copias
+        self._matriz_costos_ajustada = None
+        self._costos_sobrescritos = False
         
         # Resultados
         self.asignaciones = None
         self.tiempo_total = None
         self.carga_servidores = None
+        self._restricciones = None
+        self._reporte = None
 
-    def ajustar_costos_por_prioridad(self):
-        
-        matriz_ajustada = self.matriz_costos.copy()
+    @property
+    def matriz_costos_ajustada(self):
+        """Matriz de costos ajustada por prioridad (se calcula la primera vez que se usa)."""
+        if self._matriz_costos_ajustada is None:
+            self._matriz_costos_ajustada = self.ajustar_costos_por_prioridad()
+        return self._matriz_costos_ajustada
+
+    def calcular_factores_prioridad(self):
+        """
+        Factor de ajuste de cada solicitud: las de mayor prioridad (valor más bajo)
+        tienen un factor mayor, de modo que su costo ajustado es menor.
+        """
+        prioridades = np.asarray(self.prioridades, dtype=self.matriz_costos.dtype)
         
         # Normalizar prioridades para que estén entre 0 y 1
-        if np.max(self.prioridades) > 0:
-            prioridades_norm = self.prioridades / np.max(self.prioridades)
-        else:
-            prioridades_norm = self.prioridades
-            
-        # Ajustar cada columna (solicitud) según su prioridad
-        for j in range(self.num_solicitudes):
-            # Factor de ajuste: solicitudes con mayor prioridad (valor más bajo) tienen un factor menor
-            factor = 1 + (1 - prioridades_norm[j])
-            matriz_ajustada[:, j] = matriz_ajustada[:, j] / factor
-            
-        return matriz_ajustada
+        maximo = prioridades.max() if prioridades.size else 0
+        prioridades_norm = prioridades / maximo if maximo > 0 else prioridades
+        
+        return 1 + (1 - prioridades_norm)
+
+    def ajustar_costos_por_prioridad(self, salida=None):
+        """
+        Divide cada columna (solicitud) por su factor de prioridad en una sola
+        operación con broadcasting.
+        
+        Con en_sitio el ajuste se hace una sola vez: si matriz_costos ya quedó
+        dividida (_costos_sobrescritos), una nueva llamada la devuelve (o la
+        copia en salida) sin volver a aplicar los factores.
+        
+        Args:
+            salida (array, opcional): Arreglo S x R donde escribir el resultado. Por
+                defecto se reserva uno nuevo, o se usa matriz_costos si en_sitio es True.
+                
+        Returns:
+            array: La matriz de costos ajustada (CSR con la misma estructura en el modo disperso)
+        """
+        if self._costos_sobrescritos:
+            if salida is None or salida is self.matriz_costos:
+                return self.matriz_costos
+            with self.instrumentacion.fase('ajuste_prioridad'):
+                if self.disperso:
+                    salida.data[:] = self.matriz_costos.data
+                else:
+                    np.copyto(salida, self.matriz_costos)
+            return salida
+        if salida is None:
+            if self.en_sitio:
+                salida = self.matriz_costos
+            else:
+                salida = self.matriz_costos.copy() if self.disperso else np.empty_like(self.matriz_costos)
+        self._costos_sobrescritos = salida is self.matriz_costos
+        
+        with self.instrumentacion.fase('ajuste_prioridad'):
+            if self.disperso:
+                # Cada par permitido se divide por el factor de su solicitud (columna)
+                np.divide(self.matriz_costos.data, self.factores_prioridad[self.matriz_costos.indices], out=salida.data)
+                return salida
+            return np.divide(self.matriz_costos, self.factores_prioridad, out=salida)
 
     def hacer_matriz_cuadrada(self):
         """
         Hace que la matriz de costos sea cuadrada para aplicar el método húngaro.
         Si hay más servidores que solicitudes, se agregan solicitudes ficticias.
         Si hay más solicitudes que servidores, se agregan servidores ficticios.
+        
+        Se reserva una única matriz cuadrada y los costos ajustados se escriben
+        directamente en su esquina superior izquierda.
         """
         if self.num_servidores == self.num_solicitudes:
             return self.matriz_costos_ajustada
         
-        elif self.num_servidores > self.num_solicitudes:
-            # Agregar solicitudes ficticias con costo alto
-            padding = np.full((self.num_servidores, self.num_servidores - self.num_solicitudes), 0)
-            return np.hstack([self.matriz_costos_ajustada, padding])
+        S, R = self.num_servidores, self.num_solicitudes
+        with self.instrumentacion.fase('relleno'):
+            matriz_cuadrada = np.empty((max(S, R), max(S, R)), dtype=self.matriz_costos.dtype)
+            
+            if S > R:
+                # Agregar solicitudes ficticias con costo alto
+                matriz_cuadrada[:, R:] = 0
+            else:
+                # Agregar servidores ficticios con costo alto
+                matriz_cuadrada[S:, :] = 1e6
+            
+            if self._matriz_costos_ajustada is not None:
+                matriz_cuadrada[:S, :R] = self._matriz_costos_ajustada
+            else:
+                self._matriz_costos_ajustada = self.ajustar_costos_por_prioridad(salida=matriz_cuadrada[:S, :R])
         
-        else:  # self.num_servidores < self.num_solicitudes
-            # Agregar servidores ficticios con costo alto
-            padding = np.full((self.num_solicitudes - self.num_servidores, self.num_solicitudes), 1e6)
-            return np.vstack([self.matriz_costos_ajustada, padding])
+        return matriz_cuadrada
 
     def resolver_metodo_hungaro(self):
         
-        # Hacer la matriz cuadrada
-        matriz_cuadrada = self.hacer_matriz_cuadrada()
+        if self.disperso:
+            # Un lugar por servidor y sin servidores ficticios: cada solicitud va a un servidor permitido
+            servidores, solicitudes = self._emparejamiento_disperso(np.ones(self.num_servidores, dtype=np.int64))
+            with self.instrumentacion.fase('extraccion'):
+                self._guardar_asignaciones(servidores, solicitudes)
+        else:
+            # Hacer la matriz cuadrada
+            matriz_cuadrada = self.hacer_matriz_cuadrada()
+            
+            # Aplicar el método húngaro (scipy.optimize se importa solo al usarlo)
+            with self.instrumentacion.fase('resolucion'):
+                from scipy.optimize import linear_sum_assignment
+                filas_ind, cols_ind = linear_sum_assignment(matriz_cuadrada)
+            
+            # Filtrar asignaciones válidas (no ficticias)
+            with self.instrumentacion.fase('extraccion'):
+                validas = (filas_ind < self.num_servidores) & (cols_ind < self.num_solicitudes)
+                servidores, solicitudes = filas_ind[validas], cols_ind[validas]
+                self._guardar_asignaciones(servidores, solicitudes)
         
-        # Aplicar el método húngaro
-        filas_ind, cols_ind = linear_sum_assignment(matriz_cuadrada)
+        return self.asignaciones, self.tiempo_total, self.carga_servidores
+
+    def resolver_flujo_costo_minimo(self):
+        """
+        Resuelve la asignación respetando las capacidades como un problema de
+        flujo de costo mínimo: cada servidor ofrece capacidades[i] lugares y cada
+        solicitud demanda uno. A diferencia del método húngaro, un servidor puede
+        recibir varias solicitudes sin rellenar la matriz.
         
-        # Filtrar asignaciones válidas (no ficticias)
-        self.asignaciones = []
-        self.carga_servidores = np.zeros(self.num_servidores)
+        Con la matriz densa se aprovecha que hay pocos servidores: precios por
+        servidor en rondas vectorizadas (precios_por_capacidad) y caminos
+        aumentantes sobre el grafo de S servidores para el exceso que queda
+        (caminos_por_capacidad). Cada ronda cuesta O(R · S) y cada camino O(S²)
+        más los arcos que recalcula, así que el tiempo crece casi linealmente con
+        el número de solicitudes. Si la capacidad total no alcanza, un servidor
+        ficticio de costo cero absorbe las solicitudes que quedan sin atender.
         
-        for i, j in zip(filas_ind, cols_ind):
-            if i < self.num_servidores and j < self.num_solicitudes:
-                self.asignaciones.append((i, j, self.matriz_costos[i][j]))
-                self.carga_servidores[i] += 1
+        En el modo disperso se resuelve el problema de transporte sobre los pares
+        permitidos (ver _flujo_disperso).
+        """
+        capacidades = self._capacidades_enteras()
+        if self.disperso:
+            return self._flujo_disperso(capacidades)
         
-        # Calcular tiempo total de procesamiento
-        self.tiempo_total = sum(costo for _, _, costo in self.asignaciones)
+        S, R = self.num_servidores, self.num_solicitudes
+        costos = self.matriz_costos_ajustada
+        with self.instrumentacion.fase('construccion_modelo'):
+            if capacidades.sum() < R:
+                costos = np.vstack([costos, np.zeros((1, R), dtype=costos.dtype)])
+                capacidades = np.append(capacidades, R - capacidades.sum())
+        
+        # Cada solicitud parte de su servidor más barato y los precios reparten casi todo el exceso
+        with self.instrumentacion.fase('solucion_inicial'):
+            servidor = costos.argmin(axis=0)
+            cargas = np.bincount(servidor, minlength=len(capacidades))
+            precios = precios_por_capacidad(costos, capacidades, servidor, cargas)
+        with self.instrumentacion.fase('resolucion'):
+            caminos_por_capacidad(costos, capacidades, servidor, cargas, precios)
+        
+        with self.instrumentacion.fase('extraccion'):
+            validas = servidor < S
+            self._guardar_asignaciones(servidor[validas], np.flatnonzero(validas))
         
         return self.asignaciones, self.tiempo_total, self.carga_servidores
 
-    def verificar_restricciones(self):
+    def _flujo_disperso(self, capacidades):
         """
-        Verifica si la solución cumple con las restricciones de capacidad y prioridad.
+        Flujo de costo mínimo de una instancia dispersa con el simplex de redes
+        sobre los pares permitidos: cada servidor ofrece a lo sumo tantos lugares
+        como solicitudes permitidas tiene y, si no existe una asignación que ocupe
+        los lugares necesarios, se lanza ValueError. Si la capacidad total no
+        alcanza, el servidor ficticio del balanceo absorbe las solicitudes que
+        quedan sin atender.
         """
-        if self.asignaciones is None:
+        capacidades = self._lugares_dispersos(capacidades)
+        self._verificar_factibilidad(capacidades)
+        with self.instrumentacion.fase('construccion_modelo'):
+            modelo = crear_modelo(self.matriz_costos_ajustada, capacidades, np.ones(self.num_solicitudes, dtype=np.int64))
+        
+        # El costo mínimo arranca cerca del óptimo y, a diferencia de Vogel, su costo
+        # no crece con el cuadrado del número de solicitudes
+        with self.instrumentacion.fase('solucion_inicial'):
+            base = costo_minimo(modelo)
+        with self.instrumentacion.fase('resolucion'):
+            try:
+                servidores, solicitudes, _, _ = SimplexTransporteDisperso(modelo).resolver(base)
+            except RuntimeError:
+                # El óptimo dejó flujo en pares prohibidos (hay solicitudes que compiten por pocos servidores)
+                raise ValueError(self._mensaje_infactible(capacidades)) from None
+        
+        with self.instrumentacion.fase('extraccion'):
+            validas = (servidores < self.num_servidores) & (solicitudes < self.num_solicitudes)
+            self._guardar_asignaciones(servidores[validas], solicitudes[validas])
+        
+        return self.asignaciones, self.tiempo_total, self.carga_servidores
+
+    def resolver_hungaro_replicado(self):
+        """
+        Resuelve la asignación respetando las capacidades con el método húngaro,
+        repitiendo cada fila de servidor capacidades[i] veces. linear_sum_assignment
+        acepta matrices rectangulares, así que no se rellena con servidores
+        ficticios: la matriz resultante es de sum(capacidades) x R en lugar de R x R.
+        
+        Conviene cuando las capacidades son enteros pequeños; con capacidades
+        grandes resolver_flujo_costo_minimo evita copiar las filas repetidas. Si
+        la matriz replicada pasaría de LIMITE_CELDAS_REPLICADAS celdas (por
+        ejemplo, 10 servidores sin capacidad y 10.000 solicitudes son 10⁹ celdas)
+        se resuelve directamente con el flujo, que da el mismo óptimo.
+        """
+        capacidades = self._capacidades_enteras()
+        if self.disperso:
+            servidores, solicitudes = self._emparejamiento_disperso(capacidades)
+            with self.instrumentacion.fase('extraccion'):
+                self._guardar_asignaciones(servidores, solicitudes)
+            return self.asignaciones, self.tiempo_total, self.carga_servidores
+        if int(capacidades.sum()) * self.num_solicitudes > LIMITE_CELDAS_REPLICADAS:
+            return self.resolver_flujo_costo_minimo()
+        
+        servidor_de_fila = np.repeat(np.arange(self.num_servidores), capacidades)
+        
+        with self.instrumentacion.fase('relleno'):
+            if self._matriz_costos_ajustada is not None:
+                matriz_replicada = self._matriz_costos_ajustada[servidor_de_fila]
+            else:
+                # Replicar los costos originales y ajustarlos sobre la misma copia
+                matriz_replicada = self.matriz_costos[servidor_de_fila]
+                with self.instrumentacion.fase('ajuste_prioridad'):
+                    np.divide(matriz_replicada, self.factores_prioridad, out=matriz_replicada)
+        
+        with self.instrumentacion.fase('resolucion'):
+            from scipy.optimize import linear_sum_assignment
+            filas_ind, cols_ind = linear_sum_assignment(matriz_replicada)
+        with self.instrumentacion.fase('extraccion'):
+            self._guardar_asignaciones(servidor_de_fila[filas_ind], cols_ind)
+        
+        return self.asignaciones, self.tiempo_total, self.carga_servidores
+
+    def _capacidades_enteras(self):
+        """Capacidades como enteros; una capacidad infinita equivale a poder atender todas las solicitudes."""
+        return np.minimum(np.asarray(self.capacidades, dtype=np.float64), self.num_solicitudes).astype(np.int64)
+
+    def _lugares_dispersos(self, capacidades):
+        """Lugares de cada servidor en el modo disperso: no más que sus solicitudes permitidas."""
+        return np.minimum(capacidades, np.diff(self.matriz_costos.indptr))
+
+    def _verificar_factibilidad(self, lugares):
+        """
+        Comprobación rápida de una instancia dispersa antes de resolverla. Si los
+        lugares alcanzan para todas las solicitudes, cada una necesita algún
+        servidor permitido; si no alcanzan, como en el caso denso se ocupan todos
+        los lugares y las solicitudes que sobran quedan sin asignar. Lanza
+        ValueError si no se cumple.
+        """
+        if lugares.sum() < self.num_solicitudes:
             return
+        servidores_por_solicitud = np.bincount(self.matriz_costos.indices, minlength=self.num_solicitudes)
+        sin_servidor = np.flatnonzero(servidores_por_solicitud == 0)
+        if sin_servidor.size:
+            raise ValueError(f"{sin_servidor.size} solicitudes no tienen ningún servidor permitido "
+                             f"(la primera es la {sin_servidor[0]}): no existe una asignación factible.")
+
+    def _mensaje_infactible(self, capacidades):
+        """
+        Explica por qué no hay asignación factible con el máximo de solicitudes
+        que pueden asignarse, calculado como flujo máximo (fuente -> servidores
+        -> solicitudes permitidas -> sumidero) con scipy.sparse.csgraph.maximum_flow.
+        Las capacidades son los lugares de cada servidor (ver _lugares_dispersos).
+        """
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import maximum_flow
+        
+        S, R = self.num_servidores, self.num_solicitudes
+        fuente, sumidero = S + R, S + R + 1
+        matriz = self.matriz_costos
+        origenes = np.concatenate([np.full(S, fuente), np.repeat(np.arange(S), np.diff(matriz.indptr)), S + np.arange(R)])
+        destinos = np.concatenate([np.arange(S), S + matriz.indices, np.full(R, sumidero)])
+        limites = np.concatenate([capacidades, np.ones(matriz.nnz + R, dtype=np.int64)]).astype(np.int32)
+        positivos = limites > 0
+        red = csr_matrix((limites[positivos], (origenes[positivos], destinos[positivos])), shape=(S + R + 2, S + R + 2))
+        asignables = maximum_flow(red, fuente, sumidero).flow_value
+        if capacidades.sum() < R:
+            return (f"Solo {asignables} de los {int(capacidades.sum())} lugares de los servidores pueden ocuparse con "
+                    "solicitudes permitidas: no existe una asignación factible.")
+        return (f"Solo {asignables} de {R} solicitudes pueden asignarse a servidores permitidos sin exceder su "
+                "capacidad: no existe una asignación factible.")
+
+    def _emparejamiento_disperso(self, capacidades):
+        """
+        Asigna cada solicitud a un servidor permitido con
+        scipy.sparse.csgraph.min_weight_full_bipartite_matching (LAPJVsp), que
+        solo recorre los pares guardados en la matriz CSR. Cada servidor aparece
+        como tantas filas como lugares tiene, sin pasar de sus solicitudes
+        permitidas. Si hay menos lugares que solicitudes el emparejamiento completo
+        ocupa todos los lugares y, como en el caso denso, las solicitudes que
+        sobran quedan sin asignar.
+        
+        Returns:
+            tuple: (servidores, solicitudes) de las asignaciones
+        """
+        lugares = self._lugares_dispersos(capacidades)
+        self._verificar_factibilidad(lugares)
+        ajustada = self.matriz_costos_ajustada
+        servidor_de_fila = np.repeat(np.arange(self.num_servidores), lugares)
+        
+        with self.instrumentacion.fase('relleno'):
+            matriz = ajustada if (lugares == 1).all() else ajustada[servidor_de_fila]
+            # El emparejamiento no admite pesos cero; como siempre se forman min(lugares, R) pares,
+            # sumar la misma constante a todos los pares no cambia la asignación óptima
+            if matriz.nnz:
+                if matriz is ajustada:
+                    matriz = matriz.copy()
+                if not (matriz.data > 0).all():
+                    matriz.data += 1.0 + np.abs(matriz.data).max()
+                matriz.data = _pesos_exactos(matriz.data, sum(matriz.shape))
+        
+        with self.instrumentacion.fase('resolucion'):
+            from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+            try:
+                filas_ind, cols_ind = min_weight_full_bipartite_matching(matriz)
+            except ValueError:
+                raise ValueError(self._mensaje_infactible(lugares)) from None
+        return servidor_de_fila[filas_ind], cols_ind
+
+    def resolver(self, metodo='hungaro'):
+        """
+        Resuelve el problema con el método indicado.
+        
+        Si los lugares de los servidores (uno por servidor con 'hungaro', capacidades[i]
+        con los otros dos) no alcanzan para todas las solicitudes, se ocupan todos y
+        las solicitudes que sobran quedan sin asignar. Con una matriz de costos
+        dispersa vale lo mismo usando solo pares permitidos, con a lo sumo tantos
+        lugares por servidor como solicitudes permitidas tiene; si no existe una
+        asignación así se lanza ValueError.
+        
+        Si el problema tiene caché, se consulta antes de resolver con cualquiera de
+        los métodos; la clave incluye el método, los costos, las prioridades y las
+        capacidades.
+        
+        Args:
+            metodo (str): 'hungaro' (una solicitud por servidor), 'hungaro_replicado'
+                o 'flujo_costo_minimo' (cada servidor atiende hasta su capacidad)
             
-        # Verificar restricciones de capacidad
-        capacidad_excedida = False
-        for i in range(self.num_servidores):
-            if self.carga_servidores[i] > self.capacidades[i]:
-                capacidad_excedida = True
-                break
+        Returns:
+            tuple: (asignaciones, tiempo_total, carga_servidores)
+        """
+        if metodo not in METODOS_RESOLUCION:
+            raise ValueError(f"Método de resolución desconocido: {metodo}")
         
-        # Verificar restricciones de prioridad
-        # Comprobar si las solicitudes de mayor prioridad fueron asignadas a servidores más rápidos
-        prioridad_violada = False
-        asignaciones_por_solicitud = {j: (i, costo) for i, j, costo in self.asignaciones}
+        clave = None
+        if self.cache is not None:
+            with self.instrumentacion.fase('cache'):
+                # Con el ajuste en sitio la matriz ya está dividida, por eso la bandera va en la clave
+                clave = self.cache.clave(metodo, self.matriz_costos, self.factores_prioridad,
+                                         np.asarray(self.capacidades, dtype=np.float64), self._costos_sobrescritos)
+                solucion = self.cache.obtener(clave)
+                if solucion is not None:
+                    self._guardar_asignaciones(solucion['servidores'], solucion['solicitudes'])
+                    return self.asignaciones, self.tiempo_total, self.carga_servidores
         
-        for j1 in range(self.num_solicitudes):
-            if j1 not in asignaciones_por_solicitud:
-                continue
-                
-            for j2 in range(self.num_solicitudes):
-                if j2 not in asignaciones_por_solicitud or j1 == j2:
-                    continue
-                    
-                # Si j1 tiene mayor prioridad que j2 (valor más bajo)
-                if self.prioridades[j1] < self.prioridades[j2]:
-                    i1, costo1 = asignaciones_por_solicitud[j1]
-                    i2, costo2 = asignaciones_por_solicitud[j2]
-                    
-                    # Verificar si la solicitud de mayor prioridad tiene un tiempo de procesamiento mayor
-                    if costo1 > costo2:
-                        prioridad_violada = True
-                        break
+        if metodo == 'hungaro':
+            self.resolver_metodo_hungaro()
+        elif metodo == 'hungaro_replicado':
+            self.resolver_hungaro_replicado()
+        else:
+            self.resolver_flujo_costo_minimo()
+        
+        if clave is not None:
+            self.cache.guardar(clave, {'servidores': self.asignaciones.filas, 'solicitudes': self.asignaciones.columnas})
+        return self.asignaciones, self.tiempo_total, self.carga_servidores
+
+    def _guardar_asignaciones(self, servidores, solicitudes):
+        """
+        Guarda las asignaciones (una unidad por solicitud) junto con el tiempo
+        total y la carga de cada servidor. Iterar sobre self.asignaciones produce
+        tuplas (servidor, solicitud, tiempo).
+        """
+        if self.disperso:
+            tiempos = np.asarray(self.matriz_costos[servidores, solicitudes], dtype=np.float64).reshape(-1)
+        else:
+            tiempos = self.matriz_costos[servidores, solicitudes].astype(np.float64)
+        if self._costos_sobrescritos:
+            # Con el ajuste en sitio se recupera el tiempo original deshaciendo el factor
+            tiempos *= self.factores_prioridad[solicitudes]
+        self.asignaciones = AsignacionesDispersas(servidores, solicitudes, np.ones(len(servidores), dtype=np.int64), tiempos)
+        self.carga_servidores = np.bincount(servidores, minlength=self.num_servidores).astype(np.float64)
+        self._restricciones = None
+        self._reporte = None
+        
+        # Calcular tiempo total de procesamiento
+        self.tiempo_total = float(tiempos.sum())
+
+    def verificar_restricciones(self, max_pares=100):
+        """
+        Verifica si la solución cumple con las restricciones de capacidad y prioridad.
+        
+        Una violación de prioridad es un par de solicitudes asignadas (j1, j2) en el
+        que j1 tiene mayor prioridad (valor más bajo) pero un tiempo de procesamiento
+        mayor que j2. Los pares se cuentan en O(R log² R) sin recorrerlos uno a uno
+        (ver contar_inversiones) y se listan solo los primeros max_pares. El
+        resultado se guarda hasta que cambien las asignaciones.
+        
+        Args:
+            max_pares (int, opcional): Pares violados a listar; None para listarlos todos
+                (puede costar O(R²))
+        
+        Returns:
+            dict: capacidad_excedida y prioridad_violada (bool), exceso_capacidad
+                (exceso de carga de cada servidor), violaciones_por_solicitud (cuántas
+                solicitudes de menor prioridad y menor tiempo tiene cada solicitud),
+                pares_violados (total de pares que violan la prioridad) y
+                lista_pares_violados (matriz K x 2 con los pares (j1, j2), a lo sumo max_pares)
+        """
+        if self.asignaciones is None:
+            return
+        if self._restricciones is not None:
+            if self._restricciones['max_pares'] != max_pares:
+                self._restricciones['lista_pares_violados'] = self._listar_pares_violados(
+                    self._restricciones['violaciones_por_solicitud'], max_pares)
+                self._restricciones['max_pares'] = max_pares
+            return self._restricciones
             
-            if prioridad_violada:
-                break
+        with self.instrumentacion.fase('verificacion_restricciones'):
+            # Verificar restricciones de capacidad
+            exceso_capacidad = np.maximum(self.carga_servidores - np.asarray(self.capacidades, dtype=np.float64), 0)
+            
+            # Verificar restricciones de prioridad
+            # Comprobar si las solicitudes de mayor prioridad fueron asignadas a servidores más rápidos
+            solicitudes = self.asignaciones.columnas
+            violaciones = np.zeros(self.num_solicitudes, dtype=np.int64)
+            violaciones[solicitudes] = contar_inversiones(np.asarray(self.prioridades)[solicitudes], self.asignaciones.costos)
+        
+        self._restricciones = {
+            'capacidad_excedida': bool(exceso_capacidad.any()),
+            'prioridad_violada': bool(violaciones.any()),
+            'exceso_capacidad': exceso_capacidad,
+            'violaciones_por_solicitud': violaciones,
+            'pares_violados': int(violaciones.sum()),
+            'lista_pares_violados': self._listar_pares_violados(violaciones, max_pares),
+            'max_pares': max_pares
+        }
+        return self._restricciones
+
+    def _listar_pares_violados(self, violaciones, max_pares):
+        """Pares (j1, j2) que violan la prioridad, como índices de solicitud (ver listar_inversiones)."""
+        solicitudes = self.asignaciones.columnas
+        pares = listar_inversiones(np.asarray(self.prioridades)[solicitudes], self.asignaciones.costos,
+                                   violaciones[solicitudes], max_pares)
+        return solicitudes[pares]
+
+    def resultado(self, incluir_asignaciones=True):
+        """
+        Resumen de la última resolución como diccionario serializable a JSON.
         
+        Args:
+            incluir_asignaciones (bool): Si es False se omiten las listas de
+                asignaciones (por ejemplo, cuando se exportan aparte)
+        """
+        if self.asignaciones is None:
+            return None
+        restricciones = self.verificar_restricciones()
+        resultado = {
+            'tiempo_total': self.tiempo_total,
+            'num_servidores': self.num_servidores,
+            'num_solicitudes': self.num_solicitudes,
+            'disperso': self.disperso,
+            'carga_servidores': self.carga_servidores.tolist(),
+            'capacidad_excedida': restricciones['capacidad_excedida'],
+            'prioridad_violada': restricciones['prioridad_violada'],
+            'pares_violados': restricciones['pares_violados'],
+            'lista_pares_violados': restricciones['lista_pares_violados'].tolist(),
+            'instrumentacion': self.instrumentacion.a_diccionario()
+        }
+        if incluir_asignaciones:
+            resultado['asignaciones'] = self.asignaciones.a_diccionario()
+        return resultado
+
+    def columnas_resultado(self):
+        """
+        Asignaciones como columnas de NumPy (una fila por solicitud asignada),
+        para exportarlas sin pasar por objetos de Python (ver exportacion_resultados).
+        """
+        if self.asignaciones is None:
+            return None
+        solicitudes = self.asignaciones.columnas
         return {
-            'capacidad_excedida': capacidad_excedida,
-            'prioridad_violada': prioridad_violada
+            'servidor': self.asignaciones.filas,
+            'solicitud': solicitudes,
+            'tiempo': self.asignaciones.costos,
+            'prioridad': np.asarray(self.prioridades, dtype=np.float64)[solicitudes],
+            'violaciones_prioridad': self.verificar_restricciones()['violaciones_por_solicitud'][solicitudes]
         }
 
-    def generar_reporte(self):
+    def lineas_reporte(self, tamano_bloque=10000):
         """
-        Genera un reporte detallado de la optimización.
+        Genera el reporte detallado por bloques de texto, de modo que pueda
+        escribirse en un archivo sin armar antes la cadena completa. Las
+        asignaciones se formatean de a tamano_bloque y la distribución de carga
+        sale de carga_servidores (np.bincount) en una sola operación.
         """
         if self.asignaciones is None:
-            return "Debe resolver el problema primero."
-        
-        reporte = "REPORTE DE ASIGNACIÓN DE SOLICITUDES A SERVIDORES\n"
-        reporte += "=" * 50 + "\n\n"
+            yield "Debe resolver el problema primero."
+            return
         
-        reporte += "RESUMEN:\n"
-        reporte += f"- Número de servidores: {self.num_servidores}\n"
-        reporte += f"- Número de solicitudes: {self.num_solicitudes}\n"
-        reporte += f"- Tiempo total de procesamiento: {self.tiempo_total}\n\n"
+        encabezado = ("REPORTE DE ASIGNACIÓN DE SOLICITUDES A SERVIDORES\n"
+                      + "=" * 50 + "\n\n"
+                      + "RESUMEN:\n"
+                      + f"- Número de servidores: {self.num_servidores}\n"
+                      + f"- Número de solicitudes: {self.num_solicitudes}\n"
+                      + f"- Tiempo total de procesamiento: {self.tiempo_total}\n\n")
         
-        # Verificar restricciones
+        # Verificar restricciones (el resultado queda guardado en la instancia)
         restricciones = self.verificar_restricciones()
         if restricciones:
-            reporte += "VERIFICACIÓN DE RESTRICCIONES:\n"
-            reporte += f"- Capacidad excedida: {'Sí' if restricciones.get('capacidad_excedida', False) else 'No'}\n"
-            reporte += f"- Prioridad violada: {'Sí' if restricciones.get('prioridad_violada', False) else 'No'}\n\n"
+            encabezado += ("VERIFICACIÓN DE RESTRICCIONES:\n"
+                           + f"- Capacidad excedida: {'Sí' if restricciones.get('capacidad_excedida', False) else 'No'}\n"
+                           + f"- Prioridad violada: {'Sí' if restricciones.get('prioridad_violada', False) else 'No'}"
+                           + f" ({restricciones['pares_violados']} pares)\n")
+            if restricciones['pares_violados']:
+                pares = restricciones['lista_pares_violados'][:10]
+                encabezado += ("- Pares violados (mayor prioridad, menor prioridad): "
+                               + ", ".join("(%d, %d)" % tuple(par) for par in pares.tolist())
+                               + (", ..." if restricciones['pares_violados'] > len(pares) else "") + "\n")
+            encabezado += "\n"
         
-        reporte += "ASIGNACIONES DETALLADAS:\n"
-        reporte += "-" * 50 + "\n"
-        reporte += f"{'Servidor':<10} | {'Solicitud':<10} | {'Tiempo':<10} | {'Prioridad':<10}\n"
-        reporte += "-" * 50 + "\n"
+        yield (encabezado
+               + "ASIGNACIONES DETALLADAS:\n"
+               + "-" * 50 + "\n"
+               + f"{'Servidor':<10} | {'Solicitud':<10} | {'Tiempo':<10} | {'Prioridad':<10}\n"
+               + "-" * 50 + "\n")
         
-        for servidor, solicitud, tiempo in self.asignaciones:
-            reporte += f"{servidor:<10} | {solicitud:<10} | {tiempo:<10.2f} | {self.prioridades[solicitud]:<10.2f}\n"
-        
-        reporte += "-" * 50 + "\n\n"
+        asignaciones = self.asignaciones
+        prioridades = np.asarray(self.prioridades, dtype=np.float64)
+        for inicio in range(0, asignaciones.num_celdas, tamano_bloque):
+            fin = inicio + tamano_bloque
+            solicitudes = asignaciones.columnas[inicio:fin]
+            # El formato con % sobre tuplas es bastante más rápido que una f-string por línea
+            yield "".join(["%-10d | %-10d | %-10.2f | %-10.2f\n" % fila
+                           for fila in zip(asignaciones.filas[inicio:fin].tolist(), solicitudes.tolist(),
+                                           asignaciones.costos[inicio:fin].tolist(),
+                                           prioridades[solicitudes].tolist())])
         
         # Análisis de carga de trabajo
-        reporte += "DISTRIBUCIÓN DE CARGA DE TRABAJO:\n"
-        reporte += "-" * 50 + "\n"
-        reporte += f"{'Servidor':<10} | {'Solicitudes asignadas':<20} | {'% de carga':<10}\n"
-        reporte += "-" * 50 + "\n"
+        yield ("-" * 50 + "\n\n"
+               + "DISTRIBUCIÓN DE CARGA DE TRABAJO:\n"
+               + "-" * 50 + "\n"
+               + f"{'Servidor':<10} | {'Solicitudes asignadas':<20} | {'% de carga':<10}\n"
+               + "-" * 50 + "\n")
+        
+        total_solicitudes = self.carga_servidores.sum()
+        porcentajes = (self.carga_servidores / total_solicitudes * 100 if total_solicitudes > 0
+                       else np.zeros(self.num_servidores))
+        for inicio in range(0, self.num_servidores, tamano_bloque):
+            fin = inicio + tamano_bloque
+            yield "".join(["%-10d | %-20d | %-10.2f%%\n" % fila
+                           for fila in zip(range(inicio, min(fin, self.num_servidores)),
+                                           self.carga_servidores[inicio:fin].astype(np.int64).tolist(),
+                                           porcentajes[inicio:fin].tolist())])
+
+    def generar_reporte(self):
+        """
+        Genera un reporte detallado de la optimización. Se arma una sola vez y
+        se guarda hasta que cambien las asignaciones.
+        """
+        if self.asignaciones is None:
+            return "Debe resolver el problema primero."
+        if self._reporte is None:
+            with self.instrumentacion.fase('reporte'):
+                self._reporte = "".join(self.lineas_reporte())
+        return self._reporte
+
+    def escribir_reporte(self, archivo):
+        """
+        Escribe el reporte detallado en un objeto tipo archivo a medida que se
+        genera (o el ya generado, si existe).
+        """
+        if self._reporte is not None or self.asignaciones is None:
+            archivo.write(self.generar_reporte())
+            return
+        bloques = []
+        with self.instrumentacion.fase('reporte'):
+            for bloque in self.lineas_reporte():
+                archivo.write(bloque)
+                bloques.append(bloque)
+        self._reporte = "".join(bloques)
+    
+
+class AsignacionEnLinea:
+    """
+    Asignación de solicitudes a servidores en línea: las solicitudes llegan y se
+    completan de a una, y la asignación de las solicitudes activas se mantiene
+    óptima (costo ajustado por prioridad mínimo respetando capacidades).
+
+    En lugar de volver a llamar a linear_sum_assignment en cada evento, se trabaja
+    sobre un grafo entre servidores: el arco x -> y cuesta lo mínimo que cuesta
+    mover alguna solicitud de x a y. Cada llegada es un camino aumentante más
+    corto (Dijkstra con potenciales duales) que termina en un servidor con
+    capacidad libre, y cada salida busca el camino más negativo que aprovecha el
+    lugar liberado. Con S servidores cada evento cuesta O(S²) más el recálculo de
+    las filas del grafo de los servidores que cambiaron.
+
+    Si todos los servidores están llenos, las solicitudes nuevas esperan en una
+    cola y se asignan, en orden de llegada, a medida que se libera capacidad.
+    """
+
+    def __init__(self, num_servidores, capacidades=None, prioridad_maxima=1.0):
+        """
+        Args:
+            num_servidores (int): Número de servidores
+            capacidades (array, opcional): Máximo de solicitudes simultáneas por servidor
+            prioridad_maxima (float): Valor de prioridad más bajo posible; se usa para
+                normalizar las prioridades igual que ajustar_costos_por_prioridad
+        """
+        self.num_servidores = num_servidores
+        self.capacidades = (np.full(num_servidores, np.inf) if capacidades is None
+                            else np.asarray(capacidades, dtype=np.float64))
+        self.prioridad_maxima = prioridad_maxima
+        self.carga_servidores = np.zeros(num_servidores, dtype=np.int64)
+
+        # Datos de las solicitudes en arreglos que crecen al doble; cada solicitud ocupa un lugar
+        self._costos = np.empty((64, num_servidores), dtype=np.float64) # Costos ajustados por prioridad
+        self._tiempos = np.empty((64, num_servidores), dtype=np.float64) # Tiempos de procesamiento originales
+        self._servidor = np.full(64, -1, dtype=np.int64) # Servidor asignado (-1 si espera en la cola)
+        self._lugares_libres = list(range(63, -1, -1))
+        self._lugar = {} # Identificador de la solicitud -> lugar
+        self._identificador = {} # Lugar -> identificador
+        self._proximo_identificador = 0
+        self._solicitudes_en = [set() for _ in range(num_servidores)] # Lugares asignados a cada servidor
+        self.cola = deque() # Identificadores que esperan capacidad, en orden de llegada
+
+        # Grafo entre servidores más un sumidero (nodo S) al que llegan los servidores con capacidad libre
+        sumidero = num_servidores
+        self._arcos = np.full((num_servidores + 1, num_servidores + 1), np.inf)
+        self._arcos[:sumidero, sumidero] = 0.0
+        self._mover = np.full((num_servidores, num_servidores), -1, dtype=np.int64) # Lugar que conviene mover de x a y
+        self.potenciales = np.zeros(num_servidores + 1)
+        self.tolerancia = 1e-9 # Se ajusta a la escala de los costos recibidos
+        self._patrones = {} # Número de nodos -> (indptr, indices) del CSR completo para Dijkstra
+
+        self.latencias = [] # Segundos que tomó cada evento
+
+    def _lugar_nuevo(self):
+        """Reserva un lugar para una solicitud, agrandando los arreglos si hace falta."""
+        if not self._lugares_libres:
+            tamano = len(self._servidor)
+            self._costos = np.vstack([self._costos, np.empty_like(self._costos)])
+            self._tiempos = np.vstack([self._tiempos, np.empty_like(self._tiempos)])
+            self._servidor = np.concatenate([self._servidor, np.full(tamano, -1, dtype=np.int64)])
+            self._lugares_libres = list(range(2 * tamano - 1, tamano - 1, -1))
+        return self._lugares_libres.pop()
+
+    def _libre(self, servidor):
+        return self.carga_servidores[servidor] < self.capacidades[servidor]
+
+    def _recalcular_arcos(self, servidor):
+        """Recalcula los arcos que salen de un servidor a partir de sus solicitudes actuales."""
+        lugares = np.fromiter(self._solicitudes_en[servidor], dtype=np.int64, count=len(self._solicitudes_en[servidor]))
+        if len(lugares) == 0:
+            self._arcos[servidor, :self.num_servidores] = np.inf
+            self._mover[servidor] = -1
+            return
+        costos = self._costos[lugares]
+        diferencias = costos - costos[:, servidor, None]
+        mejores = diferencias.argmin(axis=0)
+        self._arcos[servidor, :self.num_servidores] = diferencias[mejores, np.arange(self.num_servidores)]
+        self._arcos[servidor, servidor] = np.inf
+        self._mover[servidor] = lugares[mejores]
+
+    def _actualizar_sumidero(self, servidor):
+        """Conecta o desconecta el servidor del sumidero según tenga capacidad libre."""
+        if self._libre(servidor):
+            self._arcos[servidor, self.num_servidores] = 0.0
+            # El arco servidor -> sumidero debe tener costo reducido no negativo
+            self.potenciales[self.num_servidores] = min(self.potenciales[self.num_servidores], self.potenciales[servidor])
+        else:
+            self._arcos[servidor, self.num_servidores] = np.inf
+
+    def _aplicar_movimientos(self, movimientos):
+        """Mueve cada lugar de su servidor a otro y recalcula los arcos de los servidores tocados."""
+        tocados = set()
+        for lugar, origen, destino in movimientos:
+            if origen >= 0:
+                self._solicitudes_en[origen].discard(lugar)
+                self.carga_servidores[origen] -= 1
+                tocados.add(origen)
+            self._solicitudes_en[destino].add(lugar)
+            self.carga_servidores[destino] += 1
+            self._servidor[lugar] = destino
+            tocados.add(destino)
+        for servidor in tocados:
+            self._recalcular_arcos(servidor)
+            self._actualizar_sumidero(servidor)
+        return tocados
+
+    def _reducidos(self):
+        """
+        Costos reducidos arcos[x][y] + potencial[x] - potencial[y] del grafo entre
+        servidores y el sumidero. Son no negativos salvo por redondeo, que se recorta.
+        """
+        reducidos = self._arcos + self.potenciales[:, None]
+        reducidos -= self.potenciales
+        return np.maximum(reducidos, 0.0, out=reducidos)
+
+    def _dijkstra(self, reducidos, origen):
+        """Caminos más cortos desde un nodo del grafo entre servidores (ver _dijkstra_denso)."""
+        return _dijkstra_denso(reducidos, origen, self._patrones)
+
+    def _insertar(self, lugar):
+        """
+        Asigna una solicitud por el camino aumentante más corto: se coloca en un
+        servidor y, si está lleno, una solicitud de ahí se mueve a otro, hasta
+        llegar a uno con capacidad libre (el sumidero).
+        """
+        sumidero = self.num_servidores
+        origen = sumidero + 1
+        # Nodo origen (la solicitud nueva) con un arco a cada servidor; sus costos reducidos
+        # se desplazan para que el menor sea cero, lo que no cambia los caminos más cortos
+        reducidos = np.full((origen + 1, origen + 1), np.inf)
+        reducidos[:origen, :origen] = self._reducidos()
+        iniciales = self._costos[lugar] - self.potenciales[:sumidero]
+        desplazamiento = iniciales.min()
+        reducidos[origen, :sumidero] = iniciales - desplazamiento
+        distancias, previo = self._dijkstra(reducidos, origen)
+        etiquetas = distancias[:origen] + desplazamiento
+
+        camino = [int(previo[sumidero])]
+        while previo[camino[-1]] != origen:
+            camino.append(int(previo[camino[-1]]))
+        camino.reverse()
+
+        # Los lugares a mover se eligen antes de tocar el estado
+        movimientos = [(lugar, -1, camino[0])]
+        movimientos += [(int(self._mover[origen, destino]), origen, destino) for origen, destino in zip(camino, camino[1:])]
+
+        # Johnson: los nodos más lejanos que el sumidero quedan con la distancia del sumidero
+        self.potenciales += np.minimum(etiquetas, etiquetas[sumidero])
+        self._aplicar_movimientos(movimientos)
+
+    def _mejorar_hacia(self, servidor):
+        """
+        Después de liberar capacidad en un servidor, aplica el camino de movimientos
+        más negativo que termina en él, si existe. Devuelve el servidor donde quedó
+        el lugar libre, o None si no hubo mejora.
+        """
+        S = self.num_servidores
+        potenciales = self.potenciales[:S]
+
+        # Dijkstra hacia atrás desde el servidor liberado: sobre el grafo transpuesto, el
+        # predecesor de cada servidor es el siguiente paso de su camino hacia el liberado
+        distancias, siguiente = self._dijkstra(self._reducidos()[:S, :S].T, servidor)
+
+        # Costo real del camino y -> servidor: distancia reducida corregida por los potenciales
+        reales = distancias - potenciales + potenciales[servidor]
+        reales[servidor] = np.inf
+        inicio = int(np.argmin(reales))
+        if not reales[inicio] < -self.tolerancia:
+            return None
+
+        camino = [inicio]
+        while camino[-1] != servidor:
+            camino.append(int(siguiente[camino[-1]]))
+        movimientos = [(int(self._mover[origen, destino]), origen, destino) for origen, destino in zip(camino, camino[1:])]
+
+        tope = distancias[inicio]
+        self.potenciales[:S] -= np.minimum(distancias, tope)
+        self.potenciales[S] -= tope
+        self._aplicar_movimientos(movimientos)
+        return inicio
+
+    def agregar_solicitud(self, costos, prioridad=None):
+        """
+        Agrega una solicitud y actualiza la asignación.
+
+        Args:
+            costos (array): Tiempo de procesamiento de la solicitud en cada servidor
+            prioridad (float, opcional): Prioridad (valores más bajos indican mayor prioridad)
+
+        Returns:
+            int: Identificador de la solicitud
+        """
+        inicio = time.perf_counter()
+        lugar = self._lugar_nuevo()
+        identificador = self._proximo_identificador
+        self._proximo_identificador += 1
+        self._lugar[identificador] = lugar
+        self._identificador[lugar] = identificador
+
+        prioridad = self.prioridad_maxima if prioridad is None else prioridad
+        factor = 1 + (1 - prioridad / self.prioridad_maxima) if self.prioridad_maxima > 0 else 1
+        self._tiempos[lugar] = costos
+        np.divide(self._tiempos[lugar], factor, out=self._costos[lugar])
+        self._servidor[lugar] = -1
+        self.tolerancia = max(self.tolerancia, 1e-9 * float(np.abs(self._costos[lugar]).max(initial=0.0)))
+
+        if self.carga_servidores.sum() < self.capacidades.sum():
+            self._insertar(lugar)
+        else:
+            self.cola.append(identificador)
+
+        self.latencias.append(time.perf_counter() - inicio)
+        return identificador
+
+    def completar_solicitud(self, identificador):
+        """
+        Retira una solicitud (terminada o cancelada) y actualiza la asignación: se
+        aprovecha la capacidad liberada y, si hay solicitudes en espera, se asigna
+        la más antigua.
+        """
+        inicio = time.perf_counter()
+        lugar = self._lugar.pop(identificador)
+        del self._identificador[lugar]
+        servidor = int(self._servidor[lugar])
+        self._servidor[lugar] = -1
+        self._lugares_libres.append(lugar)
+
+        if servidor < 0:
+            self.cola.remove(identificador)
+        else:
+            self._solicitudes_en[servidor].discard(lugar)
+            self.carga_servidores[servidor] -= 1
+            self._recalcular_arcos(servidor)
+            self._actualizar_sumidero(servidor)
+
+            liberado = servidor
+            while liberado is not None:
+                liberado = self._mejorar_hacia(liberado)
+            if self.cola:
+                self._insertar(self._lugar[self.cola.popleft()])
+
+        self.latencias.append(time.perf_counter() - inicio)
+
+    def servidor_de(self, identificador):
+        """Servidor asignado a la solicitud, o None si está esperando en la cola."""
+        servidor = int(self._servidor[self._lugar[identificador]])
+        return servidor if servidor >= 0 else None
+
+    def asignaciones(self):
+        """
+        Returns:
+            AsignacionesDispersas: Asignación actual (servidor, identificador de solicitud, tiempo)
+        """
+        lugares = np.fromiter((lugar for lugar in self._identificador if self._servidor[lugar] >= 0), dtype=np.int64)
+        servidores = self._servidor[lugares]
+        identificadores = np.fromiter((self._identificador[lugar] for lugar in lugares.tolist()), dtype=np.int64,
+                                      count=len(lugares))
+        orden = np.argsort(identificadores)
+        return AsignacionesDispersas(servidores[orden], identificadores[orden], np.ones(len(lugares), dtype=np.int64),
+                                     self._tiempos[lugares[orden], servidores[orden]])
+
+    def costo_ajustado(self):
+        """Suma de los costos ajustados por prioridad de la asignación actual (el objetivo que se minimiza)."""
+        lugares = np.flatnonzero(self._servidor >= 0)
+        return float(self._costos[lugares, self._servidor[lugares]].sum())
+
+    def estadisticas_latencia(self):
+        """
+        Returns:
+            dict: Número de eventos, eventos por segundo y latencia media, p50, p99 y máxima (segundos)
+        """
+        latencias = np.asarray(self.latencias)
+        if len(latencias) == 0:
+            return {'eventos': 0}
+        return {
+            'eventos': len(latencias),
+            'eventos_por_segundo': float(len(latencias) / latencias.sum()) if latencias.sum() > 0 else float('inf'),
+            'media': float(latencias.mean()),
+            'p50': float(np.percentile(latencias, 50)),
+            'p99': float(np.percentile(latencias, 99)),
+            'maxima': float(latencias.max())
+        }
+
+def resolver_archivo(ruta, metodo='hungaro', instrumentacion=None, exportar=None):
+    """
+    Lee una instancia desde archivo y la resuelve sin interacción por consola.
+    
+    Args:
+        ruta (str): Archivo con el formato de MainServidores.leer_datos_archivo
+        metodo (str): Método de resolución (ver AsignacionSolicitudesServidores.resolver)
+        instrumentacion (Instrumentacion, opcional): Para activar el perfil de cProfile
+            o la medición de memoria; por defecto solo se miden tiempos
+        exportar (str, opcional): Archivo .jsonl, .csv, .parquet o .arrow donde exportar
+            las asignaciones (ver exportacion_resultados); el resultado las omite
         
-        total_solicitudes = sum(self.carga_servidores)
-        for i in range(self.num_servidores):
-            porcentaje = (self.carga_servidores[i] / total_solicitudes * 100) if total_solicitudes > 0 else 0
-            reporte += f"{i:<10} | {int(self.carga_servidores[i]):<20} | {porcentaje:<10.2f}%\n"
+    Returns:
+        dict: Resultado de AsignacionSolicitudesServidores.resultado con la ruta y el método
+    """
+    instrumentacion = instrumentacion or Instrumentacion()
+    with instrumentacion.fase('lectura'):
+        S, R, C, prioridades, capacidades = MainServidores().leer_datos_archivo(ruta)
+    problema = AsignacionSolicitudesServidores(S, R, C, prioridades, capacidades, instrumentacion=instrumentacion)
+    problema.resolver(metodo)
+    
+    resultado = {'archivo': str(ruta), 'metodo': metodo}
+    if exportar is None:
+        resultado.update(problema.resultado())
+        return resultado
+    
+    from exportacion_resultados import exportar_resultado
+    resultado.update(problema.resultado(incluir_asignaciones=False))
+    resultado['exportado'] = exportar_resultado(problema, exportar)
+    return resultado
+
+# Memoria compartida con las matrices del lote, abierta una vez por proceso trabajador
+_memoria_lote = None
+
+def _iniciar_trabajador_lote(nombre_memoria):
+    """Inicializador de los procesos del lote: se conecta a la memoria compartida."""
+    global _memoria_lote
+    _memoria_lote = shared_memory.SharedMemory(name=nombre_memoria)
+
+def _resolver_instancia_lote(tarea):
+    """
+    Resuelve una instancia del lote leyendo su matriz de costos directamente de
+    la memoria compartida, sin copiarla.
+    """
+    desplazamiento, forma, prioridades, capacidades, metodo = tarea
+    inicio = time.perf_counter()
+    
+    matriz_costos = np.ndarray(forma, dtype=np.float64, buffer=_memoria_lote.buf, offset=desplazamiento)
+    problema = AsignacionSolicitudesServidores(forma[0], forma[1], matriz_costos, prioridades, capacidades)
+    asignaciones, tiempo_total, carga_servidores = problema.resolver(metodo)
+    resultado = {
+        'asignaciones': asignaciones,
+        'tiempo_total': tiempo_total,
+        'carga_servidores': carga_servidores,
+        'tiempo_resolucion': time.perf_counter() - inicio
+    }
+    
+    # Soltar la vista antes de que el proceso cierre la memoria compartida
+    del problema, matriz_costos
+    return resultado
+
+def _por_instancia(valores, num_instancias):
+    """Devuelve una lista con el valor de cada instancia (None o una secuencia por instancia)."""
+    if valores is None:
+        return [None] * num_instancias
+    valores = list(valores)
+    if len(valores) != num_instancias:
+        raise ValueError(f"Se esperaban {num_instancias} vectores, se recibieron {len(valores)}.")
+    return valores
+
+def resolver_lote(matrices_costos, prioridades=None, capacidades=None, metodo='hungaro',
+                  max_procesos=None, tamano_bloque=None):
+    """
+    Resuelve muchas instancias independientes de asignación de solicitudes a
+    servidores en un ProcessPoolExecutor.
+    
+    Las matrices se copian una sola vez a un bloque de memoria compartida y cada
+    proceso las lee desde ahí; solo los vectores pequeños y los resultados viajan
+    serializados.
+    
+    Args:
+        matrices_costos: Arreglo 3-D (instancias x S x R) o iterable de matrices S x R,
+            que pueden tener tamaños distintos
+        prioridades (iterable, opcional): Vector de prioridades de cada instancia
+        capacidades (iterable, opcional): Vector de capacidades de cada instancia
+        metodo (str): Método de resolución (ver AsignacionSolicitudesServidores.resolver)
+        max_procesos (int, opcional): Número de procesos; por defecto, uno por CPU
+        tamano_bloque (int, opcional): Instancias enviadas juntas a cada proceso
         
-        return reporte
+    Returns:
+        list: Un diccionario por instancia, en el orden de entrada, con asignaciones,
+            tiempo_total, carga_servidores y tiempo_resolucion (segundos)
+    """
+    if isinstance(matrices_costos, np.ndarray) and matrices_costos.ndim == 3:
+        matrices = matrices_costos
+    else:
+        matrices = [np.asarray(matriz, dtype=np.float64) for matriz in matrices_costos]
+    num_instancias = len(matrices)
+    if num_instancias == 0:
+        return []
     
+    formas = [tuple(matriz.shape) for matriz in matrices]
+    tamanos = [forma[0] * forma[1] for forma in formas]
+    total = int(sum(tamanos))
+    inicios = np.concatenate(([0], np.cumsum(tamanos)[:-1])).astype(np.int64) # Inicio de cada matriz en elementos
+    prioridades = _por_instancia(prioridades, num_instancias)
+    capacidades = _por_instancia(capacidades, num_instancias)
+    
+    tamano_elemento = np.dtype(np.float64).itemsize
+    memoria = shared_memory.SharedMemory(create=True, size=max(total * tamano_elemento, 1))
+    try:
+        # Copiar todas las matrices al bloque compartido
+        datos = np.ndarray(total, dtype=np.float64, buffer=memoria.buf)
+        if isinstance(matrices, np.ndarray):
+            datos[:] = matrices.reshape(-1)
+        else:
+            for matriz, inicio, tamano in zip(matrices, inicios, tamanos):
+                datos[inicio:inicio + tamano] = matriz.reshape(-1)
+        del datos
+        
+        tareas = [(int(inicio) * tamano_elemento, forma, prioridades[k], capacidades[k], metodo)
+                  for k, (inicio, forma) in enumerate(zip(inicios, formas))]
+        
+        max_procesos = max_procesos or os.cpu_count() or 1
+        if tamano_bloque is None:
+            # Varios bloques por proceso para repartir bien la carga sin pagar un envío por instancia
+            tamano_bloque = max(1, num_instancias // (4 * max_procesos))
+        
+        with ProcessPoolExecutor(max_workers=max_procesos, initializer=_iniciar_trabajador_lote,
+                                 initargs=(memoria.name,)) as ejecutor:
+            return list(ejecutor.map(_resolver_instancia_lote, tareas, chunksize=tamano_bloque))
+    finally:
+        memoria.close()
+        memoria.unlink()
 
 class MainServidores:
     def __init__(self):
@@ -254,38 +1437,11 @@ class MainServidores:
 
 
     def leer_datos_archivo(self,ruta):
-        
-        with open(ruta, 'r') as f:
-            lineas = [line.strip() for line in f.readlines() if line.strip()]
-            
-            S = int(lineas[0])  # Número de servidores
-            R = int(lineas[1])  # Número de solicitudes
-            
-            # Leer matriz de costos
-            C = []
-            for i in range(2, 2 + S):
-                fila = list(map(float, lineas[i].split()))
-                if len(fila) != R:
-                    raise ValueError(f"Error: La fila {i-2} de la matriz de costos tiene {len(fila)} valores, se esperaban {R}.")
-                C.append(fila)
-            
-            # Verificar si hay más líneas para prioridades y capacidades
-            prioridades = None
-            capacidades = None
-            
-            if len(lineas) > 2 + S:
-                # Leer prioridades
-                prioridades = list(map(float, lineas[2 + S].split()))
-                if len(prioridades) != R:
-                    raise ValueError(f"Error: Se esperaban {R} valores para las prioridades.")
-            
-            if len(lineas) > 3 + S:
-                # Leer capacidades
-                capacidades = list(map(int, lineas[3 + S].split()))
-                if len(capacidades) != S:
-                    raise ValueError(f"Error: Se esperaban {S} valores para las capacidades.")
-            
-            return S, R, C, prioridades, capacidades
+        """
+        Lee la instancia línea por línea directamente en arreglos de NumPy
+        (ver lectura_instancias.leer_instancia_servidores).
+        """
+        return leer_instancia_servidores(ruta)
 
     def main(self):
         """
@@ -314,9 +1470,22 @@ class MainServidores:
             # Crear instancia del problema
             problema = AsignacionSolicitudesServidores(S, R, C, prioridades, capacidades)
             
-            # Resolver con el método húngaro
-            print("\nResolviendo con el método húngaro...")
-            asignaciones, tiempo_total, carga_servidores = problema.resolver_metodo_hungaro()
+            # Seleccionar método de resolución
+            print("\nSeleccione el método de resolución:")
+            print("1. Método húngaro (una solicitud por servidor)")
+            print("2. Flujo de costo mínimo (cada servidor atiende hasta su capacidad)")
+            print("3. Método húngaro con servidores replicados (capacidades pequeñas)")
+            metodo = input("Seleccione una opción (1, 2 o 3): ")
+            
+            if metodo == '2':
+                print("\nResolviendo con flujo de costo mínimo...")
+                asignaciones, tiempo_total, carga_servidores = problema.resolver('flujo_costo_minimo')
+            elif metodo == '3':
+                print("\nResolviendo con el método húngaro replicado...")
+                asignaciones, tiempo_total, carga_servidores = problema.resolver('hungaro_replicado')
+            else:
+                print("\nResolviendo con el método húngaro...")
+                asignaciones, tiempo_total, carga_servidores = problema.resolver('hungaro')
             
             # Mostrar resultados
             print("\n=== RESULTADOS DE LA OPTIMIZACIÓN ===")
@@ -333,22 +1502,30 @@ class MainServidores:
             if restricciones:
                 print("\nVerificación de restricciones:")
                 print(f"- Capacidad excedida: {'Sí' if restricciones.get('capacidad_excedida', False) else 'No'}")
-                print(f"- Prioridad violada: {'Sí' if restricciones.get('prioridad_violada', False) else 'No'}")
+                print(f"- Prioridad violada: {'Sí' if restricciones.get('prioridad_violada', False) else 'No'} ({restricciones['pares_violados']} pares)")
             
             # Preguntar si se desea ver el reporte detallado
             ver_reporte = input("\n¿Desea ver el reporte detallado? (s/n): ")
             if ver_reporte.lower() == 's':
-                reporte = problema.generar_reporte()
-                print("\n" + reporte)
+                print()
+                problema.escribir_reporte(sys.stdout)
             
             # Preguntar si se desea guardar el reporte
             guardar_reporte = input("\n¿Desea guardar el reporte en un archivo? (s/n): ")
             if guardar_reporte.lower() == 's':
                 nombre_archivo = input("Ingrese el nombre del archivo (sin extensión): ")
                 with open(f"{nombre_archivo}.txt", 'w') as f:
-                    f.write(problema.generar_reporte())
+                    problema.escribir_reporte(f)
                 print(f"Reporte guardado en {nombre_archivo}.txt")
             
+            # Preguntar si se desean exportar las asignaciones en un formato tabular
+            exportar = input("\n¿Desea exportar las asignaciones (JSON Lines, CSV, Parquet)? (s/n): ")
+            if exportar.lower() == 's':
+                from exportacion_resultados import exportar_resultado
+                ruta = input("Ingrese el nombre del archivo (.jsonl, .csv, .parquet o .arrow): ")
+                for escrito in exportar_resultado(problema, ruta):
+                    print(f"Archivo guardado en {escrito}")
+            
         except Exception as e:
             print(f"Error: {str(e)}")
 
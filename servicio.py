@@ -0,0 +1,347 @@
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import parse_qs, urlsplit
+import numpy as np
+from exportacion_resultados import reemplazar_no_finitos
+from lectura_instancias import datos_programadores, datos_servidores, instancia_desde_bytes, matriz_arcos
+from metodos_transporte import SOLUCIONES_INICIALES
+from modulo_asignacion_programadores import AsignacionProgramadoresTareas
+from modulo_asignacion_programadores import METODOS_RESOLUCION as METODOS_TRANSPORTE
+from modulo_asignacion_servidores import AsignacionSolicitudesServidores
+from modulo_asignacion_servidores import METODOS_RESOLUCION as METODOS_SERVIDORES
+
+
+def _resolver_transporte(C, S, D, metodo, solucion_inicial, limite_segundos=None):
+    """Resuelve una instancia de programadores en un proceso del grupo de trabajo."""
+    inicio = time.perf_counter()
+    problema = AsignacionProgramadoresTareas(C.shape[0], C.shape[1], C, S, D)
+    problema.resolver(metodo, solucion_inicial, limite_segundos)
+    resultado = {'metodo': metodo}
+    resultado.update(problema.resultado())
+    resultado['tiempo_servicio'] = time.perf_counter() - inicio
+    return resultado
+
+def _resolver_servidores(C, prioridades, capacidades, metodo):
+    """Resuelve una instancia de servidores en un proceso del grupo de trabajo."""
+    inicio = time.perf_counter()
+    problema = AsignacionSolicitudesServidores(C.shape[0], C.shape[1], C, prioridades, capacidades)
+    problema.resolver(metodo)
+    resultado = {'metodo': metodo}
+    resultado.update(problema.resultado())
+    resultado['tiempo_servicio'] = time.perf_counter() - inicio
+    return resultado
+
+def _calentar_trabajador():
+    """Tarea vacía que obliga a arrancar un proceso del grupo."""
+    time.sleep(0.05)
+    return os.getpid()
+
+
+class ErrorServicio(Exception):
+    """Error que se devuelve al cliente con un código HTTP."""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def _validar_opcion(nombre, valor, validos):
+    """Rechaza con 400 una opción desconocida antes de encolar trabajo."""
+    if valor not in validos:
+        raise ErrorServicio(400, f"{nombre} desconocido: {valor}. Use uno de: {', '.join(validos)}")
+    return valor
+
+
+class ServicioAsignacion:
+    """
+    Servicio local asyncio que resuelve instancias de ambos módulos sobre HTTP
+    (TCP o socket Unix) con un grupo acotado de procesos que se mantienen
+    calientes, de modo que scipy y PuLP se importan una sola vez por proceso.
+
+    Rutas:
+        POST /transporte   Instancia de programadores (JSON o .npz binario)
+        POST /servidores   Instancia de servidores (JSON o .npz binario)
+        GET  /metricas     Profundidad de la cola y contadores del servicio
+
+    Las instancias idénticas que llegan mientras otra igual se está resolviendo
+    esperan ese mismo resultado en lugar de resolverse de nuevo. Si hay más
+    trabajos pendientes que max_procesos + limite_cola, se responde 503 con
+    Retry-After para que el cliente reintente más tarde. Un Content-Length
+    inválido se responde con 400 y uno mayor que max_cuerpo con 413, sin leer
+    el cuerpo y cerrando la conexión.
+    """
+
+    def __init__(self, max_procesos=None, limite_cola=64, max_cuerpo=64 * 1024 * 1024):
+
+        self.max_procesos = max_procesos
+        self.limite_cola = limite_cola # Trabajos que pueden esperar además de los que se ejecutan
+        self.max_cuerpo = max_cuerpo # Bytes máximos del cuerpo de una petición
+        self.ejecutor = None
+        self._en_curso = {} # Huella de la instancia -> future con su resultado
+        self._pendientes = 0 # Trabajos únicos aceptados y no terminados
+        self._ejecutando = 0
+        self._semaforo = None
+        self.metricas = {
+            'recibidas': 0,
+            'completadas': 0,
+            'coalescidas': 0,
+            'rechazadas': 0,
+            'errores': 0,
+            'reinicios_procesos': 0,
+            'max_profundidad_cola': 0
+        }
+
+    def estado(self):
+        """Métricas actuales, incluida la profundidad de la cola."""
+        estado = dict(self.metricas)
+        estado['en_ejecucion'] = self._ejecutando
+        estado['en_cola'] = self._pendientes - self._ejecutando
+        estado['limite_cola'] = self.limite_cola
+        return estado
+
+    def _leer_instancia(self, ruta, parametros, tipo_contenido, cuerpo):
+        """
+        Convierte el cuerpo de la petición en (función, argumentos). Los JSON usan
+        los nombres de los constructores ('arcos' con la lista de [fila, columna,
+        costo] permitidos puede reemplazar a 'matriz_costos'; en /servidores van
+        entonces también num_servidores y num_solicitudes); los binarios son .npz
+        guardados con lectura_instancias y el método va en la query string.
+        """
+        if 'json' in tipo_contenido:
+            datos = json.loads(cuerpo)
+            opciones = datos
+            if 'arcos' in datos:
+                # Instancia dispersa: lista de [fila, columna, costo] de los arcos permitidos
+                arcos = np.asarray(datos['arcos'], dtype=np.float64).reshape(-1, 3)
+                if ruta == '/transporte':
+                    forma = len(datos['capacidad_programadores']), len(datos['demanda_tareas'])
+                else:
+                    forma = int(datos['num_servidores']), int(datos['num_solicitudes'])
+                C = matriz_arcos(forma[0], forma[1], arcos[:, 0], arcos[:, 1], arcos[:, 2])
+            else:
+                C = np.asarray(datos['matriz_costos'], dtype=np.float64)
+            if ruta == '/transporte':
+                vectores = (np.asarray(datos['capacidad_programadores'], dtype=np.int64),
+                            np.asarray(datos['demanda_tareas'], dtype=np.int64))
+            else:
+                vectores = tuple(None if datos.get(nombre) is None else np.asarray(datos[nombre], dtype=tipo)
+                                 for nombre, tipo in (('prioridades', np.float64), ('capacidades', np.float64)))
+        else:
+            opciones = {nombre: valores[0] for nombre, valores in parametros.items()}
+            if ruta == '/transporte':
+                _, _, C, S, D = datos_programadores(instancia_desde_bytes(cuerpo, 'programadores'))
+                vectores = (S, D)
+            else:
+                _, _, C, prioridades, capacidades = datos_servidores(instancia_desde_bytes(cuerpo, 'servidores'))
+                vectores = (prioridades, capacidades)
+
+        if C.ndim != 2:
+            raise ValueError("La matriz de costos debe ser bidimensional.")
+        if ruta == '/transporte':
+            limite = opciones.get('limite_segundos')
+            return _resolver_transporte, (C,) + vectores + (
+                _validar_opcion('metodo', opciones.get('metodo', 'simplex_red'), METODOS_TRANSPORTE),
+                _validar_opcion('solucion_inicial', opciones.get('solucion_inicial', 'vogel'),
+                                tuple(SOLUCIONES_INICIALES)),
+                None if limite is None else float(limite))
+        return _resolver_servidores, (C,) + vectores + (
+            _validar_opcion('metodo', opciones.get('metodo', 'hungaro'), METODOS_SERVIDORES),)
+
+    @staticmethod
+    def _huella(funcion, argumentos):
+        """Huella de una instancia: mismo tipo, mismos datos y mismas opciones."""
+        huella = hashlib.blake2b(funcion.__name__.encode(), digest_size=20)
+        for argumento in argumentos:
+            if isinstance(argumento, np.ndarray):
+                huella.update(f'{argumento.dtype}{argumento.shape}'.encode())
+                huella.update(np.ascontiguousarray(argumento).data)
+            elif hasattr(argumento, 'tocsr'):
+                # Instancia dispersa: su repr no depende de los datos
+                argumento = argumento.tocsr()
+                huella.update(f'csr{argumento.shape}'.encode())
+                for arreglo in (argumento.indptr, argumento.indices, argumento.data):
+                    huella.update(f'{arreglo.dtype}'.encode())
+                    huella.update(np.ascontiguousarray(arreglo).data)
+            else:
+                huella.update(repr(argumento).encode())
+        return huella.hexdigest()
+
+    async def resolver(self, funcion, argumentos):
+        """
+        Resuelve una instancia en el grupo de procesos, compartiendo el resultado
+        con las peticiones idénticas en curso.
+        """
+        self.metricas['recibidas'] += 1
+        huella = self._huella(funcion, argumentos)
+        if huella in self._en_curso:
+            self.metricas['coalescidas'] += 1
+            return await asyncio.shield(self._en_curso[huella])
+
+        if self._pendientes >= self.max_procesos + self.limite_cola:
+            self.metricas['rechazadas'] += 1
+            raise ErrorServicio(503, "Servicio saturado, intente de nuevo más tarde.")
+
+        futuro = asyncio.get_running_loop().create_future()
+        self._en_curso[huella] = futuro
+        self._pendientes += 1
+        self.metricas['max_profundidad_cola'] = max(self.metricas['max_profundidad_cola'],
+                                                    self._pendientes - self._ejecutando)
+        try:
+            async with self._semaforo:
+                self._ejecutando += 1
+                ejecutor = self.ejecutor
+                try:
+                    resultado = await asyncio.get_running_loop().run_in_executor(ejecutor, funcion, *argumentos)
+                except BrokenProcessPool:
+                    # Un proceso murió (por ejemplo, sin memoria): el grupo ya no acepta trabajos
+                    self._reemplazar_ejecutor(ejecutor)
+                    raise ErrorServicio(500, "Un proceso de resolución terminó de forma inesperada; "
+                                             "el grupo de procesos se reinició.") from None
+                finally:
+                    self._ejecutando -= 1
+            self.metricas['completadas'] += 1
+            futuro.set_result(resultado)
+        except Exception as e:
+            self.metricas['errores'] += 1
+            futuro.set_exception(e)
+            # Marca la excepción como recuperada para que asyncio no avise si nadie más la espera
+            futuro.exception()
+            raise
+        finally:
+            self._pendientes -= 1
+            del self._en_curso[huella]
+            if not futuro.done():
+                # La petición que resolvía se canceló (el cliente se desconectó o el servicio se
+                # detiene): las peticiones idénticas que la esperaban no deben quedar colgadas
+                futuro.set_exception(ErrorServicio(503, "La resolución compartida se canceló, intente de nuevo."))
+                futuro.exception()
+        return resultado
+
+    def _crear_ejecutor(self):
+        """
+        Grupo de procesos de resolución. Los procesos se crean con forkserver (o
+        spawn), nunca con fork desde el proceso que escucha: un hijo creado con
+        fork heredaría los sockets abiertos y las conexiones cerradas por el
+        servicio no llegarían al fin de archivo en el cliente.
+        """
+        metodos = multiprocessing.get_all_start_methods()
+        contexto = multiprocessing.get_context('forkserver' if 'forkserver' in metodos else 'spawn')
+        return ProcessPoolExecutor(max_workers=self.max_procesos, mp_context=contexto)
+
+    def _calentar(self):
+        """Arranca todos los procesos del grupo con tareas vacías simultáneas y espera a que terminen."""
+        for futuro in [self.ejecutor.submit(_calentar_trabajador) for _ in range(self.max_procesos)]:
+            futuro.result()
+
+    def _reemplazar_ejecutor(self, roto):
+        """Cambia un grupo de procesos roto por uno nuevo (una sola vez aunque fallen varias peticiones)."""
+        if self.ejecutor is not roto:
+            return
+        roto.shutdown(wait=False, cancel_futures=True)
+        self.ejecutor = self._crear_ejecutor()
+        self.metricas['reinicios_procesos'] += 1
+
+    async def _atender(self, lector, escritor):
+        """Atiende las peticiones HTTP/1.1 de una conexión (con keep-alive)."""
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                try:
+                    metodo_http, destino, _ = linea.decode('latin-1').split(' ', 2)
+                except ValueError:
+                    await self._responder(escritor, 400, {'error': "Petición HTTP inválida."}, False)
+                    break
+
+                cabeceras = {}
+                while True:
+                    linea = await lector.readline()
+                    if linea in (b'\r\n', b'\n', b''):
+                        break
+                    nombre, _, valor = linea.decode('latin-1').partition(':')
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+                try:
+                    longitud = int(cabeceras.get('content-length', 0))
+                    if longitud < 0:
+                        raise ValueError
+                except ValueError:
+                    await self._responder(escritor, 400, {'error': "Content-Length inválido."}, False)
+                    break
+                if longitud > self.max_cuerpo:
+                    # Sin leer el cuerpo no se sabe dónde empieza la petición siguiente: se cierra
+                    await self._responder(escritor, 413, {'error': f"El cuerpo supera el máximo de "
+                                                                   f"{self.max_cuerpo} bytes."}, False)
+                    break
+                cuerpo = await lector.readexactly(longitud)
+                mantener = cabeceras.get('connection', '').lower() != 'close'
+
+                estado, respuesta = await self._despachar(metodo_http, destino, cabeceras, cuerpo)
+                await self._responder(escritor, estado, respuesta, mantener)
+                if not mantener:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _despachar(self, metodo_http, destino, cabeceras, cuerpo):
+        """Devuelve (código HTTP, cuerpo JSON) para una petición."""
+        partes = urlsplit(destino)
+        try:
+            if metodo_http == 'GET' and partes.path == '/metricas':
+                return 200, self.estado()
+            if metodo_http == 'POST' and partes.path in ('/transporte', '/servidores'):
+                try:
+                    funcion, argumentos = self._leer_instancia(partes.path, parse_qs(partes.query),
+                                                               cabeceras.get('content-type', 'application/json'), cuerpo)
+                except (ValueError, KeyError, TypeError) as e:
+                    raise ErrorServicio(400, f"Instancia inválida: {e}")
+                return 200, await self.resolver(funcion, argumentos)
+            raise ErrorServicio(404, f"Ruta no encontrada: {metodo_http} {partes.path}")
+        except ErrorServicio as e:
+            return e.estado, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': str(e)}
+
+    @staticmethod
+    async def _responder(escritor, estado, respuesta, mantener):
+        razones = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+                   500: 'Internal Server Error', 503: 'Service Unavailable'}
+        cuerpo = json.dumps(reemplazar_no_finitos(respuesta), ensure_ascii=False, allow_nan=False).encode('utf-8')
+        cabeceras = [f'HTTP/1.1 {estado} {razones.get(estado, "")}',
+                     'Content-Type: application/json; charset=utf-8',
+                     f'Content-Length: {len(cuerpo)}',
+                     f'Connection: {"keep-alive" if mantener else "close"}']
+        if estado == 503:
+            cabeceras.append('Retry-After: 1')
+        escritor.write(('\r\n'.join(cabeceras) + '\r\n\r\n').encode('latin-1') + cuerpo)
+        await escritor.drain()
+
+    async def iniciar(self, host='127.0.0.1', puerto=8080, socket_unix=None):
+        """
+        Crea el grupo de procesos, lo arranca completo antes de abrir el socket
+        y empieza a escuchar; devuelve el servidor asyncio.
+        """
+        self.max_procesos = self.max_procesos or os.cpu_count() or 1
+        self.ejecutor = self._crear_ejecutor()
+        await asyncio.get_running_loop().run_in_executor(None, self._calentar)
+        self._semaforo = asyncio.Semaphore(self.max_procesos)
+        if socket_unix:
+            return await asyncio.start_unix_server(self._atender, path=socket_unix)
+        return await asyncio.start_server(self._atender, host, puerto)
+
+    async def servir(self, host='127.0.0.1', puerto=8080, socket_unix=None):
+        """Atiende peticiones hasta que se cancela la tarea."""
+        servidor = await self.iniciar(host, puerto, socket_unix)
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            self.ejecutor.shutdown(cancel_futures=True)
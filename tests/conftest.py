@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Los módulos del proyecto y los generadores de instancias se importan desde la raíz y benchmarks/
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, 'benchmarks'))
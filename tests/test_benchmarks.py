@@ -0,0 +1,97 @@
+import json
+
+import numpy as np
+import pytest
+from generadores import (VARIANTES_TRANSPORTE, generar_servidores, generar_servidores_disperso, generar_transporte,
+                         generar_transporte_disperso)
+
+
+def test_main_no_carga_modulos_pesados():
+    from benchmark_arranque import modulos_pesados_en_arranque
+
+    assert modulos_pesados_en_arranque() == []
+
+
+@pytest.mark.parametrize('generar', [generar_transporte, generar_transporte_disperso])
+@pytest.mark.parametrize('variante', VARIANTES_TRANSPORTE)
+def test_generadores_de_transporte(generar, variante):
+    N, M, C, S, D = generar(6, 20, 3, variante)
+    assert (N, M) == (6, 20) and C.shape == (6, 20) and len(S) == 6 and len(D) == 20
+    assert (S > 0).all() and (D > 0).all()
+    diferencia = int(S.sum()) - int(D.sum())
+    assert {'balanceado': diferencia == 0, 'exceso_oferta': diferencia > 0,
+            'exceso_demanda': diferencia < 0}[variante]
+
+    # La misma semilla da la misma instancia; otra semilla, otra
+    repetida = generar(6, 20, 3, variante)
+    otra = generar(6, 20, 4, variante)
+    densa = C.toarray() if hasattr(C, 'toarray') else C
+    np.testing.assert_array_equal(densa, repetida[2].toarray() if hasattr(C, 'toarray') else repetida[2])
+    np.testing.assert_array_equal(S, repetida[3])
+    assert not np.array_equal(D, otra[4]) or not np.array_equal(S, otra[3])
+
+    with pytest.raises(ValueError):
+        generar(6, 20, 3, 'inexistente')
+
+
+def test_generador_disperso_limita_los_arcos():
+    _, _, C, _, _ = generar_transporte_disperso(50, 40, 0, arcos_por_tarea=3)
+    # Los arcos al azar más los de la asignación que garantiza la factibilidad
+    assert (np.diff(C.tocsc().indptr) <= 3 + 50).all() and C.nnz < 50 * 40 / 2
+
+    S, R, C, prioridades, capacidades = generar_servidores_disperso(20, 60, 0, arcos_por_solicitud=2)
+    assert (np.diff(C.tocsc().indptr) >= 1).all() and (np.diff(C.tocsc().indptr) <= 3).all()
+    assert capacidades.sum() >= R
+
+
+@pytest.mark.parametrize('holgura', [1.0, 1.5, None])
+def test_generador_de_servidores(holgura):
+    S, R, C, prioridades, capacidades = generar_servidores(5, 30, 1, holgura=holgura)
+    assert C.shape == (5, 30) and prioridades.min() >= 1
+    if holgura is None:
+        assert capacidades is None
+    else:
+        assert (capacidades > 0).all() and capacidades.sum() == int(np.ceil(30 * holgura))
+    np.testing.assert_array_equal(generar_servidores(5, 30, 1, holgura=holgura)[2], C)
+
+
+def test_benchmark_de_motores_y_comparacion(tmp_path, capsys):
+    from benchmark_solvers import main
+
+    salida = tmp_path / 'base.json'
+    argumentos = ['--tamanos', '20', '40', '--repeticiones', '1', '--silencioso',
+                  '--variantes', 'balanceado', 'exceso_demanda', 'disperso',
+                  '--motores-transporte', 'simplex_red', 'highs',
+                  '--motores-servidores', 'hungaro_replicado', 'flujo_costo_minimo']
+    assert main(argumentos + ['-o', str(salida)]) == 0
+    datos = json.loads(salida.read_text(encoding='utf-8'))
+    assert {'commit', 'versiones', 'parametros'} <= set(datos['metadatos'])
+
+    # Todos los motores dan el mismo objetivo en cada instancia ('hungaro' queda fuera:
+    # asigna una solicitud por servidor, sin capacidades)
+    objetivos = {}
+    for fila in datos['resultados']:
+        assert 'error' not in fila and 'omitido' not in fila
+        assert set(fila['tiempos']) == {'construccion', 'resolucion', 'reporte'}
+        objetivos.setdefault((fila['modulo'], fila['variante'], fila['tamano']), []).append(fila['objetivo'])
+    assert len(objetivos) == 2 * 3 + 2 * 2
+    for valores in objetivos.values():
+        assert len(valores) == 2 and np.allclose(valores, valores[0])
+
+    # Contra sí misma no hay regresiones con un umbral amplio
+    assert main(argumentos + ['-o', str(tmp_path / 'nueva.json'), '--comparar', str(salida), '--umbral', '100']) == 0
+    assert 'OBJETIVO DISTINTO' not in capsys.readouterr().out
+
+
+def test_comparacion_marca_objetivos_distintos(tmp_path, capsys):
+    from benchmark_solvers import main
+
+    salida = tmp_path / 'base.json'
+    argumentos = ['--modulo', 'servidores', '--tamanos', '20', '--repeticiones', '1', '--silencioso',
+                  '--motores-servidores', 'hungaro']
+    main(argumentos + ['-o', str(salida)])
+    datos = json.loads(salida.read_text(encoding='utf-8'))
+    datos['resultados'][0]['objetivo'] += 1
+    salida.write_text(json.dumps(datos), encoding='utf-8')
+    assert main(argumentos + ['-o', str(tmp_path / 'nueva.json'), '--comparar', str(salida), '--umbral', '100']) == 1
+    assert 'OBJETIVO DISTINTO' in capsys.readouterr().out
@@ -0,0 +1,102 @@
+import importlib.util
+
+import numpy as np
+import pytest
+from cache_soluciones import CacheSoluciones
+from generadores import generar_servidores, generar_transporte, generar_transporte_disperso
+from modulo_asignacion_programadores import METODOS_RESOLUCION as METODOS_TRANSPORTE
+from modulo_asignacion_programadores import AsignacionProgramadoresTareas
+from modulo_asignacion_servidores import METODOS_RESOLUCION as METODOS_SERVIDORES
+from modulo_asignacion_servidores import AsignacionSolicitudesServidores
+
+
+def copia(datos):
+    """Los mismos datos en arreglos nuevos: la caché compara contenido, no identidad."""
+    return tuple(valor.copy() if hasattr(valor, 'copy') else valor for valor in datos)
+
+
+@pytest.mark.parametrize('metodo', METODOS_TRANSPORTE)
+@pytest.mark.parametrize('generar', [generar_transporte, generar_transporte_disperso])
+def test_cache_transporte_con_cada_motor(metodo, generar):
+    if metodo == 'pulp' and importlib.util.find_spec('pulp') is None:
+        pytest.skip("PuLP no está instalado")
+    cache = CacheSoluciones()
+    datos = generar(5, 10, 0, 'exceso_demanda')
+    primero = AsignacionProgramadoresTareas(*copia(datos), cache=cache)
+    asignaciones, costo = primero.resolver(metodo)
+
+    segundo = AsignacionProgramadoresTareas(*copia(datos), cache=cache)
+    asignaciones_cache, costo_cache = segundo.resolver(metodo)
+    assert (cache.aciertos, cache.fallos) == (1, 1)
+    assert set(segundo.tiempos) == {'cache'}
+    assert costo_cache == costo
+    for nombre in ('filas', 'columnas', 'cantidades', 'costos'):
+        np.testing.assert_array_equal(getattr(asignaciones_cache, nombre), getattr(asignaciones, nombre))
+    assert segundo.heuristica == primero.heuristica
+    assert (segundo.heuristica is None) == (metodo != 'heuristico')
+
+    # Otro motor o un costo distinto son otra entrada
+    otro = [nombre for nombre in METODOS_TRANSPORTE if nombre not in (metodo, 'pulp')][0]
+    AsignacionProgramadoresTareas(*copia(datos), cache=cache).resolver(otro)
+    N, M, C, S, D = copia(datos)
+    C[0, C[0].nonzero()[-1][0]] += 1
+    AsignacionProgramadoresTareas(N, M, C, S, D, cache=cache).resolver(metodo)
+    assert (cache.aciertos, cache.fallos) == (1, 3)
+
+
+def test_cache_y_actualizacion_incremental():
+    cache = CacheSoluciones()
+    datos = generar_transporte(5, 10, 1)
+    AsignacionProgramadoresTareas(*copia(datos), cache=cache).resolver()
+    problema = AsignacionProgramadoresTareas(*copia(datos), cache=cache)
+    problema.resolver()
+    assert problema.simplex is None
+    # Sin simplex guardado la actualización resuelve desde cero
+    _, costo = problema.actualizar_costos(0, 0, 1000.0)
+    N, M, C, S, D = copia(datos)
+    C[0, 0] = 1000.0
+    assert costo == pytest.approx(AsignacionProgramadoresTareas(N, M, C, S, D).resolver('highs')[1])
+
+
+@pytest.mark.parametrize('metodo', METODOS_SERVIDORES)
+@pytest.mark.parametrize('en_sitio', [False, True])
+def test_cache_servidores_con_cada_metodo(metodo, en_sitio):
+    cache = CacheSoluciones()
+    datos = generar_servidores(4, 12, 2)
+    primero = AsignacionSolicitudesServidores(*copia(datos), cache=cache, en_sitio=en_sitio)
+    asignaciones, tiempo_total, carga = primero.resolver(metodo)
+    segundo = AsignacionSolicitudesServidores(*copia(datos), cache=cache, en_sitio=en_sitio)
+    asignaciones_cache, tiempo_cache, carga_cache = segundo.resolver(metodo)
+    assert (cache.aciertos, cache.fallos) == (1, 1)
+    assert tiempo_cache == pytest.approx(tiempo_total)
+    np.testing.assert_array_equal(carga_cache, carga)
+    np.testing.assert_array_equal(asignaciones_cache.columnas, asignaciones.columnas)
+    # Con el ajuste en sitio la primera resolución recupera los tiempos deshaciendo el factor
+    np.testing.assert_allclose(asignaciones_cache.costos, asignaciones.costos)
+
+
+def test_desalojo_lru_y_nivel_en_disco(tmp_path):
+    solucion = {'x': np.zeros(10)} # 80 bytes
+    cache = CacheSoluciones(limite_bytes=200, directorio=str(tmp_path))
+    cache.guardar('a', solucion)
+    cache.guardar('b', solucion)
+    assert cache.obtener('a') is not None # 'a' pasa a ser la más usada
+    cache.guardar('c', solucion)
+    estadisticas = cache.estadisticas()
+    assert estadisticas['desalojos'] == 1 and estadisticas['entradas'] == 2
+    assert estadisticas['bytes_usados'] <= 200
+
+    # 'b' salió de la memoria pero sigue en disco
+    np.testing.assert_array_equal(cache.obtener('b')['x'], solucion['x'])
+    assert cache.aciertos_disco == 1
+    nueva = CacheSoluciones(directorio=str(tmp_path))
+    assert nueva.obtener('c') is not None and nueva.obtener('d') is None
+    assert nueva.estadisticas()['tasa_aciertos'] == 0.5
+
+
+def test_clave_por_contenido():
+    costos = np.arange(6, dtype=np.float64).reshape(2, 3)
+    assert CacheSoluciones.clave('hungaro', costos) == CacheSoluciones.clave('hungaro', costos.copy())
+    assert CacheSoluciones.clave('hungaro', costos) != CacheSoluciones.clave('hungaro', costos.reshape(3, 2))
+    assert CacheSoluciones.clave('hungaro', costos) != CacheSoluciones.clave('hungaro', costos.astype(np.float32))
+    assert CacheSoluciones.clave('hungaro', costos) != CacheSoluciones.clave('flujo_costo_minimo', costos)
@@ -0,0 +1,144 @@
+import csv
+import importlib.util
+import io
+import json
+import re
+
+import numpy as np
+import pytest
+from exportacion_resultados import escribir_jsonl, exportar_resultado, reemplazar_no_finitos, ruta_resumen
+from generadores import generar_servidores, generar_transporte
+from modulo_asignacion_programadores import AsignacionProgramadoresTareas
+from modulo_asignacion_servidores import AsignacionSolicitudesServidores
+
+
+def problema_transporte():
+    problema = AsignacionProgramadoresTareas(*generar_transporte(4, 9, 2, 'exceso_oferta'))
+    problema.resolver()
+    return problema
+
+
+def problema_servidores():
+    problema = AsignacionSolicitudesServidores(*generar_servidores(3, 8, 1))
+    problema.resolver('hungaro_replicado')
+    return problema
+
+
+@pytest.mark.parametrize('crear', [problema_transporte, problema_servidores])
+@pytest.mark.parametrize('tamano_bloque', [1, 3, 10000])
+def test_reporte_por_bloques_igual_al_completo(crear, tamano_bloque):
+    problema = crear()
+    por_bloques = ''.join(problema.lineas_reporte(tamano_bloque))
+    archivo = io.StringIO()
+    problema.escribir_reporte(archivo)
+    assert archivo.getvalue() == por_bloques == problema.generar_reporte()
+    assert problema.generar_reporte() is problema.generar_reporte()
+
+
+def test_reporte_de_transporte_detalla_cada_celda():
+    problema = problema_transporte()
+    reporte = problema.generar_reporte()
+    detalle = re.findall(r'^(Programador_\S+)\s+\| (Tarea_\S+)\s+\| (\d+)\s+\| ([\d.]+)', reporte, flags=re.M)
+    asignaciones = problema.asignaciones
+    assert len(detalle) == asignaciones.num_celdas
+    assert [int(cantidad) for _, _, cantidad, _ in detalle] == asignaciones.cantidades.tolist()
+    assert f"- Costo total mínimo: {problema.costo_total}" in reporte
+    for i, cantidad in enumerate(asignaciones.totales_por_fila(problema.num_programadores)[0].tolist()):
+        if cantidad:
+            assert f"Programador_{i}: {cantidad} tareas asignadas" in reporte
+
+
+def test_reporte_se_regenera_al_cambiar_la_solucion():
+    problema = problema_transporte()
+    anterior = problema.generar_reporte()
+    # Encarecer una celda usada cambia el costo total y, con él, el reporte
+    asignaciones = problema.asignaciones
+    problema.actualizar_costos(int(asignaciones.filas[0]), int(asignaciones.columnas[0]), 1000.0)
+    assert problema.generar_reporte() != anterior
+    assert f"- Costo total mínimo: {problema.costo_total}" in problema.generar_reporte()
+
+
+def test_reporte_heuristico_muestra_la_cota():
+    problema = AsignacionProgramadoresTareas(*generar_transporte(30, 300, 0))
+    problema.resolver('heuristico', limite_segundos=0.01)
+    reporte = problema.generar_reporte()
+    if problema.heuristica['optima']:
+        assert "- Costo total mínimo:" in reporte
+    else:
+        assert "- Cota inferior:" in reporte and "(brecha " in reporte
+
+
+def cadena_estricta(valor):
+    """parse_constant que rechaza NaN e Infinity, que no existen en JSON."""
+    raise ValueError(f"Constante no válida en JSON: {valor}")
+
+
+def test_jsonl_escribe_null_para_reales_no_finitos():
+    columnas = {'solicitud': np.array([1, 2, 3, 4]), 'tiempo': np.array([0.1 + 0.2, np.nan, np.inf, -np.inf])}
+    archivo = io.StringIO()
+    escribir_jsonl(columnas, archivo, tamano_bloque=3)
+    filas = [json.loads(linea, parse_constant=cadena_estricta) for linea in archivo.getvalue().splitlines()]
+    assert filas == [{'solicitud': 1, 'tiempo': 0.1 + 0.2}, {'solicitud': 2, 'tiempo': None},
+                     {'solicitud': 3, 'tiempo': None}, {'solicitud': 4, 'tiempo': None}]
+
+
+@pytest.mark.parametrize('crear', [problema_transporte, problema_servidores])
+@pytest.mark.parametrize('formato', ['jsonl', 'csv'])
+def test_exportar_asignaciones_y_resumen(tmp_path, crear, formato):
+    problema = crear()
+    ruta = str(tmp_path / f'asignaciones.{formato}')
+    assert exportar_resultado(problema, ruta, tamano_bloque=2) == [ruta, ruta_resumen(ruta)]
+
+    columnas = problema.columnas_resultado()
+    with open(ruta, encoding='utf-8', newline='') as archivo:
+        if formato == 'jsonl':
+            filas = [json.loads(linea, parse_constant=cadena_estricta) for linea in archivo]
+        else:
+            filas = list(csv.DictReader(archivo))
+    assert len(filas) == len(next(iter(columnas.values())))
+    for nombre, valores in columnas.items():
+        np.testing.assert_array_equal(np.array([fila[nombre] for fila in filas], dtype=valores.dtype), valores)
+
+    with open(ruta_resumen(ruta), encoding='utf-8') as archivo:
+        resumen = json.load(archivo)
+    assert resumen['formato'] == formato and resumen['num_asignaciones'] == len(filas)
+    assert 'asignaciones' not in resumen
+
+
+def test_resumen_sin_reales_no_finitos(tmp_path):
+    problema = problema_servidores()
+    problema.tiempo_total = float('inf')
+    ruta = str(tmp_path / 'asignaciones.jsonl')
+    exportar_resultado(problema, ruta)
+    with open(ruta_resumen(ruta), encoding='utf-8') as archivo:
+        resumen = json.load(archivo, parse_constant=cadena_estricta)
+    assert resumen['tiempo_total'] is None
+    assert reemplazar_no_finitos({'a': [1.5, np.nan, (-np.inf, 'x')], 'b': np.float64(np.inf)}) == {
+        'a': [1.5, None, [None, 'x']], 'b': None}
+
+
+def test_exportar_formato_desconocido(tmp_path):
+    with pytest.raises(ValueError):
+        exportar_resultado(problema_transporte(), str(tmp_path / 'asignaciones.xlsx'))
+    with pytest.raises(ValueError):
+        exportar_resultado(AsignacionSolicitudesServidores(2, 2, np.ones((2, 2))), str(tmp_path / 'a.csv'))
+
+
+@pytest.mark.skipif(importlib.util.find_spec('pyarrow') is None, reason="pyarrow no está instalado")
+@pytest.mark.parametrize('formato', ['parquet', 'arrow'])
+def test_exportar_columnar(tmp_path, formato):
+    import pyarrow.feather
+    import pyarrow.parquet
+
+    problema = problema_servidores()
+    ruta = str(tmp_path / f'asignaciones.{formato}')
+    exportar_resultado(problema, ruta, tamano_bloque=2, resumen=False)
+    tabla = pyarrow.parquet.read_table(ruta) if formato == 'parquet' else pyarrow.feather.read_table(ruta)
+    for nombre, valores in problema.columnas_resultado().items():
+        np.testing.assert_array_equal(tabla.column(nombre).to_numpy(), valores)
+
+
+@pytest.mark.skipif(importlib.util.find_spec('pyarrow') is not None, reason="pyarrow está instalado")
+def test_exportar_columnar_sin_pyarrow(tmp_path):
+    with pytest.raises(ImportError, match='pyarrow'):
+        exportar_resultado(problema_servidores(), str(tmp_path / 'asignaciones.parquet'))
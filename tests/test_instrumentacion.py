@@ -0,0 +1,105 @@
+import json
+import os
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+from generadores import generar_servidores, generar_transporte
+from instrumentacion import Instrumentacion
+from modulo_asignacion_programadores import AsignacionProgramadoresTareas
+from modulo_asignacion_programadores import resolver_archivo as resolver_archivo_transporte
+from modulo_asignacion_servidores import AsignacionSolicitudesServidores
+from modulo_asignacion_servidores import resolver_archivo as resolver_archivo_servidores
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_fases_anidadas_y_repetidas():
+    instrumentacion = Instrumentacion()
+    with instrumentacion.fase('exterior') as exterior:
+        for _ in range(3):
+            with instrumentacion.fase('interior'):
+                time.sleep(0.01)
+    assert list(instrumentacion.fases) == ['exterior', 'interior']
+    assert instrumentacion.fases['exterior']['llamadas'] == 1
+    assert instrumentacion.fases['interior']['llamadas'] == 3
+    # La fase exterior incluye el tiempo de las internas
+    assert exterior.segundos == instrumentacion.segundos('exterior') >= instrumentacion.segundos('interior') >= 0.03
+    assert instrumentacion.segundos('inexistente') == 0.0
+    assert instrumentacion.fases['exterior']['pico_memoria'] is None and instrumentacion.perfil() is None
+
+
+def test_fase_registrada_aunque_falle():
+    instrumentacion = Instrumentacion()
+    with pytest.raises(RuntimeError):
+        with instrumentacion.fase('fallida'):
+            raise RuntimeError
+    assert instrumentacion.fases['fallida']['llamadas'] == 1
+
+
+def test_pico_de_memoria_por_fase():
+    instrumentacion = Instrumentacion(medir_memoria=True)
+    with instrumentacion.fase('exterior'):
+        with instrumentacion.fase('grande'):
+            matriz = np.ones(1_000_000) # 8 MB
+            del matriz
+        with instrumentacion.fase('pequena'):
+            vector = np.ones(1000)
+            del vector
+    fases = instrumentacion.fases
+    assert fases['grande']['pico_memoria'] >= 8_000_000
+    assert fases['pequena']['pico_memoria'] < 1_000_000
+    # El pico de la fase interna se propaga a la externa aunque la siguiente fase lo reinicie
+    assert fases['exterior']['pico_memoria'] >= fases['grande']['pico_memoria']
+    # tracemalloc solo queda activo mientras haya una fase abierta
+    assert not tracemalloc.is_tracing()
+
+
+def test_perfil_con_cprofile(tmp_path):
+    def funcion_perfilada():
+        return sum(range(10000))
+
+    instrumentacion = Instrumentacion(perfilar=True)
+    with instrumentacion.fase('calculo'):
+        funcion_perfilada()
+    funcion_perfilada() # Fuera de una fase no se perfila
+    filas = [fila for fila in instrumentacion.perfil() if 'funcion_perfilada' in fila['funcion']]
+    assert len(filas) == 1 and filas[0]['llamadas'] == 1
+    assert set(filas[0]) == {'funcion', 'llamadas', 'tiempo_propio', 'tiempo_acumulado'}
+
+    ruta = tmp_path / 'perfil.pstats'
+    instrumentacion.guardar_perfil(str(ruta))
+    assert ruta.stat().st_size > 0
+    with pytest.raises(ValueError):
+        Instrumentacion().guardar_perfil(str(ruta))
+
+
+@pytest.mark.parametrize('metodo, fases', [
+    ('simplex_red', {'balanceo', 'solucion_inicial', 'resolucion', 'extraccion'}),
+    ('highs', {'balanceo', 'construccion_modelo', 'resolucion', 'extraccion'}),
+    ('heuristico', {'balanceo', 'solucion_inicial', 'cota_inferior', 'extraccion'}),
+])
+def test_fases_de_la_resolucion_de_transporte(metodo, fases):
+    instrumentacion = Instrumentacion()
+    problema = AsignacionProgramadoresTareas(*generar_transporte(5, 12, 0, 'exceso_demanda'),
+                                             instrumentacion=instrumentacion)
+    problema.resolver(metodo)
+    assert fases <= set(instrumentacion.fases)
+    for nombre, segundos in problema.tiempos.items():
+        assert instrumentacion.segundos(nombre) >= segundos
+
+
+def test_fases_de_la_resolucion_de_servidores():
+    instrumentacion = Instrumentacion()
+    AsignacionSolicitudesServidores(*generar_servidores(4, 10, 0), instrumentacion=instrumentacion).resolver('hungaro')
+    assert {'ajuste_prioridad', 'relleno', 'resolucion', 'extraccion'} <= set(instrumentacion.fases)
+
+
+@pytest.mark.parametrize('resolver_archivo, ruta', [(resolver_archivo_transporte, 'programadores.txt'),
+                                                    (resolver_archivo_servidores, 'servidores.txt')])
+def test_resultado_incluye_la_instrumentacion(resolver_archivo, ruta):
+    resultado = resolver_archivo(os.path.join(RAIZ, ruta), instrumentacion=Instrumentacion(medir_memoria=True))
+    datos = json.loads(json.dumps(resultado))['instrumentacion']
+    assert {'lectura', 'resolucion'} <= set(datos['fases'])
+    assert all(fase['pico_memoria'] is not None for fase in datos['fases'].values())
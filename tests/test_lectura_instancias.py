@@ -0,0 +1,109 @@
+import os
+
+import numpy as np
+import pytest
+from generadores import generar_servidores_disperso, generar_transporte, generar_transporte_disperso
+from lectura_instancias import (guardar_instancia_programadores, guardar_instancia_servidores, instancia_desde_bytes,
+                                leer_instancia_binaria, leer_instancia_programadores, leer_instancia_servidores)
+from modulo_asignacion_programadores import AsignacionProgramadoresTareas, MainProgramadores
+from modulo_asignacion_servidores import MainServidores
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_leer_ejemplos_de_texto():
+    N, M, C, S, D = leer_instancia_programadores(os.path.join(RAIZ, 'programadores.txt'))
+    assert (N, M) == (3, 4)
+    assert C.dtype == np.float64 and S.dtype == D.dtype == np.int64
+    np.testing.assert_array_equal(C, [[180, 150, 200, 200], [250, 305, 450, 500], [200, 208, 320, 100]])
+    np.testing.assert_array_equal(S, [2, 3, 1])
+    np.testing.assert_array_equal(D, [1, 2, 1, 1])
+
+    S, R, C, prioridades, capacidades = leer_instancia_servidores(os.path.join(RAIZ, 'servidores.txt'))
+    assert (S, R) == (3, 5)
+    np.testing.assert_array_equal(C, [[10, 15, 20, 8, 12], [18, 13, 16, 9, 14], [12, 11, 19, 7, 15]])
+    np.testing.assert_array_equal(prioridades, [1, 2, 3, 1, 2])
+    np.testing.assert_array_equal(capacidades, [3, 4, 2])
+
+
+def test_los_menus_leen_igual_que_el_lector():
+    ruta = os.path.join(RAIZ, 'programadores.txt')
+    for menu, lector in ((MainProgramadores().leer_datos_archivo(ruta), leer_instancia_programadores(ruta)),
+                         (MainServidores().leer_datos_archivo(os.path.join(RAIZ, 'servidores.txt')),
+                          leer_instancia_servidores(os.path.join(RAIZ, 'servidores.txt')))):
+        for valor_menu, valor_lector in zip(menu, lector):
+            np.testing.assert_array_equal(valor_menu, valor_lector)
+
+
+@pytest.mark.parametrize('contenido', [
+    "2\n2\n1 2\n3\n1 1\n1 1\n", # Fila de costos corta
+    "2\n2\n1 2\n3 x\n1 1\n1 1\n", # Costo no numérico
+    "2\n2\n1 2\n3 4\n1 1\n", # Falta la línea de demandas
+    "0\n2\n", # N no positivo
+])
+def test_errores_de_formato(tmp_path, contenido):
+    ruta = tmp_path / 'instancia.txt'
+    ruta.write_text(contenido)
+    with pytest.raises(ValueError):
+        leer_instancia_programadores(str(ruta))
+
+
+def test_lista_de_arcos(tmp_path):
+    ruta = tmp_path / 'arcos.txt'
+    ruta.write_text("2 3 4\n3 2\n2 2 1\n0 0 5\n0 1 4\n1 1 2\n1 2 3\n")
+    N, M, C, S, D = leer_instancia_programadores(str(ruta))
+    assert (N, M) == (2, 3) and hasattr(C, 'tocsr') and C.nnz == 4
+    assert C[1, 2] == 3 and C[0, 2] == 0
+    # Tarea 0 con el programador 0, tarea 2 con el 1 y la tarea 1 repartida entre los dos
+    for metodo in ('simplex_red', 'highs'):
+        assert AsignacionProgramadoresTareas(N, M, C, S, D).resolver(metodo)[1] == pytest.approx(19)
+
+
+def test_instancia_binaria_de_programadores(tmp_path):
+    N, M, C, S, D = generar_transporte(4, 7)
+    ruta = str(tmp_path / 'programadores.npz')
+    guardar_instancia_programadores(ruta, C, S, D, {'origen': 'prueba'})
+
+    N_leido, M_leido, C_leido, S_leido, D_leido = leer_instancia_programadores(ruta)
+    assert (N_leido, M_leido) == (N, M)
+    # La matriz queda mapeada en memoria, de solo lectura
+    assert isinstance(C_leido, np.memmap) and not C_leido.flags.writeable
+    np.testing.assert_array_equal(C_leido, C)
+    np.testing.assert_array_equal(S_leido, S)
+    np.testing.assert_array_equal(D_leido, D)
+    assert leer_instancia_binaria(ruta)['metadatos'] == {'origen': 'prueba', 'tipo': 'programadores'}
+
+    with open(ruta, 'rb') as f:
+        en_memoria = instancia_desde_bytes(f.read(), 'programadores')
+    np.testing.assert_array_equal(en_memoria['costos'], C)
+    with pytest.raises(ValueError):
+        leer_instancia_servidores(ruta)
+
+    # La matriz mapeada se resuelve igual que la original
+    costo = AsignacionProgramadoresTareas(N, M, C, S, D).resolver()[1]
+    assert AsignacionProgramadoresTareas(N, M, C_leido, S_leido, D_leido).resolver()[1] == pytest.approx(costo)
+
+
+def test_instancias_binarias_dispersas(tmp_path):
+    N, M, C, S, D = generar_transporte_disperso(5, 12, 2)
+    ruta = str(tmp_path / 'programadores.npz')
+    guardar_instancia_programadores(ruta, C, S, D)
+    _, _, C_leido, _, _ = leer_instancia_programadores(ruta)
+    assert hasattr(C_leido, 'tocsr') and (C_leido != C).nnz == 0
+
+    S, R, C, prioridades, capacidades = generar_servidores_disperso(4, 9, 3)
+    ruta = str(tmp_path / 'servidores.npz')
+    guardar_instancia_servidores(ruta, C, prioridades, capacidades)
+    leido = leer_instancia_servidores(ruta)
+    assert leido[:2] == (S, R) and (leido[2] != C).nnz == 0
+    np.testing.assert_array_equal(leido[3], prioridades)
+    np.testing.assert_array_equal(leido[4], capacidades)
+
+
+def test_instancia_binaria_de_servidores_sin_vectores(tmp_path):
+    C = np.arange(6, dtype=np.float64).reshape(2, 3)
+    ruta = str(tmp_path / 'servidores.npz')
+    guardar_instancia_servidores(ruta, C)
+    S, R, C_leido, prioridades, capacidades = leer_instancia_servidores(ruta)
+    assert (S, R) == (2, 3) and prioridades is None and capacidades is None
+    np.testing.assert_array_equal(C_leido, C)
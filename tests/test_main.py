@@ -0,0 +1,95 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from lectura_instancias import leer_instancia_programadores
+from main import ejecutar_linea_comandos
+from modulo_asignacion_programadores import AsignacionProgramadoresTareas
+from modulo_asignacion_programadores import resolver_archivo as resolver_archivo_transporte
+from modulo_asignacion_servidores import resolver_archivo as resolver_archivo_servidores
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROGRAMADORES = os.path.join(RAIZ, 'programadores.txt')
+SERVIDORES = os.path.join(RAIZ, 'servidores.txt')
+
+
+def test_linea_de_comandos_transporte(tmp_path):
+    salida = tmp_path / 'resultado.json'
+    assert ejecutar_linea_comandos(['transporte', '-i', PROGRAMADORES, '--metodo', 'highs', '-o', str(salida)]) == 0
+    resultado = json.loads(salida.read_text(encoding='utf-8'))
+    assert resultado['archivo'] == PROGRAMADORES and resultado['metodo'] == 'highs'
+    costo = AsignacionProgramadoresTareas(*leer_instancia_programadores(PROGRAMADORES)).resolver('simplex_red')[1]
+    assert resultado['costo_total'] == pytest.approx(costo)
+    assert sum(resultado['asignaciones']['cantidades']) == 6
+
+
+def test_linea_de_comandos_sigue_tras_un_error(tmp_path, capsys):
+    malo = tmp_path / 'malo.txt'
+    malo.write_text("x\n")
+    assert ejecutar_linea_comandos(['servidores', '-i', SERVIDORES, str(malo), '--metodo', 'flujo_costo_minimo']) == 1
+    resultados = json.loads(capsys.readouterr().out)
+    assert [('error' in resultado) for resultado in resultados] == [False, True]
+    assert resultados[0] == resolver_archivo_servidores(SERVIDORES, 'flujo_costo_minimo') | {
+        'instrumentacion': resultados[0]['instrumentacion']}
+
+
+def test_linea_de_comandos_con_directorio_y_exportacion(tmp_path, capsys):
+    for nombre in ('a.txt', 'b.txt'):
+        with open(PROGRAMADORES) as origen, open(tmp_path / nombre, 'w') as destino:
+            destino.write(origen.read())
+    exportados = tmp_path / 'exportados'
+    assert ejecutar_linea_comandos(['transporte', '-i', str(tmp_path), '--exportar', str(exportados),
+                                    '--formato', 'csv']) == 0
+    resultados = json.loads(capsys.readouterr().out)
+    assert [os.path.basename(resultado['archivo']) for resultado in resultados] == ['a.txt', 'b.txt']
+    assert sorted(os.listdir(exportados)) == ['a.csv', 'a.resumen.json', 'b.csv', 'b.resumen.json']
+    assert 'asignaciones' not in resultados[0]
+
+
+def test_convertir_a_binario(tmp_path, capsys):
+    assert ejecutar_linea_comandos(['convertir', 'transporte', '-i', PROGRAMADORES, '-o', str(tmp_path)]) == 0
+    destino = capsys.readouterr().out.strip()
+    assert destino == str(tmp_path / 'programadores.npz')
+    for binario, texto in zip(leer_instancia_programadores(destino), leer_instancia_programadores(PROGRAMADORES)):
+        np.testing.assert_array_equal(binario, texto)
+    assert resolver_archivo_transporte(destino)['costo_total'] == resolver_archivo_transporte(PROGRAMADORES)['costo_total']
+
+
+def test_metodo_invalido_en_la_linea_de_comandos(capsys):
+    with pytest.raises(SystemExit):
+        ejecutar_linea_comandos(['servidores', '-i', SERVIDORES, '--metodo', 'inexistente'])
+
+
+def modulos_cargados(codigo):
+    """Módulos pesados que quedan en sys.modules tras ejecutar el código en un intérprete nuevo."""
+    codigo += "; import sys; print(','.join(sorted({m.split('.')[0] for m in sys.modules} & {'pandas', 'pulp', 'scipy'})))"
+    salida = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, check=True, capture_output=True, text=True)
+    return [modulo for modulo in salida.stdout.strip().split(',') if modulo]
+
+
+def test_importar_los_modulos_no_carga_scipy_ni_pulp():
+    assert modulos_cargados("import main") == []
+    assert modulos_cargados("import modulo_asignacion_programadores, modulo_asignacion_servidores, servicio") == []
+
+
+def test_cada_motor_carga_solo_lo_que_usa():
+    assert modulos_cargados("from modulo_asignacion_programadores import resolver_archivo; "
+                            "resolver_archivo('programadores.txt', 'simplex_red')") == []
+    assert 'pulp' not in modulos_cargados("from modulo_asignacion_programadores import resolver_archivo; "
+                                          "resolver_archivo('programadores.txt', 'highs')")
+
+
+def test_linea_de_comandos_escribe_null_para_reales_no_finitos(monkeypatch, capsys):
+    import modulo_asignacion_servidores
+
+    monkeypatch.setattr(modulo_asignacion_servidores, 'resolver_archivo',
+                        lambda archivo, metodo, *argumentos: {'archivo': archivo, 'tiempo_total': float('nan'),
+                                                              'tiempos': [1.0, float('inf')]})
+    assert ejecutar_linea_comandos(['servidores', '-i', SERVIDORES]) == 0
+    salida = capsys.readouterr().out
+    assert 'NaN' not in salida and 'Infinity' not in salida
+    resultado = json.loads(salida)
+    assert resultado['tiempo_total'] is None and resultado['tiempos'] == [1.0, None]
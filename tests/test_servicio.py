@@ -0,0 +1,183 @@
+import asyncio
+import json
+import time
+
+import numpy as np
+import pytest
+from generadores import generar_servidores
+from modulo_asignacion_servidores import AsignacionSolicitudesServidores
+from servicio import ErrorServicio, ServicioAsignacion
+
+
+def instancia(semilla, metodo='flujo_costo_minimo'):
+    _, _, C, prioridades, capacidades = generar_servidores(3, 9, semilla)
+    return {'matriz_costos': C.tolist(), 'prioridades': prioridades.tolist(),
+            'capacidades': capacidades.tolist(), 'metodo': metodo}
+
+
+def peticion(metodo_http, ruta, datos=None, cerrar=True):
+    cuerpo = b'' if datos is None else json.dumps(datos).encode('utf-8')
+    cabeceras = [f'{metodo_http} {ruta} HTTP/1.1', 'Host: prueba', 'Content-Type: application/json',
+                 f'Content-Length: {len(cuerpo)}']
+    if cerrar:
+        cabeceras.append('Connection: close')
+    return ('\r\n'.join(cabeceras) + '\r\n\r\n').encode('latin-1') + cuerpo
+
+
+def separar_respuestas(datos):
+    """Lista de (código, cabeceras, cuerpo JSON) de las respuestas concatenadas."""
+    respuestas = []
+    while datos:
+        cabecera, _, datos = datos.partition(b'\r\n\r\n')
+        lineas = cabecera.decode('latin-1').split('\r\n')
+        cabeceras = dict(linea.split(': ', 1) for linea in lineas[1:])
+        longitud = int(cabeceras['Content-Length'])
+        respuestas.append((int(lineas[0].split(' ')[1]), cabeceras, json.loads(datos[:longitud])))
+        datos = datos[longitud:]
+    return respuestas
+
+
+async def enviar(puerto, *peticiones):
+    """Envía las peticiones por una conexión y lee hasta el fin de archivo."""
+    lector, escritor = await asyncio.open_connection('127.0.0.1', puerto)
+    escritor.write(b''.join(peticiones))
+    await escritor.drain()
+    # Si el servicio no cerrara la conexión tras 'Connection: close' esto no terminaría
+    datos = await asyncio.wait_for(lector.read(), timeout=30)
+    escritor.close()
+    return separar_respuestas(datos)
+
+
+async def esperar(condicion, limite=30):
+    inicio = time.monotonic()
+    while not condicion():
+        assert time.monotonic() - inicio < limite
+        await asyncio.sleep(0.01)
+
+
+def ejecutar_con_servicio(prueba, **opciones):
+    """Ejecuta la corrutina prueba(servicio, puerto) con un servicio escuchando en un puerto libre."""
+    async def principal():
+        servicio = ServicioAsignacion(**opciones)
+        servidor = await servicio.iniciar('127.0.0.1', 0)
+        try:
+            await prueba(servicio, servidor.sockets[0].getsockname()[1])
+        finally:
+            servidor.close()
+            await servidor.wait_closed()
+            servicio.ejecutor.shutdown(cancel_futures=True)
+
+    asyncio.run(principal())
+
+
+def test_coalescencia_y_rechazo_por_saturacion():
+    async def prueba(servicio, puerto):
+        # Un trabajo largo ocupa el único proceso; la primera instancia queda en la cola
+        bloqueo = asyncio.create_task(servicio.resolver(time.sleep, (1.0,)))
+        await esperar(lambda: servicio.estado()['en_ejecucion'] == 1)
+        primera = asyncio.create_task(enviar(puerto, peticion('POST', '/servidores', instancia(0))))
+        await esperar(lambda: servicio.metricas['recibidas'] == 2)
+
+        # Una instancia idéntica espera el mismo resultado; otra distinta no cabe
+        segunda = asyncio.create_task(enviar(puerto, peticion('POST', '/servidores', instancia(0))))
+        await esperar(lambda: servicio.metricas['coalescidas'] == 1)
+        [(estado, cabeceras, cuerpo)] = await enviar(puerto, peticion('POST', '/servidores', instancia(1)))
+        assert estado == 503 and cabeceras['Retry-After'] == '1' and 'error' in cuerpo
+        assert servicio.estado()['en_cola'] == 1
+
+        await bloqueo
+        [(estado_a, _, resultado_a)] = await primera
+        [(estado_b, _, resultado_b)] = await segunda
+        assert estado_a == estado_b == 200
+        assert resultado_a['asignaciones'] == resultado_b['asignaciones']
+
+        datos = instancia(0)
+        C = np.array(datos['matriz_costos'])
+        directo = AsignacionSolicitudesServidores(3, 9, C, np.array(datos['prioridades']),
+                                                  np.array(datos['capacidades']))
+        directo.resolver('flujo_costo_minimo')
+        assert resultado_a['tiempo_total'] == pytest.approx(directo.resultado()['tiempo_total'])
+
+        metricas = servicio.estado()
+        assert (metricas['recibidas'], metricas['coalescidas'], metricas['rechazadas']) == (4, 1, 1)
+        assert (metricas['completadas'], metricas['en_cola'], metricas['en_ejecucion']) == (2, 0, 0)
+
+    ejecutar_con_servicio(prueba, max_procesos=1, limite_cola=1)
+
+
+def test_peticiones_invalidas_y_metricas():
+    async def prueba(servicio, puerto):
+        respuestas = await enviar(puerto, peticion('POST', '/servidores', instancia(0, 'inexistente'), cerrar=False),
+                                  peticion('POST', '/servidores', {'prioridades': [1]}, cerrar=False),
+                                  peticion('GET', '/inexistente', cerrar=False),
+                                  peticion('GET', '/metricas'))
+        assert [estado for estado, _, _ in respuestas] == [400, 400, 404, 200]
+        assert 'metodo desconocido' in respuestas[0][2]['error']
+        # Las peticiones inválidas se rechazan antes de llegar a la cola
+        assert respuestas[3][2]['recibidas'] == 0
+        # Keep-alive hasta la última petición, que pide cerrar
+        assert [cabeceras['Connection'] for _, cabeceras, _ in respuestas] == ['keep-alive'] * 3 + ['close']
+
+    ejecutar_con_servicio(prueba, max_procesos=1)
+
+
+def test_error_en_la_resolucion_llega_a_las_peticiones_coalescidas():
+    async def prueba(servicio, puerto):
+        bloqueo = asyncio.create_task(servicio.resolver(time.sleep, (0.5,)))
+        await esperar(lambda: servicio.estado()['en_ejecucion'] == 1)
+        # Las prioridades no coinciden con las solicitudes: falla en el proceso de resolución
+        datos = {'matriz_costos': [[1.0, 2.0, 3.0]], 'prioridades': [1.0, 2.0], 'metodo': 'flujo_costo_minimo'}
+        respuestas = await asyncio.gather(enviar(puerto, peticion('POST', '/servidores', datos)),
+                                          enviar(puerto, peticion('POST', '/servidores', datos)))
+        await bloqueo
+        estados = [estado for [(estado, _, _)] in respuestas]
+        assert estados == [500, 500]
+        assert servicio.metricas['coalescidas'] == 1 and servicio.metricas['errores'] == 1
+
+    ejecutar_con_servicio(prueba, max_procesos=1)
+
+
+def test_rechazo_directo_sin_http():
+    async def prueba(servicio, puerto):
+        bloqueo = asyncio.create_task(servicio.resolver(time.sleep, (0.3,)))
+        await esperar(lambda: servicio.estado()['en_ejecucion'] == 1)
+        with pytest.raises(ErrorServicio) as error:
+            await servicio.resolver(time.sleep, (0.1,))
+        assert error.value.estado == 503
+        await bloqueo
+
+    ejecutar_con_servicio(prueba, max_procesos=1, limite_cola=0)
+
+
+async def enviar_crudo(puerto, datos):
+    lector, escritor = await asyncio.open_connection('127.0.0.1', puerto)
+    escritor.write(datos)
+    await escritor.drain()
+    respuesta = await asyncio.wait_for(lector.read(), timeout=30)
+    escritor.close()
+    return separar_respuestas(respuesta)
+
+
+@pytest.mark.parametrize('longitud', ['abc', '-5', ''])
+def test_content_length_invalido(longitud):
+    async def prueba(servicio, puerto):
+        cabecera = f'POST /servidores HTTP/1.1\r\nHost: prueba\r\nContent-Length: {longitud}\r\n\r\n'
+        [(estado, cabeceras, cuerpo)] = await enviar_crudo(puerto, cabecera.encode('latin-1') + b'{}')
+        assert estado == 400 and 'Content-Length' in cuerpo['error']
+        # Sin saber dónde termina el cuerpo, la conexión se cierra
+        assert cabeceras['Connection'] == 'close'
+
+    ejecutar_con_servicio(prueba, max_procesos=1)
+
+
+def test_cuerpo_demasiado_grande():
+    async def prueba(servicio, puerto):
+        [(estado, cabeceras, cuerpo)] = await enviar(puerto, peticion('POST', '/servidores', instancia(0), cerrar=False))
+        assert estado == 413 and cabeceras['Connection'] == 'close' and '100 bytes' in cuerpo['error']
+        # El cuerpo no se leyó ni llegó a la cola
+        assert servicio.metricas['recibidas'] == 0
+
+        [(estado, _, _)] = await enviar(puerto, peticion('POST', '/servidores', {'matriz_costos': [[1.0]]}))
+        assert estado == 200
+
+    ejecutar_con_servicio(prueba, max_procesos=1, max_cuerpo=100)
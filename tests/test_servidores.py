@@ -0,0 +1,291 @@
+import time
+
+import numpy as np
+import pytest
+from scipy.optimize import linear_sum_assignment
+from generadores import generar_servidores, generar_servidores_disperso
+from lectura_instancias import matriz_arcos
+from modulo_asignacion_servidores import (METODOS_RESOLUCION, AsignacionEnLinea, AsignacionSolicitudesServidores,
+                                          contar_inversiones, listar_inversiones, resolver_lote)
+
+
+def factores(prioridades):
+    """Factores de prioridad como en AsignacionSolicitudesServidores.calcular_factores_prioridad."""
+    prioridades = np.asarray(prioridades, dtype=np.float64)
+    return 1 + (1 - prioridades / prioridades.max())
+
+
+def costo_ajustado(problema):
+    """Objetivo que minimizan los tres métodos: suma de los costos ajustados por prioridad."""
+    asignaciones = problema.asignaciones
+    return float((asignaciones.costos / problema.factores_prioridad[asignaciones.columnas]).sum())
+
+
+def optimo_replicado(C, prioridades, capacidades):
+    """Costo ajustado óptimo y solicitudes asignadas, con linear_sum_assignment sobre servidores replicados."""
+    ajustada = C / factores(prioridades)
+    servidor_de_fila = np.repeat(np.arange(C.shape[0]), np.minimum(capacidades, C.shape[1]).astype(np.int64))
+    filas, columnas = linear_sum_assignment(ajustada[servidor_de_fila])
+    return float(ajustada[servidor_de_fila[filas], columnas].sum()), len(filas)
+
+
+@pytest.mark.parametrize('holgura', [1.5, 1.0, 0.6])
+@pytest.mark.parametrize('semilla', range(3))
+def test_flujo_costo_minimo_coincide_con_hungaro_replicado(holgura, semilla):
+    S, R, C, prioridades, capacidades = generar_servidores(6, 30, semilla, holgura=holgura)
+    referencia, asignadas = optimo_replicado(C, prioridades, capacidades)
+    for metodo in ('flujo_costo_minimo', 'hungaro_replicado'):
+        problema = AsignacionSolicitudesServidores(S, R, C, prioridades, capacidades)
+        problema.resolver(metodo)
+        assert costo_ajustado(problema) == pytest.approx(referencia)
+        # Si la capacidad no alcanza se ocupan todos los lugares y sobran solicitudes sin asignar
+        assert len(problema.asignaciones) == asignadas == min(R, int(capacidades.sum()))
+        assert np.unique(problema.asignaciones.columnas).size == asignadas
+        assert (problema.carga_servidores <= capacidades).all()
+        assert not problema.verificar_restricciones()['capacidad_excedida']
+        assert problema.tiempo_total == pytest.approx(C[problema.asignaciones.filas, problema.asignaciones.columnas].sum())
+
+
+@pytest.mark.parametrize('forma', [(5, 200), (12, 40), (40, 25)])
+@pytest.mark.parametrize('semilla', range(3))
+def test_flujo_costo_minimo_con_empates(forma, semilla):
+    # Costos enteros de 1 a 4: casi todas las solicitudes empatan entre varios servidores
+    S, R, C, prioridades, capacidades = generar_servidores(*forma, semilla)
+    C = np.ceil(C / C.max() * 4)
+    problema = AsignacionSolicitudesServidores(S, R, C, prioridades, capacidades)
+    problema.resolver('flujo_costo_minimo')
+    referencia, asignadas = optimo_replicado(C, prioridades, capacidades)
+    assert costo_ajustado(problema) == pytest.approx(referencia)
+    assert len(problema.asignaciones) == asignadas
+    assert (problema.carga_servidores <= capacidades).all()
+
+
+def test_flujo_costo_minimo_escala_casi_linealmente():
+    tiempos = {}
+    for R in (12500, 100000):
+        S, R, C, prioridades, capacidades = generar_servidores(50, R, 0)
+        problema = AsignacionSolicitudesServidores(S, R, C, prioridades, capacidades)
+        inicio = time.perf_counter()
+        problema.resolver('flujo_costo_minimo')
+        tiempos[R] = time.perf_counter() - inicio
+        assert len(problema.asignaciones) == R
+        assert (problema.carga_servidores <= capacidades).all()
+    # Ocho veces más solicitudes: lineal da 8, cuadrático 64 (el simplex de redes tardaba 60 veces más)
+    assert tiempos[100000] < 24 * tiempos[12500]
+
+
+def test_hungaro_replicado_con_capacidad_uno_es_el_hungaro():
+    S, R, C, prioridades, _ = generar_servidores(8, 12, 4)
+    unos = np.ones(S)
+    replicado = AsignacionSolicitudesServidores(S, R, C, prioridades, unos)
+    replicado.resolver('hungaro_replicado')
+    hungaro = AsignacionSolicitudesServidores(S, R, C, prioridades)
+    hungaro.resolver('hungaro')
+    assert len(replicado.asignaciones) == len(hungaro.asignaciones) == S
+    assert costo_ajustado(replicado) == pytest.approx(costo_ajustado(hungaro))
+    assert costo_ajustado(hungaro) == pytest.approx(optimo_replicado(C, prioridades, unos)[0])
+
+
+def test_hungaro_replicado_sin_capacidades_elige_el_servidor_mas_barato():
+    S, R, C, prioridades, _ = generar_servidores(5, 20, 6, holgura=None)
+    problema = AsignacionSolicitudesServidores(S, R, C, prioridades)
+    problema.resolver('hungaro_replicado')
+    asignaciones = problema.asignaciones
+    np.testing.assert_array_equal(np.sort(asignaciones.columnas), np.arange(R))
+    np.testing.assert_array_equal(asignaciones.costos, C.min(axis=0)[asignaciones.columnas])
+
+
+def test_hungaro_replicado_sin_capacidades_no_replica_la_matriz():
+    # Replicar cada servidor una vez por solicitud serían 10⁹ celdas (8 GB)
+    S, R, C, prioridades, _ = generar_servidores(10, 10000, 2, holgura=None)
+    problema = AsignacionSolicitudesServidores(S, R, C, prioridades)
+    problema.resolver('hungaro_replicado')
+    ajustada = C / factores(prioridades)
+    assert len(problema.asignaciones) == R
+    assert costo_ajustado(problema) == pytest.approx(ajustada.min(axis=0).sum())
+
+
+def test_hungaro_replicado_sobre_el_limite_da_el_mismo_optimo(monkeypatch):
+    import modulo_asignacion_servidores
+
+    S, R, C, prioridades, capacidades = generar_servidores(6, 30, 1)
+    monkeypatch.setattr(modulo_asignacion_servidores, 'LIMITE_CELDAS_REPLICADAS', 0)
+    problema = AsignacionSolicitudesServidores(S, R, C, prioridades, capacidades)
+    problema.resolver('hungaro_replicado')
+    assert costo_ajustado(problema) == pytest.approx(optimo_replicado(C, prioridades, capacidades)[0])
+    assert (problema.carga_servidores <= capacidades).all()
+
+
+@pytest.mark.parametrize('semilla', range(5))
+def test_inversiones_coinciden_con_la_comparacion_por_pares(semilla):
+    rng = np.random.default_rng(semilla)
+    prioridades = rng.integers(1, 4, 60).astype(np.float64)
+    costos = rng.integers(1, 10, 60).astype(np.float64) # Con empates de prioridad y de costo
+    pares = (prioridades[:, None] < prioridades[None, :]) & (costos[:, None] > costos[None, :])
+    conteo = contar_inversiones(prioridades, costos)
+    np.testing.assert_array_equal(conteo, pares.sum(axis=1))
+    np.testing.assert_array_equal(listar_inversiones(prioridades, costos, conteo), np.argwhere(pares))
+    np.testing.assert_array_equal(listar_inversiones(prioridades, costos, conteo, maximo=5), np.argwhere(pares)[:5])
+
+
+def test_verificar_restricciones_cuenta_y_lista_los_pares():
+    S, R, C, prioridades, capacidades = generar_servidores(5, 40, 2)
+    problema = AsignacionSolicitudesServidores(S, R, C, prioridades, capacidades)
+    problema.resolver('hungaro_replicado')
+    solicitudes, tiempos = problema.asignaciones.columnas, problema.asignaciones.costos
+    asignadas = prioridades[solicitudes]
+    pares = (asignadas[:, None] < asignadas[None, :]) & (tiempos[:, None] > tiempos[None, :])
+    esperados = solicitudes[np.argwhere(pares)]
+    assert len(esperados) > 3
+
+    restricciones = problema.verificar_restricciones(max_pares=3)
+    assert restricciones['prioridad_violada']
+    assert restricciones['pares_violados'] == len(esperados)
+    np.testing.assert_array_equal(restricciones['lista_pares_violados'], esperados[:3])
+    np.testing.assert_array_equal(problema.verificar_restricciones(max_pares=None)['lista_pares_violados'], esperados)
+    assert problema.resultado()['lista_pares_violados'] == esperados[:100].tolist()
+
+
+@pytest.mark.parametrize('tipo_datos', [np.float64, np.float32])
+def test_ajuste_por_prioridad_por_columnas(tipo_datos):
+    S, R, C, prioridades, capacidades = generar_servidores(4, 10, 5)
+    problema = AsignacionSolicitudesServidores(S, R, C, prioridades, capacidades, tipo_datos=tipo_datos)
+    assert problema.matriz_costos_ajustada.dtype == tipo_datos
+    np.testing.assert_allclose(problema.matriz_costos_ajustada, C / factores(prioridades), rtol=1e-6)
+    np.testing.assert_array_equal(problema.matriz_costos, C.astype(tipo_datos))
+
+
+@pytest.mark.parametrize('metodo', METODOS_RESOLUCION)
+@pytest.mark.parametrize('forma', [(6, 6), (4, 9), (9, 4)])
+def test_ajuste_en_sitio_da_la_misma_solucion(metodo, forma):
+    S, R, C, prioridades, capacidades = generar_servidores(*forma, semilla=1)
+    copia = AsignacionSolicitudesServidores(S, R, C.copy(), prioridades, capacidades)
+    copia.resolver(metodo)
+    en_sitio = AsignacionSolicitudesServidores(S, R, C.copy(), prioridades, capacidades, en_sitio=True)
+    en_sitio.resolver(metodo)
+    assert costo_ajustado(en_sitio) == pytest.approx(costo_ajustado(copia))
+    # Los tiempos informados son los originales, no los ajustados
+    np.testing.assert_allclose(en_sitio.asignaciones.costos,
+                               C[en_sitio.asignaciones.filas, en_sitio.asignaciones.columnas])
+    assert en_sitio.tiempo_total == pytest.approx(copia.tiempo_total)
+
+
+def test_ajuste_en_sitio_se_aplica_una_sola_vez():
+    S, R, C, prioridades, capacidades = generar_servidores(5, 12, 3)
+    ajustada = C / factores(prioridades)
+    problema = AsignacionSolicitudesServidores(S, R, C.copy(), prioridades, capacidades, en_sitio=True)
+    primera = problema.ajustar_costos_por_prioridad()
+    segunda = problema.ajustar_costos_por_prioridad()
+    assert segunda is primera is problema.matriz_costos
+    np.testing.assert_allclose(segunda, ajustada, rtol=1e-15)
+    # En otra salida se copia la matriz ya ajustada, sin dividirla de nuevo
+    np.testing.assert_allclose(problema.ajustar_costos_por_prioridad(salida=np.empty((S, R))), ajustada, rtol=1e-15)
+
+    for metodo in METODOS_RESOLUCION:
+        problema.resolver(metodo)
+        np.testing.assert_allclose(problema.asignaciones.costos,
+                                   C[problema.asignaciones.filas, problema.asignaciones.columnas], rtol=1e-15)
+    np.testing.assert_allclose(problema.matriz_costos, ajustada, rtol=1e-15)
+
+
+@pytest.mark.parametrize('metodo', METODOS_RESOLUCION)
+def test_resolver_lote_coincide_con_cada_instancia(metodo):
+    instancias = [generar_servidores(S, R, semilla) for semilla, (S, R) in enumerate([(3, 5), (4, 9), (5, 5), (2, 7)])]
+    resultados = resolver_lote([C for _, _, C, _, _ in instancias], [p for _, _, _, p, _ in instancias],
+                               [capacidades for *_, capacidades in instancias], metodo, max_procesos=2)
+    assert len(resultados) == len(instancias)
+    for (S, R, C, prioridades, capacidades), resultado in zip(instancias, resultados):
+        asignaciones, tiempo_total, carga = AsignacionSolicitudesServidores(S, R, C, prioridades,
+                                                                            capacidades).resolver(metodo)
+        np.testing.assert_array_equal(resultado['asignaciones'].filas, asignaciones.filas)
+        np.testing.assert_array_equal(resultado['asignaciones'].columnas, asignaciones.columnas)
+        np.testing.assert_array_equal(resultado['carga_servidores'], carga)
+        assert resultado['tiempo_total'] == pytest.approx(tiempo_total)
+        assert resultado['tiempo_resolucion'] >= 0
+
+
+def test_resolver_lote_con_arreglo_tridimensional():
+    matrices = np.random.default_rng(3).integers(1, 50, size=(5, 4, 6)).astype(np.float64)
+    resultados = resolver_lote(matrices, max_procesos=1)
+    for matriz, resultado in zip(matrices, resultados):
+        filas, columnas = linear_sum_assignment(matriz)
+        assert resultado['tiempo_total'] == pytest.approx(matriz[filas, columnas].sum())
+    assert resolver_lote([]) == []
+    with pytest.raises(ValueError):
+        resolver_lote(matrices, prioridades=[None] * 4)
+
+
+def optimo_en_linea(costos_ajustados, capacidades):
+    """Costo óptimo de las solicitudes asignadas, con linear_sum_assignment sobre servidores replicados."""
+    servidor_de_columna = np.repeat(np.arange(len(capacidades)), capacidades)
+    filas, columnas = linear_sum_assignment(costos_ajustados[:, servidor_de_columna])
+    return float(costos_ajustados[filas, servidor_de_columna[columnas]].sum())
+
+
+@pytest.mark.parametrize('semilla', range(4))
+def test_asignacion_en_linea_es_optima_despues_de_cada_evento(semilla):
+    rng = np.random.default_rng(semilla)
+    num_servidores = 5
+    capacidades = rng.integers(1, 4, num_servidores)
+    en_linea = AsignacionEnLinea(num_servidores, capacidades, prioridad_maxima=5.0)
+    activas = {} # Identificador -> costos ajustados por prioridad
+    for _ in range(200):
+        # Se llena por encima de la capacidad total para que también haya solicitudes en cola
+        if activas and (rng.random() < 0.45 or len(activas) > capacidades.sum() + 3):
+            identificador = int(rng.choice(list(activas)))
+            en_linea.completar_solicitud(identificador)
+            del activas[identificador]
+        else:
+            costos, prioridad = rng.integers(1, 50, num_servidores).astype(np.float64), float(rng.integers(1, 6))
+            activas[en_linea.agregar_solicitud(costos, prioridad)] = costos / factores([prioridad, 5.0])[0]
+
+        asignadas = [identificador for identificador in activas if en_linea.servidor_de(identificador) is not None]
+        assert len(asignadas) == min(len(activas), capacidades.sum())
+        assert list(en_linea.cola) == [identificador for identificador in activas if identificador not in asignadas]
+        servidores = [en_linea.servidor_de(identificador) for identificador in asignadas]
+        assert (np.bincount(servidores, minlength=num_servidores) <= capacidades).all()
+        if asignadas:
+            referencia = optimo_en_linea(np.array([activas[identificador] for identificador in asignadas]), capacidades)
+            assert en_linea.costo_ajustado() == pytest.approx(referencia)
+    assert en_linea.estadisticas_latencia()['eventos'] == 200
+
+
+def test_benchmark_en_linea_sin_diferencias(capsys):
+    from benchmark_en_linea import main
+    assert main(['--servidores', '8', '--eventos', '300', '--verificar', '--json']) == 0
+
+
+def densa_con_prohibidas(C):
+    """Matriz densa equivalente a una dispersa, con las celdas prohibidas a un costo prohibitivo."""
+    coo = C.tocoo()
+    densa = np.full(C.shape, 1e6)
+    densa[coo.row, coo.col] = coo.data
+    return densa
+
+
+@pytest.mark.parametrize('metodo', METODOS_RESOLUCION)
+@pytest.mark.parametrize('forma', [(6, 20), (10, 10), (15, 6)])
+@pytest.mark.parametrize('semilla', range(3))
+def test_servidores_dispersos_coinciden_con_densos(metodo, forma, semilla):
+    S, R, C, prioridades, capacidades = generar_servidores_disperso(*forma, semilla, arcos_por_solicitud=3)
+    denso = AsignacionSolicitudesServidores(S, R, densa_con_prohibidas(C), prioridades, capacidades)
+    denso.resolver(metodo)
+    assert denso.tiempo_total < 1e6
+    disperso = AsignacionSolicitudesServidores(S, R, C, prioridades, capacidades)
+    disperso.resolver(metodo)
+    assert disperso.disperso
+    asignaciones = disperso.asignaciones
+    # Con más solicitudes que lugares, las que sobran quedan sin asignar igual que en el modo denso
+    assert len(asignaciones) == len(denso.asignaciones)
+    assert costo_ajustado(disperso) == pytest.approx(costo_ajustado(denso))
+    assert (np.asarray(C[asignaciones.filas, asignaciones.columnas]).ravel() > 0).all()
+    assert (disperso.carga_servidores <= capacidades).all()
+
+
+@pytest.mark.parametrize('metodo', METODOS_RESOLUCION)
+def test_servidores_dispersos_sin_asignacion(metodo):
+    # Los dos servidores solo admiten la solicitud 0: no se pueden ocupar los dos lugares
+    C = matriz_arcos(2, 2, [0, 1], [0, 0], [1.0, 2.0])
+    problema = AsignacionSolicitudesServidores(2, 2, C, capacidades=np.ones(2))
+    with pytest.raises(ValueError):
+        problema.resolver(metodo)
@@ -0,0 +1,395 @@
+import importlib.util
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from generadores import VARIANTES_TRANSPORTE, generar_transporte, generar_transporte_disperso
+from lectura_instancias import leer_instancia_programadores, matriz_arcos
+from metodos_transporte import (SOLUCIONES_INICIALES, construir_modelo_matricial, costo_minimo, cota_inferior, multiarranque,
+                                vogel, voraz_aleatorio)
+from modulo_asignacion_programadores import AsignacionProgramadoresTareas
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HAY_PULP = importlib.util.find_spec('pulp') is not None
+
+
+def costo_highs(datos):
+    """Costo óptimo de referencia, calculado con HiGHS sobre una copia de la instancia."""
+    N, M, C, S, D = datos
+    return AsignacionProgramadoresTareas(N, M, C.copy(), S.copy(), D.copy()).resolver('highs')[1]
+
+
+def comprobar_factible(problema):
+    """La asignación cubre exactamente la oferta y la demanda del modelo balanceado."""
+    modelo = problema.modelo
+    asignaciones = problema.asignaciones
+    assert (asignaciones.cantidades > 0).all()
+    np.testing.assert_array_equal(asignaciones.totales_por_fila(modelo.m)[0], modelo.oferta)
+    np.testing.assert_array_equal(asignaciones.totales_por_columna(modelo.n)[0], modelo.demanda)
+    assert asignaciones.costo_total() == pytest.approx(problema.costo_total)
+
+
+@pytest.mark.parametrize('variante', VARIANTES_TRANSPORTE)
+@pytest.mark.parametrize('semilla', range(3))
+def test_simplex_red_alcanza_el_optimo_de_highs(variante, semilla):
+    datos = generar_transporte(8, 20, semilla, variante)
+    problema = AsignacionProgramadoresTareas(*datos)
+    _, costo = problema.resolver('simplex_red')
+    assert problema.simplex.es_optima
+    assert costo == pytest.approx(costo_highs(datos))
+    comprobar_factible(problema)
+
+
+@pytest.mark.skipif(not HAY_PULP, reason="PuLP no está instalado")
+def test_simplex_red_coincide_con_pulp_en_el_ejemplo():
+    datos = leer_instancia_programadores(os.path.join(RAIZ, 'programadores.txt'))
+    _, costo = AsignacionProgramadoresTareas(*datos).resolver('simplex_red')
+    assert costo == pytest.approx(AsignacionProgramadoresTareas(*datos).resolver('pulp')[1])
+
+
+@pytest.mark.parametrize('solucion_inicial', sorted(SOLUCIONES_INICIALES))
+@pytest.mark.parametrize('variante', VARIANTES_TRANSPORTE)
+def test_soluciones_iniciales_son_bases_factibles(solucion_inicial, variante):
+    datos = generar_transporte(7, 18, 1, variante)
+    problema = AsignacionProgramadoresTareas(*datos)
+    (filas, columnas, cantidades), costo = problema.calcular_solucion_inicial(solucion_inicial)
+    modelo = problema.modelo
+    assert len(filas) == modelo.m + modelo.n - 1
+    assert (cantidades >= 0).all()
+    np.testing.assert_array_equal(np.bincount(filas, weights=cantidades, minlength=modelo.m), modelo.oferta)
+    np.testing.assert_array_equal(np.bincount(columnas, weights=cantidades, minlength=modelo.n), modelo.demanda)
+    assert costo >= costo_highs(datos) - 1e-9
+
+
+@pytest.mark.parametrize('variante', VARIANTES_TRANSPORTE)
+def test_todos_los_motores_y_arranques_llegan_al_mismo_optimo(variante):
+    datos = generar_transporte(6, 12, 2, variante)
+    optimo = costo_highs(datos)
+    for solucion_inicial in SOLUCIONES_INICIALES:
+        problema = AsignacionProgramadoresTareas(*datos)
+        assert problema.resolver('simplex_red', solucion_inicial)[1] == pytest.approx(optimo)
+        comprobar_factible(problema)
+    if HAY_PULP:
+        # Sin solución inicial CBC arranca en frío; con una, la recibe como warm start
+        for solucion_inicial in (None,) + tuple(SOLUCIONES_INICIALES):
+            problema = AsignacionProgramadoresTareas(*datos)
+            assert problema.resolver('pulp', solucion_inicial)[1] == pytest.approx(optimo)
+            comprobar_factible(problema)
+    problema = AsignacionProgramadoresTareas(*datos)
+    assert problema.resolver('heuristico', limite_segundos=30)[1] == pytest.approx(optimo)
+    assert problema.heuristica['optima']
+
+
+def test_solucion_inicial_desconocida():
+    problema = AsignacionProgramadoresTareas(*generar_transporte(3, 4))
+    with pytest.raises(ValueError):
+        problema.calcular_solucion_inicial('inexistente')
+
+
+def test_columna_ficticia_virtual_sin_copiar_costos():
+    N, M, C, S, D = generar_transporte(5, 9, 3, 'exceso_oferta')
+    problema = AsignacionProgramadoresTareas(N, M, C, S, D)
+    modelo = problema.modelo
+    assert modelo.columna_ficticia and not modelo.fila_ficticia
+    assert (modelo.m, modelo.n) == (N, M + 1)
+    assert np.shares_memory(modelo.costos, C)
+    assert modelo.costo(0, M) == 0
+
+    problema.resolver('simplex_red')
+    assert problema.etiqueta_tarea(M) == 'Tarea_Ficticia'
+    # La columna ficticia absorbe el exceso de oferta
+    assert problema.asignaciones.totales_por_columna(modelo.n)[0][M] == S.sum() - D.sum()
+    resultado = problema.resultado()
+    assert resultado['columna_ficticia'] and not resultado['fila_ficticia']
+    assert resultado['num_tareas'] == M
+
+
+def test_fila_ficticia_por_exceso_de_demanda():
+    N, M, C, S, D = generar_transporte(5, 9, 3, 'exceso_demanda')
+    problema = AsignacionProgramadoresTareas(N, M, C, S, D)
+    assert problema.modelo.fila_ficticia and problema.num_programadores == N + 1
+    problema.resolver('simplex_red')
+    assert problema.etiqueta_programador(N) == 'Programador_Ficticio'
+    assert problema.asignaciones.totales_por_fila(N + 1)[0][N] == D.sum() - S.sum()
+
+
+def test_dimensiones_y_cantidades_invalidas():
+    with pytest.raises(ValueError):
+        AsignacionProgramadoresTareas(2, 2, np.ones((2, 2)), np.array([1, 1, 1]), np.array([1, 1]))
+    problema = AsignacionProgramadoresTareas(2, 2, np.ones((2, 2)), np.array([1, 1]), np.array([1, 1]))
+    with pytest.raises(ValueError):
+        problema.actualizar_demanda(0, 0)
+
+
+def test_modelo_matricial_en_forma_csr():
+    datos = generar_transporte(4, 6, 0, 'exceso_demanda')
+    modelo = AsignacionProgramadoresTareas(*datos).modelo
+    m, n = modelo.m, modelo.n
+    matrices = construir_modelo_matricial(modelo)
+    # Variable de la celda (i, j) en la posición i * n + j
+    np.testing.assert_array_equal(matrices['A_ub'].toarray(), np.kron(np.eye(m), np.ones((1, n))))
+    np.testing.assert_array_equal(matrices['A_eq'].toarray(), np.tile(np.eye(n), m))
+    costos = np.zeros((m, n))
+    costos[:datos[0], :datos[1]] = datos[2]
+    np.testing.assert_array_equal(matrices['c'], costos.ravel())
+    np.testing.assert_array_equal(matrices['b_ub'], modelo.oferta)
+    np.testing.assert_array_equal(matrices['b_eq'], modelo.demanda)
+
+
+@pytest.mark.skipif(not HAY_PULP, reason="PuLP no está instalado")
+@pytest.mark.parametrize('variante', VARIANTES_TRANSPORTE)
+def test_highs_y_pulp_coinciden(variante):
+    datos = generar_transporte(5, 8, 4, variante)
+    highs = AsignacionProgramadoresTareas(*datos)
+    highs.resolver('highs')
+    comprobar_factible(highs)
+    assert set(highs.tiempos) == {'construccion_modelo', 'resolucion'}
+    assert highs.costo_total == pytest.approx(AsignacionProgramadoresTareas(*datos).resolver('pulp')[1])
+
+
+def test_asignaciones_compactas_por_celda():
+    datos = generar_transporte(5, 12, 4, 'balanceado')
+    problema = AsignacionProgramadoresTareas(*datos)
+    asignaciones, costo = problema.resolver('simplex_red')
+    assert asignaciones.num_celdas <= problema.modelo.m + problema.modelo.n - 1
+    # Iterar sigue dando una tupla (programador, tarea, costo) por unidad
+    unidades = list(asignaciones)
+    assert len(unidades) == len(asignaciones) == datos[4].sum()
+    assert sum(costo_unidad for _, _, costo_unidad in unidades) == pytest.approx(costo)
+    programador, tarea, _ = unidades[0]
+    assert programador.startswith('Programador_') and tarea.startswith('Tarea_')
+    diccionario = asignaciones.a_diccionario()
+    assert set(diccionario) == {'filas', 'columnas', 'cantidades', 'costos'}
+    assert sum(diccionario['cantidades']) == len(asignaciones)
+
+
+def test_actualizar_costos_reutiliza_la_base():
+    N, M, C, S, D = generar_transporte(6, 15, 8)
+    problema = AsignacionProgramadoresTareas(N, M, C.copy(), S, D)
+    problema.resolver('simplex_red')
+    simplex = problema.simplex
+    problema.actualizar_costos(np.array([0, 1]), np.array([2, 3]), np.array([1.0, 500.0]))
+    assert problema.simplex is simplex
+    assert set(problema.tiempos) == {'reoptimizacion'}
+    C[0, 2], C[1, 3] = 1.0, 500.0
+    assert problema.costo_total == pytest.approx(costo_highs((N, M, C, S, D)))
+
+
+@pytest.mark.parametrize('disperso', [False, True])
+@pytest.mark.parametrize('variante', VARIANTES_TRANSPORTE)
+def test_reoptimizacion_incremental_coincide_con_resolver_desde_cero(disperso, variante):
+    rng = np.random.default_rng(7)
+    if disperso:
+        N, M, C, S, D = generar_transporte_disperso(6, 15, 5, variante, arcos_por_tarea=4)
+    else:
+        N, M, C, S, D = generar_transporte(6, 15, 5, variante)
+    problema = AsignacionProgramadoresTareas(N, M, C.copy(), S.copy(), D.copy())
+    problema.resolver('simplex_red')
+    filas_arcos, columnas_arcos = C.nonzero() if disperso else np.indices(C.shape).reshape(2, -1)
+
+    for _ in range(25):
+        evento = rng.integers(3)
+        try:
+            if evento == 0:
+                k = rng.integers(filas_arcos.size)
+                i, j, valor = int(filas_arcos[k]), int(columnas_arcos[k]), float(rng.integers(1, 101))
+                C[i, j] = valor
+                problema.actualizar_costos(i, j, valor)
+            elif evento == 1:
+                j = int(rng.integers(M))
+                D[j] = rng.integers(1, 8)
+                problema.actualizar_demanda(j, int(D[j]))
+            else:
+                # Las capacidades pueden cambiar de lado el desbalance (fila o columna ficticia)
+                i = int(rng.integers(N))
+                S[i] = rng.integers(1, 12)
+                problema.actualizar_capacidad(i, int(S[i]))
+        except RuntimeError:
+            # Con arcos prohibidos el cambio puede dejar la instancia sin solución: HiGHS debe coincidir
+            assert disperso
+            with pytest.raises(RuntimeError):
+                costo_highs((N, M, C, S, D))
+            break
+        assert problema.costo_total == pytest.approx(costo_highs((N, M, C, S, D)))
+        comprobar_factible(problema)
+
+
+@pytest.mark.parametrize('disperso', [False, True])
+@pytest.mark.parametrize('indice', [-1, 'fuera'])
+def test_actualizar_cantidades_rechaza_indices_fuera_de_rango(disperso, indice):
+    if disperso:
+        N, M, C, S, D = generar_transporte_disperso(4, 7, 2, 'exceso_oferta', arcos_por_tarea=3)
+    else:
+        N, M, C, S, D = generar_transporte(4, 7, 2, 'exceso_oferta')
+    problema = AsignacionProgramadoresTareas(N, M, C, S.copy(), D.copy())
+    problema.resolver('simplex_red')
+    costo = problema.costo_total
+    with pytest.raises(IndexError):
+        problema.actualizar_demanda(M if indice == 'fuera' else indice, int(D[-1]) + 1)
+    with pytest.raises(IndexError):
+        problema.actualizar_capacidad(N if indice == 'fuera' else indice, int(S[-1]) + 1)
+    # Nada cambió: ni los vectores ni la solución
+    np.testing.assert_array_equal(problema.modelo.demanda_real, D)
+    np.testing.assert_array_equal(problema.modelo.oferta_real, S)
+    assert problema.costo_total == costo
+
+
+def instancia_con_prohibidas(semilla):
+    """Instancia pequeña con celdas prohibidas al azar; cada fila y columna tiene algún arco."""
+    rng = np.random.default_rng(semilla)
+    N, M = int(rng.integers(2, 8)), int(rng.integers(2, 8))
+    C = rng.integers(1, 20, size=(N, M)).astype(np.float64)
+    permitidas = rng.random((N, M)) < 0.5
+    permitidas[np.arange(N), rng.integers(0, M, N)] = True
+    permitidas[rng.integers(0, N, M), np.arange(M)] = True
+    return N, M, C, permitidas, rng.integers(1, 6, N), rng.integers(1, 6, M)
+
+
+@pytest.mark.parametrize('semilla', range(40))
+def test_simplex_disperso_coincide_con_highs_disperso(semilla):
+    N, M, C, permitidas, S, D = instancia_con_prohibidas(semilla)
+    # Referencia densa: las celdas prohibidas tienen un costo que ningún óptimo factible usa
+    optimo = AsignacionProgramadoresTareas(N, M, np.where(permitidas, C, 1e6), S, D).resolver('highs')[1]
+    esperado = optimo if optimo < 1e5 else None
+
+    for metodo, solucion_inicial in [('highs', 'vogel'), ('simplex_red', 'vogel'), ('simplex_red', 'costo_minimo'),
+                                     ('simplex_red', 'esquina_noroeste')]:
+        problema = AsignacionProgramadoresTareas(N, M, matriz_arcos(N, M, *np.nonzero(permitidas), C[permitidas]), S, D)
+        if esperado is None:
+            with pytest.raises(RuntimeError):
+                problema.resolver(metodo, solucion_inicial)
+            continue
+        assert problema.resolver(metodo, solucion_inicial)[1] == pytest.approx(esperado)
+        comprobar_factible(problema)
+        asignaciones = problema.asignaciones
+        reales = (asignaciones.filas < N) & (asignaciones.columnas < M)
+        assert permitidas[asignaciones.filas[reales], asignaciones.columnas[reales]].all()
+
+
+@pytest.mark.parametrize('metodo', ['simplex_red', 'highs'])
+def test_instancia_dispersa_infactible(metodo):
+    # La tarea 1 pide 3 unidades y solo el programador 0, que tiene 1, puede hacerla
+    C = matriz_arcos(2, 2, [0, 0, 1], [0, 1, 0], [1.0, 2.0, 3.0])
+    problema = AsignacionProgramadoresTareas(2, 2, C, np.array([1, 5]), np.array([3, 3]))
+    with pytest.raises(RuntimeError):
+        problema.resolver(metodo)
+
+
+@pytest.mark.parametrize('variante', VARIANTES_TRANSPORTE)
+def test_generador_disperso_con_simplex_y_highs(variante):
+    datos = generar_transporte_disperso(30, 200, 1, variante, arcos_por_tarea=4)
+    problema = AsignacionProgramadoresTareas(*datos)
+    problema.resolver('simplex_red')
+    assert problema.modelo.disperso
+    comprobar_factible(problema)
+    assert problema.costo_total == pytest.approx(AsignacionProgramadoresTareas(*datos).resolver('highs')[1])
+
+
+def test_solo_se_pueden_cambiar_arcos_permitidos():
+    C = matriz_arcos(2, 2, [0, 1, 1], [0, 0, 1], [1.0, 2.0, 3.0])
+    problema = AsignacionProgramadoresTareas(2, 2, C, np.array([2, 2]), np.array([2, 2]))
+    problema.resolver('simplex_red')
+    with pytest.raises(IndexError):
+        problema.actualizar_costos(0, 1, 5.0)
+
+
+@pytest.mark.parametrize('limite_segundos', [0.01, 5.0])
+@pytest.mark.parametrize('disperso', [False, True])
+@pytest.mark.parametrize('variante', VARIANTES_TRANSPORTE)
+def test_heuristico_acotado_por_el_optimo_y_la_cota(limite_segundos, disperso, variante):
+    if disperso:
+        datos = generar_transporte_disperso(20, 120, 3, variante, arcos_por_tarea=5)
+    else:
+        datos = generar_transporte(20, 60, 3, variante)
+    optimo = costo_highs(datos)
+    problema = AsignacionProgramadoresTareas(*datos)
+    _, costo = problema.resolver_heuristico(limite_segundos, max_hilos=2)
+    heuristica = problema.heuristica
+    assert costo >= optimo - 1e-6
+    assert heuristica['cota_inferior'] <= optimo + 1e-6
+    assert heuristica['brecha'] == pytest.approx(max(0.0, costo - heuristica['cota_inferior']))
+    if heuristica['optima']:
+        assert costo == pytest.approx(optimo)
+    comprobar_factible(problema)
+    if disperso:
+        asignaciones = problema.asignaciones
+        assert problema.modelo.permitidas(asignaciones.filas, asignaciones.columnas).all()
+
+
+def test_multiarranque_ordena_por_costo():
+    modelo = AsignacionProgramadoresTareas(*generar_transporte(10, 30, 1)).modelo
+    arranques = multiarranque(modelo, num_aleatorios=3, max_hilos=2, plazo=time.perf_counter() + 30)
+    nombres = [nombre for nombre, _, _ in arranques]
+    assert sorted(nombres) == sorted(['vogel', 'costo_minimo'] + [f'voraz_aleatorio_{k}' for k in range(3)])
+    costos = [costo for _, _, costo in arranques]
+    assert costos == sorted(costos)
+    for _, base, costo in arranques:
+        assert modelo.costo_total(*base) == pytest.approx(costo)
+
+
+@pytest.mark.parametrize('disperso', [False, True])
+def test_voraz_aleatorio_por_tramos_sigue_el_orden_perturbado(disperso):
+    if disperso:
+        datos = generar_transporte_disperso(12, 40, 4, 'exceso_oferta', arcos_por_tarea=5)
+    else:
+        datos = generar_transporte(12, 40, 4, 'exceso_oferta')
+    modelo = AsignacionProgramadoresTareas(*datos).modelo
+    # Costos perturbados de toda la matriz, con los números al azar en el orden de los costos sin perturbar
+    costos = modelo.costos_arcos if disperso else modelo.costos.ravel()
+    orden = np.argsort(costos, kind='stable')
+    perturbados = np.empty(costos.size)
+    perturbados[orden] = costos[orden] * (1 + 0.1 * np.random.default_rng(5).random(costos.size))
+    esperada = costo_minimo(modelo, orden=np.argsort(perturbados, kind='stable'))
+    for tamano_lote in (7, 1 << 16):
+        for arreglo, esperado in zip(voraz_aleatorio(modelo, 5, tamano_lote=tamano_lote), esperada):
+            np.testing.assert_array_equal(arreglo, esperado)
+
+
+def test_multiarranque_limita_los_hilos_por_memoria(monkeypatch):
+    import metodos_transporte
+
+    hilos = []
+    original = metodos_transporte.ThreadPoolExecutor
+
+    def registrar(max_workers):
+        hilos.append(max_workers)
+        return original(max_workers=max_workers)
+
+    monkeypatch.setattr(metodos_transporte, 'ThreadPoolExecutor', registrar)
+    modelo = AsignacionProgramadoresTareas(*generar_transporte(10, 30, 1)).modelo
+    # Peor caso de un arranque aleatorio: 16 bytes por celda
+    arranques = multiarranque(modelo, num_aleatorios=3, max_hilos=4, plazo=time.perf_counter() + 30,
+                              limite_memoria=2 * 16 * 300)
+    assert hilos == [2, 2] and len(arranques) == 5
+    hilos.clear()
+    multiarranque(modelo, heuristicas=('costo_minimo',), max_hilos=4, limite_memoria=1)
+    assert hilos == [1]
+
+
+def test_multiarranque_con_plazo_vencido_devuelve_una_base():
+    modelo = AsignacionProgramadoresTareas(*generar_transporte(10, 30, 1)).modelo
+    arranques = multiarranque(modelo, plazo=time.perf_counter())
+    assert arranques
+    _, (filas, _, cantidades), _ = arranques[0]
+    assert len(filas) == modelo.m + modelo.n - 1 and cantidades.sum() == modelo.oferta.sum()
+
+
+def test_vogel_paralelo_igual_al_secuencial():
+    modelo = AsignacionProgramadoresTareas(*generar_transporte(40, 120, 2, 'exceso_oferta')).modelo
+    with ThreadPoolExecutor(max_workers=2) as ejecutor:
+        paralelo = vogel(modelo, ejecutor)
+    for arreglo_paralelo, arreglo_secuencial in zip(paralelo, vogel(modelo)):
+        np.testing.assert_array_equal(arreglo_paralelo, arreglo_secuencial)
+
+
+@pytest.mark.parametrize('semilla', range(5))
+def test_cota_inferior_con_cualquier_potencial(semilla):
+    datos = generar_transporte(8, 25, semilla, VARIANTES_TRANSPORTE[semilla % 3])
+    modelo = AsignacionProgramadoresTareas(*datos).modelo
+    optimo = costo_highs(datos)
+    assert cota_inferior(modelo) <= optimo + 1e-6
+    potenciales = np.random.default_rng(semilla).normal(scale=30, size=modelo.m)
+    assert cota_inferior(modelo, potenciales) <= optimo + 1e-6